@@ -0,0 +1,345 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Group-by aggregation of search results.
+
+Search_stream batches are aggregated as they arrive, a column at a time:
+each field is read from the whole batch with the RowFormatter accessors,
+the group of every row is looked up once, and each column is then folded
+into per-group accumulators. Only the accumulators are kept, so reports of
+millions of rows are aggregated in memory proportional to the number of
+groups.
+
+Ratio metrics such as CTR can't be aggregated from their per-row values.
+They are computed from the sums of their components instead, e.g. the CTR
+of a group is the sum of its clicks over the sum of its impressions.
+"""
+
+import collections
+import json
+import re
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
+
+import proto
+
+from ads_mcp import columnar
+import ads_mcp.utils as utils
+
+FUNCTIONS = ("sum", "avg", "min", "max", "count")
+
+# Ratio metrics computed from the sums of their components, as
+# (numerator, denominator, scale).
+RATIO_METRICS = {
+    "metrics.ctr": ("metrics.clicks", "metrics.impressions", 1),
+    "metrics.average_cpc": ("metrics.cost_micros", "metrics.clicks", 1),
+    "metrics.average_cpm": ("metrics.cost_micros", "metrics.impressions", 1000),
+    "metrics.average_cost": ("metrics.cost_micros", "metrics.interactions", 1),
+    "metrics.interaction_rate": (
+        "metrics.interactions",
+        "metrics.impressions",
+        1,
+    ),
+    "metrics.conversions_from_interactions_rate": (
+        "metrics.conversions",
+        "metrics.interactions",
+        1,
+    ),
+    "metrics.cost_per_conversion": (
+        "metrics.cost_micros",
+        "metrics.conversions",
+        1,
+    ),
+    "metrics.value_per_conversion": (
+        "metrics.conversions_value",
+        "metrics.conversions",
+        1,
+    ),
+}
+
+# Metrics that are counts or amounts, whose value over several rows is the sum
+# of their values. Shares, scores, positions and averages aren't.
+ADDITIVE_METRICS = frozenset(
+    (
+        "metrics.clicks",
+        "metrics.impressions",
+        "metrics.cost_micros",
+        "metrics.interactions",
+        "metrics.engagements",
+        "metrics.conversions",
+        "metrics.conversions_value",
+        "metrics.all_conversions",
+        "metrics.all_conversions_value",
+        "metrics.view_through_conversions",
+        "metrics.video_views",
+        "metrics.invalid_clicks",
+        "metrics.general_invalid_clicks",
+        "metrics.active_view_impressions",
+        "metrics.active_view_measurable_impressions",
+        "metrics.active_view_measurable_cost_micros",
+        "metrics.cross_device_conversions",
+        "metrics.current_model_attributed_conversions",
+        "metrics.current_model_attributed_conversions_value",
+        "metrics.conversions_by_conversion_date",
+        "metrics.conversions_value_by_conversion_date",
+        "metrics.all_conversions_by_conversion_date",
+        "metrics.all_conversions_value_by_conversion_date",
+        "metrics.phone_calls",
+        "metrics.phone_impressions",
+        "metrics.gmail_forwards",
+        "metrics.gmail_saves",
+        "metrics.gmail_secondary_clicks",
+        "metrics.orders",
+        "metrics.units_sold",
+        "metrics.revenue_micros",
+        "metrics.gross_profit_micros",
+        "metrics.cost_of_goods_sold_micros",
+        "metrics.message_chats",
+        "metrics.message_impressions",
+        "metrics.organic_clicks",
+        "metrics.organic_impressions",
+        "metrics.organic_queries",
+        "metrics.combined_clicks",
+        "metrics.combined_queries",
+        "metrics.sk_ad_network_installs",
+        "metrics.sk_ad_network_total_conversions",
+        "metrics.biddable_app_install_conversions",
+        "metrics.biddable_app_post_install_conversions",
+        "metrics.platform_comparable_conversions",
+        "metrics.platform_comparable_conversions_value",
+        "metrics.new_customer_lifetime_value",
+        "metrics.all_new_customer_lifetime_value",
+    )
+)
+
+_NUMERIC_TYPES = ("int64", "uint64", "double")
+
+_FUNCTION_CALL = re.compile(r"^(\w+)\(\s*([\w.*]+)\s*\)$")
+_ORDERING = re.compile(r"^(.+?)(?:\s+(ASC|DESC))?$", re.IGNORECASE)
+
+# A parsed aggregate: its output column, function and input field, which is
+# "*" for count(*). Ratio metrics have the function "ratio".
+Aggregate = collections.namedtuple("Aggregate", ["name", "function", "field"])
+
+
+def parse_aggregate(spec: str) -> Aggregate:
+    """Parses an aggregate such as sum(metrics.clicks) or metrics.ctr.
+
+    Raises:
+        ValueError: If the aggregate is malformed, its function is unknown or
+            it sums or averages a field that isn't a number.
+    """
+    spec = spec.strip()
+    if spec in RATIO_METRICS:
+        return Aggregate(spec, "ratio", spec)
+    match = _FUNCTION_CALL.match(spec)
+    if match is None:
+        raise ValueError(
+            f"Unknown aggregate '{spec}', expected one of "
+            f"{[f'{function}(<field>)' for function in FUNCTIONS]} or a ratio "
+            f"metric of {sorted(RATIO_METRICS)}."
+        )
+    function, field = match.group(1).lower(), match.group(2)
+    if function not in FUNCTIONS:
+        raise ValueError(
+            f"Unknown aggregate function '{function}' in '{spec}', expected "
+            f"one of {list(FUNCTIONS)}."
+        )
+    if field == "*" and function != "count":
+        raise ValueError(f"Only count accepts '*', got '{spec}'.")
+    if (
+        function in ("sum", "avg")
+        and columnar.column_type(field) not in _NUMERIC_TYPES
+    ):
+        raise ValueError(
+            f"'{spec}' needs a numeric field, {field} isn't one. Use a ratio "
+            "metric name to aggregate rates and averages."
+        )
+    return Aggregate(f"{function}({field})", function, field)
+
+
+class _Column:
+    """Accumulators of one input field, indexed by group."""
+
+    def __init__(self):
+        self.sums: List[Any] = []
+        self.counts: List[int] = []
+        self.mins: List[Any] = []
+        self.maxes: List[Any] = []
+
+    def grow(self, groups: int) -> None:
+        missing = groups - len(self.counts)
+        if missing > 0:
+            self.sums.extend([0] * missing)
+            self.counts.extend([0] * missing)
+            self.mins.extend([None] * missing)
+            self.maxes.extend([None] * missing)
+
+    def fold(self, group_ids: Sequence[int], values: Sequence[Any]) -> None:
+        sums, counts, mins, maxes = (
+            self.sums,
+            self.counts,
+            self.mins,
+            self.maxes,
+        )
+        for group, value in zip(group_ids, values):
+            if value is None:
+                continue
+            counts[group] += 1
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                sums[group] += value
+            current = mins[group]
+            if current is None or value < current:
+                mins[group] = value
+            current = maxes[group]
+            if current is None or value > current:
+                maxes[group] = value
+
+
+class Aggregator:
+    """Aggregates GoogleAdsRows by the values of the `group_by` fields.
+
+    Args:
+        group_by: The fields whose values identify a group.
+        aggregates: The aggregates computed per group, see parse_aggregate.
+        order_by: Output columns to sort the groups by, each optionally
+            followed by ASC or DESC. Empty values sort last.
+
+    Raises:
+        ValueError: If an aggregate or ordering is invalid.
+    """
+
+    def __init__(
+        self,
+        group_by: Sequence[str],
+        aggregates: Sequence[str],
+        order_by: Sequence[str] = None,
+    ):
+        self.group_by = list(dict.fromkeys(group_by))
+        self.aggregates = list(
+            {a.name: a for a in map(parse_aggregate, aggregates)}.values()
+        )
+        self.order_by = [self._parse_ordering(o) for o in order_by or []]
+        inputs: List[str] = []
+        for aggregate in self.aggregates:
+            if aggregate.function == "ratio":
+                inputs.extend(RATIO_METRICS[aggregate.field][:2])
+            elif aggregate.field != "*":
+                inputs.append(aggregate.field)
+        self.inputs = list(dict.fromkeys(inputs))
+        self._formatter = utils.get_row_formatter(tuple(self.fields))
+        self.reset()
+
+    @property
+    def fields(self) -> List[str]:
+        """The fields the search has to select."""
+        return list(dict.fromkeys([*self.group_by, *self.inputs]))
+
+    def reset(self) -> None:
+        """Drops the groups of the rows appended so far."""
+        self.input_rows = 0
+        self._groups: Dict[Tuple[Hashable, ...], int] = {}
+        self._group_values: List[Tuple[Any, ...]] = []
+        self._row_counts: List[int] = []
+        self._columns = {field: _Column() for field in self.inputs}
+
+    def append_rows(self, rows: Sequence[proto.Message]) -> int:
+        """Folds a batch of GoogleAdsRows in, returning the number of rows."""
+        columns = {
+            attr: list(map(accessor, rows))
+            for attr, accessor in self._formatter.accessors
+        }
+        keys = (
+            zip(*(columns[field] for field in self.group_by))
+            if self.group_by
+            else [()] * len(rows)
+        )
+        group_ids = [self._group_id(key) for key in keys]
+        for group in group_ids:
+            self._row_counts[group] += 1
+        for field, column in self._columns.items():
+            column.grow(len(self._group_values))
+            column.fold(group_ids, columns[field])
+        self.input_rows += len(rows)
+        return len(rows)
+
+    def result(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Returns one row per group, with its group_by values and aggregates.
+
+        Groups are sorted by `order_by`, and otherwise listed in the order
+        they were first seen. At most `limit` groups are returned.
+        """
+        rows = [
+            {
+                **dict(zip(self.group_by, values)),
+                **{
+                    aggregate.name: self._value(aggregate, group)
+                    for aggregate in self.aggregates
+                },
+            }
+            for group, values in enumerate(self._group_values)
+        ]
+        # Sorts by the last ordering first, relying on sort stability.
+        for column, descending in reversed(self.order_by):
+            present = [row for row in rows if row.get(column) is not None]
+            present.sort(key=lambda row: row[column], reverse=descending)
+            rows = present + [row for row in rows if row.get(column) is None]
+        return rows[:limit] if limit else rows
+
+    def _group_id(self, key: Tuple[Any, ...]) -> int:
+        hashable = tuple(_hashable(value) for value in key)
+        group = self._groups.get(hashable)
+        if group is None:
+            group = len(self._group_values)
+            self._groups[hashable] = group
+            self._group_values.append(key)
+            self._row_counts.append(0)
+        return group
+
+    def _value(self, aggregate: Aggregate, group: int) -> Any:
+        if aggregate.function == "ratio":
+            numerator, denominator, scale = RATIO_METRICS[aggregate.field]
+            total = self._columns[denominator].sums[group]
+            if not total:
+                return None
+            return self._columns[numerator].sums[group] * scale / total
+        if aggregate.field == "*":
+            return self._row_counts[group]
+        column = self._columns[aggregate.field]
+        if aggregate.function == "count":
+            return column.counts[group]
+        if not column.counts[group]:
+            return None
+        if aggregate.function == "sum":
+            return column.sums[group]
+        if aggregate.function == "avg":
+            return column.sums[group] / column.counts[group]
+        if aggregate.function == "min":
+            return column.mins[group]
+        return column.maxes[group]
+
+    def _parse_ordering(self, ordering: str) -> Tuple[str, bool]:
+        match = _ORDERING.match(ordering.strip())
+        column = match.group(1).strip()
+        columns = [*self.group_by, *(a.name for a in self.aggregates)]
+        if column not in columns:
+            raise ValueError(
+                f"Can't order by '{column}', expected one of {columns}."
+            )
+        return column, (match.group(2) or "ASC").upper() == "DESC"
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return json.dumps(value, default=str)
+    return value
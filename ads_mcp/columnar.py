@@ -0,0 +1,185 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Column-oriented buffers for search results.
+
+Numeric columns are stored in typed `array.array` buffers filled straight from
+each search_stream batch, so wide reports don't allocate a dict per row or a
+Python object per numeric value. Results can be returned as column-oriented
+JSON or, if pyarrow is installed, as an Arrow IPC stream.
+"""
+
+import array
+import base64
+from typing import Any, Dict, Iterable, List, Sequence
+
+from google.protobuf.descriptor import FieldDescriptor
+import proto
+
+import ads_mcp.utils as utils
+
+# Column types reported to clients, keyed by protobuf field type.
+_COLUMN_TYPES = {
+    FieldDescriptor.TYPE_INT64: "int64",
+    FieldDescriptor.TYPE_INT32: "int64",
+    FieldDescriptor.TYPE_SINT64: "int64",
+    FieldDescriptor.TYPE_SINT32: "int64",
+    FieldDescriptor.TYPE_SFIXED64: "int64",
+    FieldDescriptor.TYPE_SFIXED32: "int64",
+    FieldDescriptor.TYPE_UINT32: "int64",
+    FieldDescriptor.TYPE_FIXED32: "int64",
+    FieldDescriptor.TYPE_UINT64: "uint64",
+    FieldDescriptor.TYPE_FIXED64: "uint64",
+    FieldDescriptor.TYPE_DOUBLE: "double",
+    FieldDescriptor.TYPE_FLOAT: "double",
+    FieldDescriptor.TYPE_BOOL: "bool",
+    FieldDescriptor.TYPE_STRING: "string",
+    FieldDescriptor.TYPE_BYTES: "bytes",
+    FieldDescriptor.TYPE_ENUM: "enum",
+}
+
+# array.array type codes for the column types stored in typed buffers.
+_TYPECODES = {"int64": "q", "uint64": "Q", "double": "d"}
+
+# Column type for repeated, message and unresolvable fields, which are kept
+# as lists of formatted values.
+_OBJECT_TYPE = "object"
+
+
+def column_type(attr: str) -> str:
+    """Returns the column type of the GoogleAdsRow field at path `attr`."""
+    field = utils.resolve_field(attr)
+    if (
+        field is None
+        or field.message_type is not None
+        or utils.is_repeated_field(field)
+    ):
+        return _OBJECT_TYPE
+    return _COLUMN_TYPES.get(field.type, _OBJECT_TYPE)
+
+
+class ColumnarResult:
+    """Accumulates search_stream batches into one buffer per column.
+
+    Args:
+        attributes: The field paths of the columns, e.g. the field mask paths
+            of the first search_stream batch.
+    """
+
+    def __init__(self, attributes: Sequence[str]):
+        self.row_count = 0
+        self.types: Dict[str, str] = {
+            attr: column_type(attr) for attr in attributes
+        }
+        self._columns: Dict[str, Any] = {
+            attr: (
+                array.array(_TYPECODES[column]) if column in _TYPECODES else []
+            )
+            for attr, column in self.types.items()
+        }
+        self._formatter = utils.get_row_formatter(tuple(attributes))
+
+    def append_rows(self, rows: Sequence[proto.Message]) -> int:
+        """Appends a batch of GoogleAdsRows, returning the number of rows."""
+        for attr, accessor in self._formatter.accessors:
+            self._columns[attr].extend(map(accessor, rows))
+        self.row_count += len(rows)
+        return len(rows)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Returns the result as column-oriented JSON compatible values."""
+        return {
+            "format": "columns",
+            "row_count": self.row_count,
+            "types": self.types,
+            "columns": {
+                attr: _to_list(column, self.types[attr])
+                for attr, column in self._columns.items()
+            },
+        }
+
+    def to_arrow(self) -> Dict[str, Any]:
+        """Returns the result as a base64 encoded Arrow IPC stream.
+
+        Raises:
+            ImportError: If pyarrow isn't installed.
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError(
+                "The arrow output format requires pyarrow, install it with "
+                "`pip install google-ads-mcp[arrow]`."
+            ) from e
+
+        table = pyarrow.table(
+            {
+                attr: _to_arrow_array(pyarrow, column, self.types[attr])
+                for attr, column in self._columns.items()
+            }
+        )
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return {
+            "format": "arrow",
+            "row_count": self.row_count,
+            "arrow_ipc_base64": base64.b64encode(
+                sink.getvalue().to_pybytes()
+            ).decode("ascii"),
+        }
+
+
+def _to_list(column: Any, column_type: str) -> List[Any]:
+    if column_type in _TYPECODES:
+        return column.tolist()
+    if column_type == "bytes":
+        return [base64.b64encode(value).decode("ascii") for value in column]
+    if column_type == _OBJECT_TYPE:
+        return [_to_json_value(value) for value in column]
+    return column
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Iterable) and not isinstance(value, proto.Message):
+        return [_to_json_value(item) for item in value]
+    return str(value)
+
+
+def _to_arrow_array(pyarrow, column: Any, column_type: str):
+    if column_type in _TYPECODES:
+        # Wraps the array's memory rather than converting value by value.
+        arrow_type = {
+            "int64": pyarrow.int64(),
+            "uint64": pyarrow.uint64(),
+            "double": pyarrow.float64(),
+        }[column_type]
+        return pyarrow.Array.from_buffers(
+            arrow_type, len(column), [None, pyarrow.py_buffer(column)]
+        )
+    if column_type == "bool":
+        return pyarrow.array(column, pyarrow.bool_())
+    if column_type == "string":
+        return pyarrow.array(column, pyarrow.string())
+    if column_type == "bytes":
+        return pyarrow.array(column, pyarrow.binary())
+    if column_type == "enum":
+        # Values missing from the enum tables are passed through as numbers.
+        names = [str(value) for value in column]
+        return pyarrow.array(names, pyarrow.string()).dictionary_encode()
+    return pyarrow.array(
+        [str(_to_json_value(value)) for value in column], pyarrow.string()
+    )
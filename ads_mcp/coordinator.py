@@ -19,6 +19,34 @@ server using `@mcp.tool` annotations, thereby 'coordinating' the bootstrapping
 of the server.
 """
 
+import asyncio
+import contextlib
+import os
+from typing import AsyncIterator
+
 from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("Google Ads Server")
+from ads_mcp import gaql_schema
+import ads_mcp.utils as utils
+
+# Services used by the registered tools. Creating them in the background at
+# start up keeps credential resolution and gRPC channel setup out of both the
+# cold start and the first tool call.
+_WARM_UP_SERVICES = ("GoogleAdsService", "CustomerService")
+
+# Strong references to background tasks so they aren't garbage collected.
+_background_tasks = set()
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    # Build the schema index before serving so lookups never pay for it.
+    gaql_schema.get_schema()
+    if os.environ.get("GOOGLE_ADS_MCP_WARM_UP", "true").lower() != "false":
+        task = asyncio.create_task(utils.warm_up(_WARM_UP_SERVICES))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    yield
+
+
+mcp = FastMCP("Google Ads Server", lifespan=_lifespan)
@@ -0,0 +1,169 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk store of the rows of past days, one partition per day.
+
+Recurring performance questions search the same historical days over and
+over. Once a day is older than the conversion lag window, its metrics no
+longer change, so its rows are written to a partition of their own, keyed
+by customer, resource, field set and date, and never fetched again. Days
+inside the window are always fetched, since late conversions still update
+them.
+
+Partitions are gzipped JSON files written atomically, so several server
+processes can share a store directory. The store is disabled unless
+GOOGLE_ADS_MCP_DAILY_STORE_DIR is set.
+"""
+
+import contextlib
+import datetime
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List
+
+# Directory of the partitions, the store is disabled if unset.
+DAILY_STORE_DIR = os.environ.get("GOOGLE_ADS_MCP_DAILY_STORE_DIR", "")
+# Days before today (UTC) whose metrics may still change, e.g. as
+# conversions are attributed to past clicks.
+CONVERSION_LAG_DAYS = int(
+    os.environ.get("GOOGLE_ADS_MCP_CONVERSION_LAG_DAYS", "30")
+)
+
+_UNSAFE_PATH_CHARACTERS = re.compile(r"[^\w.-]")
+
+logger = logging.getLogger(__name__)
+
+
+class DailyStore:
+    """Immutable daily partitions of search rows under `directory`.
+
+    A partition is identified by a customer id, a resource, a digest of the
+    search without its date condition (see gaql_normalizer) and of the
+    identity it ran as, and a day.
+
+    Args:
+        directory: The directory holding the partitions.
+        lag_days: The days before today whose partitions aren't stored.
+    """
+
+    def __init__(self, directory: str, lag_days: int = CONVERSION_LAG_DAYS):
+        self.directory = directory
+        self.lag_days = lag_days
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def is_closed(self, day: datetime.date) -> bool:
+        """Returns whether the metrics of `day` no longer change."""
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        return day < today - datetime.timedelta(days=self.lag_days)
+
+    def load(
+        self,
+        customer_id: str,
+        resource: str,
+        digest: str,
+        days: Iterable[datetime.date],
+    ) -> Dict[datetime.date, List[Dict[str, Any]]]:
+        """Returns the stored rows of the `days` that have a partition."""
+        days = list(days)
+        found = {}
+        for day in days:
+            path = self._path(customer_id, resource, digest, day)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    found[day] = json.load(f)
+            except (OSError, ValueError):
+                # Missing, or corrupt and fetched and written again.
+                continue
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(days) - len(found)
+        return found
+
+    def save(
+        self,
+        customer_id: str,
+        resource: str,
+        digest: str,
+        rows_by_day: Dict[datetime.date, List[Dict[str, Any]]],
+    ) -> int:
+        """Writes the partitions of the closed days of `rows_by_day`.
+
+        Days still inside the conversion lag window are skipped. Writes are
+        best-effort: failures, e.g. a full disk, are logged and the day is
+        fetched again next time. Returns the number of partitions written.
+        """
+        written = 0
+        for day, rows in rows_by_day.items():
+            if not self.is_closed(day):
+                continue
+            path = self._path(customer_id, resource, digest, day)
+            try:
+                _write(path, rows)
+            except OSError as e:
+                logger.warning(f"ads_mcp.daily_store write failed: {e}")
+                continue
+            written += 1
+        with self._lock:
+            self._writes += written
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "lag_days": self.lag_days,
+            }
+
+    def _path(
+        self, customer_id: str, resource: str, digest: str, day: datetime.date
+    ) -> str:
+        return os.path.join(
+            self.directory,
+            _UNSAFE_PATH_CHARACTERS.sub("_", customer_id),
+            _UNSAFE_PATH_CHARACTERS.sub("_", resource),
+            digest,
+            f"{day.isoformat()}.json.gz",
+        )
+
+
+def _write(path: str, rows: List[Dict[str, Any]]) -> None:
+    """Writes `rows` to the partition at `path`, replacing it atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with (
+            os.fdopen(fd, "wb") as raw,
+            gzip.open(raw, "wt", encoding="utf-8") as f,
+        ):
+            json.dump(rows, f, default=str)
+        # Readers see either no partition or a complete one.
+        os.replace(temp_path, path)
+    except BaseException:
+        # Keeps the original error if the file can't be removed either.
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+store = DailyStore(DAILY_STORE_DIR) if DAILY_STORE_DIR else None
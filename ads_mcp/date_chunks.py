@@ -0,0 +1,138 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Splitting of long date ranges into calendar chunks.
+
+A search with a `segments.date BETWEEN` condition over months or years runs
+as one long search_stream. Split into calendar months or ISO weeks, the
+chunks can run concurrently, fail and retry independently, and be cached on
+their own, so a later search whose range overlaps reuses the chunks it has
+in common with an earlier one.
+
+Splitting only preserves the result when every row belongs to a single day
+and the rows are returned in date order, so searches that don't select
+segments.date, have a LIMIT or are ordered by other fields aren't split.
+"""
+
+import collections
+import datetime
+import os
+import re
+from typing import List, Sequence, Tuple
+
+PERIODS = ("month", "week", "none")
+
+# Length of the chunks of long date ranges, one of PERIODS.
+DATE_CHUNK = os.environ.get("GOOGLE_ADS_MCP_DATE_CHUNK", "month")
+if DATE_CHUNK not in PERIODS:
+    raise ValueError(
+        f"Unknown GOOGLE_ADS_MCP_DATE_CHUNK '{DATE_CHUNK}', expected one of "
+        f"{list(PERIODS)}."
+    )
+
+_BETWEEN = re.compile(
+    r"^segments\.date\s+BETWEEN\s+(['\"])(\d{4}-\d{2}-\d{2})\1"
+    r"\s+AND\s+(['\"])(\d{4}-\d{2}-\d{2})\3$",
+    re.IGNORECASE,
+)
+_DATE_ORDERING = re.compile(r"^segments\.date(?:\s+(ASC|DESC))?$", re.I)
+
+
+def split_range(
+    start: datetime.date, end: datetime.date, period: str
+) -> List[Tuple[datetime.date, datetime.date]]:
+    """Returns the (start, end) days of the chunks of [start, end].
+
+    Chunks are aligned on calendar months or on ISO weeks, starting on
+    Mondays, so the same days fall in the same chunks whatever the range.
+    The period "none" returns the whole range as one chunk.
+    """
+    if period == "none":
+        return [(start, end)] if start <= end else []
+    chunks = []
+    while start <= end:
+        if period == "week":
+            boundary = start + datetime.timedelta(days=7 - start.weekday())
+        else:
+            boundary = (
+                start.replace(day=28) + datetime.timedelta(days=4)
+            ).replace(day=1)
+        chunk_end = min(end, boundary - datetime.timedelta(days=1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + datetime.timedelta(days=1)
+    return chunks
+
+
+# The segments.date range of a search: the index of its BETWEEN condition,
+# its first and last days, and whether rows are in descending date order.
+DateRange = collections.namedtuple(
+    "DateRange", ["index", "start", "end", "descending"]
+)
+
+
+def find_range(
+    fields: Sequence[str],
+    conditions: Sequence[str] | None,
+    orderings: Sequence[str] | None,
+    limit: int | str | None,
+) -> DateRange | None:
+    """Returns the date range of a search that can be split by day.
+
+    Returns None if the search has no single segments.date BETWEEN
+    condition, or its result would change when split, see the module
+    docstring.
+    """
+    if limit or "segments.date" not in fields:
+        return None
+    descending = False
+    for ordering in orderings or []:
+        match = _DATE_ORDERING.match(ordering.strip())
+        if match is None:
+            return None
+        descending = (match.group(1) or "ASC").upper() == "DESC"
+
+    matches = [
+        (index, _BETWEEN.match(condition.strip()))
+        for index, condition in enumerate(conditions or [])
+    ]
+    matches = [(index, match) for index, match in matches if match]
+    if len(matches) != 1:
+        return None
+    index, match = matches[0]
+    try:
+        start = datetime.date.fromisoformat(match.group(2))
+        end = datetime.date.fromisoformat(match.group(4))
+    except ValueError:
+        # Left for the API to report.
+        return None
+    return DateRange(index, start, end, descending)
+
+
+def with_range(
+    conditions: Sequence[str],
+    index: int,
+    start: datetime.date,
+    end: datetime.date,
+) -> List[str]:
+    """Returns `conditions` with the one at `index` bounding [start, end]."""
+    return [
+        *conditions[:index],
+        f"segments.date BETWEEN '{start}' AND '{end}'",
+        *conditions[index + 1 :],
+    ]
+
+
+def without_range(conditions: Sequence[str], index: int) -> List[str]:
+    """Returns `conditions` without the date condition at `index`."""
+    return [*conditions[:index], *conditions[index + 1 :]]
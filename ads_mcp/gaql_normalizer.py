@@ -0,0 +1,259 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Canonical form of GAQL queries.
+
+Queries that differ only in the order of their selected fields or conditions,
+whitespace, keyword case, quoting of string literals or the order of IN lists
+return the same rows. They are mapped to the same canonical text and digest,
+which can be used as a cache key, to coalesce identical requests and to
+correlate queries in logs.
+"""
+
+import dataclasses
+import decimal
+import hashlib
+import re
+from typing import List, Tuple
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        ('(?:[^'\\]|\\.)*')         # single quoted string
+        |("(?:[^"\\]|\\.)*")        # double quoted string
+        |(>=|<=|!=|=|<|>|\(|\)|,)   # operators and punctuation
+        |([^\s,()=<>!'"]+)          # fields, keywords, numbers and enums
+    )""",
+    re.VERBOSE,
+)
+_NUMBER = re.compile(r"[+-]?\d+(?:\.\d+)?")
+
+_KEYWORDS = frozenset(
+    {
+        "ALL",
+        "AND",
+        "ANY",
+        "ASC",
+        "BETWEEN",
+        "BY",
+        "CONTAINS",
+        "DESC",
+        "DURING",
+        "FALSE",
+        "FROM",
+        "IN",
+        "IS",
+        "LIKE",
+        "LIMIT",
+        "NONE",
+        "NOT",
+        "NULL",
+        "ORDER",
+        "PARAMETERS",
+        "REGEXP_MATCH",
+        "SELECT",
+        "TRUE",
+        "WHERE",
+    }
+)
+_CLAUSES = ("SELECT", "FROM", "WHERE", "ORDER BY", "LIMIT", "PARAMETERS")
+
+
+@dataclasses.dataclass(frozen=True)
+class CanonicalQuery:
+    """A GAQL query in canonical form.
+
+    Selected fields and conditions are sorted since their order doesn't
+    change the result; orderings keep their order and an explicit direction.
+    """
+
+    fields: Tuple[str, ...]
+    resource: str
+    conditions: Tuple[str, ...] = ()
+    orderings: Tuple[str, ...] = ()
+    limit: int | None = None
+    parameters: Tuple[str, ...] = ()
+
+    def __str__(self) -> str:
+        parts = [f"SELECT {', '.join(self.fields)} FROM {self.resource}"]
+        if self.conditions:
+            parts.append(f"WHERE {' AND '.join(self.conditions)}")
+        if self.orderings:
+            parts.append(f"ORDER BY {', '.join(self.orderings)}")
+        if self.limit is not None:
+            parts.append(f"LIMIT {self.limit}")
+        if self.parameters:
+            parts.append(f"PARAMETERS {', '.join(self.parameters)}")
+        return " ".join(parts)
+
+    @property
+    def digest(self) -> str:
+        """A stable hex digest of the canonical text."""
+        return hashlib.sha256(str(self).encode("utf-8")).hexdigest()
+
+
+def canonicalize(
+    fields: List[str],
+    resource: str,
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+) -> CanonicalQuery:
+    """Returns the canonical form of the arguments of a search."""
+    where = " AND ".join(conditions) if conditions else ""
+    return CanonicalQuery(
+        fields=_canonical_fields(",".join(fields)),
+        resource=resource.strip(),
+        conditions=_canonical_conditions(where),
+        orderings=_canonical_orderings(",".join(orderings or ())),
+        limit=int(limit) if limit else None,
+    )
+
+
+def parse(query: str) -> CanonicalQuery:
+    """Returns the canonical form of a GAQL query string.
+
+    Raises:
+        ValueError: If the query has no SELECT or FROM clause.
+    """
+    clauses = _split_clauses(_tokenize(query))
+    if "SELECT" not in clauses or "FROM" not in clauses:
+        raise ValueError("A GAQL query needs a SELECT and a FROM clause.")
+    limit = clauses.get("LIMIT")
+    return CanonicalQuery(
+        fields=_canonical_fields(_render(clauses["SELECT"])),
+        resource=_render(clauses["FROM"]),
+        conditions=_canonical_conditions(_render(clauses.get("WHERE", []))),
+        orderings=_canonical_orderings(_render(clauses.get("ORDER BY", []))),
+        limit=int(limit[0]) if limit else None,
+        parameters=tuple(
+            sorted(_split_top_level(clauses.get("PARAMETERS", []), ","))
+        ),
+    )
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character in GAQL: {text[position:]}")
+        tokens.append(_canonical_token(match.group(match.lastindex)))
+        position = match.end()
+    return tokens
+
+
+def _canonical_token(token: str) -> str:
+    if token.upper() in _KEYWORDS:
+        return token.upper()
+    if token.startswith('"') and "'" not in token:
+        return f"'{token[1:-1]}'"
+    if _NUMBER.fullmatch(token):
+        return format(decimal.Decimal(token).normalize(), "f")
+    return token
+
+
+def _render(tokens: List[str]) -> str:
+    """Joins tokens with the canonical spacing."""
+    text = ""
+    for token in tokens:
+        if not text or token in (",", ")") or text.endswith("("):
+            text += token
+        else:
+            text += f" {token}"
+    return text
+
+
+def _split_clauses(tokens: List[str]) -> dict:
+    clauses = {}
+    current = None
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        pair = " ".join(tokens[index : index + 2])
+        if pair == "ORDER BY":
+            current = pair
+            clauses[current] = []
+            index += 2
+            continue
+        if token in _CLAUSES:
+            current = token
+            clauses[current] = []
+        elif current is not None:
+            clauses[current].append(token)
+        index += 1
+    return clauses
+
+
+def _split_top_level(tokens: List[str], separator: str) -> List[str]:
+    """Splits tokens on `separator` outside parentheses, rendering each part.
+
+    The AND of a BETWEEN is not treated as a separator.
+    """
+    parts: List[List[str]] = [[]]
+    depth = 0
+    in_between = False
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        if token == "BETWEEN":
+            in_between = True
+        elif token == separator and depth == 0:
+            if separator == "AND" and in_between:
+                in_between = False
+            else:
+                parts.append([])
+                continue
+        parts[-1].append(token)
+    return [_render(part) for part in parts if part]
+
+
+def _canonical_fields(text: str) -> Tuple[str, ...]:
+    fields = _split_top_level(_tokenize(text), ",") if text.strip() else []
+    return tuple(sorted(set(fields)))
+
+
+def _canonical_conditions(text: str) -> Tuple[str, ...]:
+    if not text.strip():
+        return ()
+    conditions = [
+        _canonical_condition(condition)
+        for condition in _split_top_level(_tokenize(text), "AND")
+    ]
+    return tuple(sorted(set(conditions)))
+
+
+def _canonical_condition(condition: str) -> str:
+    """Sorts and dedupes the values of IN lists, which are unordered."""
+    tokens = _tokenize(condition)
+    if "IN" not in tokens or "(" not in tokens:
+        return _render(tokens)
+    start = tokens.index("(")
+    end = len(tokens) - 1 - tokens[::-1].index(")")
+    values = sorted(set(_split_top_level(tokens[start + 1 : end], ",")))
+    return f"{_render(tokens[:start])} ({', '.join(values)})"
+
+
+def _canonical_orderings(text: str) -> Tuple[str, ...]:
+    if not text.strip():
+        return ()
+    orderings = []
+    for ordering in _split_top_level(_tokenize(text), ","):
+        tokens = ordering.split(" ")
+        direction = tokens[1] if len(tokens) > 1 else "ASC"
+        orderings.append(f"{tokens[0]} {direction}")
+    return tuple(orderings)
@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory index of the GAQL resources and fields in gaql_resources.json.
+
+The index is built once and then answers membership questions (is a field
+selectable, filterable or sortable for a resource, which resources list a
+field) with dictionary and set lookups instead of list scans.
+"""
+
+import collections
+import functools
+import json
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+import ads_mcp.utils as utils
+
+FIELD_ATTRIBUTES = ("selectable", "filterable", "sortable")
+
+# Key marking a trie node that terminates a complete field name.
+_FIELD_END = ""
+
+
+class GaqlSchema:
+    """Index over a list of GAQL resource entries.
+
+    Args:
+        entries: The resource entries as stored in gaql_resources.json, each
+            with a `resource` name and `selectable`, `filterable` and
+            `sortable` field lists.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        self._fields: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._field_sets: Dict[str, Dict[str, FrozenSet[str]]] = {
+            attr: {} for attr in FIELD_ATTRIBUTES
+        }
+        field_resources = collections.defaultdict(set)
+
+        for entry in entries:
+            resource = entry["resource"]
+            self._fields[resource] = {
+                attr: tuple(entry.get(attr, ())) for attr in FIELD_ATTRIBUTES
+            }
+            for attr in FIELD_ATTRIBUTES:
+                fields = frozenset(entry.get(attr, ()))
+                self._field_sets[attr][resource] = fields
+                for field in fields:
+                    field_resources[field].add(resource)
+
+        self._field_resources: Dict[str, FrozenSet[str]] = {
+            field: frozenset(resources)
+            for field, resources in field_resources.items()
+        }
+        self._trie = self._build_trie(self._field_resources)
+
+    @staticmethod
+    def _build_trie(fields: Iterable[str]) -> Dict[str, Any]:
+        """Returns a trie keyed by the dot separated segments of `fields`."""
+        root: Dict[str, Any] = {}
+        for field in fields:
+            node = root
+            for segment in field.split("."):
+                node = node.setdefault(segment, {})
+            node[_FIELD_END] = field
+        return root
+
+    def resources(self) -> List[str]:
+        """Returns all resource names in their original order."""
+        return list(self._fields)
+
+    def has_resource(self, resource: str) -> bool:
+        return resource in self._fields
+
+    def fields(self, resource: str, attribute: str) -> Tuple[str, ...]:
+        """Returns the `attribute` fields of `resource` in their original order.
+
+        Raises:
+            KeyError: If the resource is unknown.
+        """
+        return self._fields[resource][attribute]
+
+    def field_set(self, resource: str, attribute: str) -> FrozenSet[str]:
+        """Returns the `attribute` fields of `resource`, empty if unknown."""
+        return self._field_sets[attribute].get(resource, frozenset())
+
+    def is_selectable(self, field: str) -> bool:
+        return field in self.field_set(resource_of(field), "selectable")
+
+    def is_filterable(self, field: str) -> bool:
+        return field in self.field_set(resource_of(field), "filterable")
+
+    def is_sortable(self, field: str) -> bool:
+        return field in self.field_set(resource_of(field), "sortable")
+
+    def resources_for_field(self, field: str) -> FrozenSet[str]:
+        """Returns the resources that list `field`, empty if it is unknown."""
+        return self._field_resources.get(field, frozenset())
+
+    def complete(self, prefix: str, limit: int = 50) -> List[str]:
+        """Returns up to `limit` field names starting with `prefix`, sorted."""
+        *segments, partial = prefix.split(".")
+        node = self._trie
+        for segment in segments:
+            node = node.get(segment)
+            if node is None:
+                return []
+
+        matches: List[str] = []
+        stack = [
+            child
+            for key, child in node.items()
+            if key != _FIELD_END and key.startswith(partial)
+        ]
+        while stack:
+            child = stack.pop()
+            for key, grandchild in child.items():
+                if key == _FIELD_END:
+                    matches.append(grandchild)
+                else:
+                    stack.append(grandchild)
+        return sorted(matches)[:limit]
+
+
+def resource_of(field: str) -> str:
+    """Returns the resource prefix of a field, e.g. campaign for campaign.id."""
+    return field.split(".", 1)[0]
+
+
+@functools.cache
+def get_schema() -> GaqlSchema:
+    """Returns the schema index for gaql_resources.json, built on first use."""
+    try:
+        with open(utils.get_gaql_resources_filepath(), "r") as file:
+            entries = json.load(file)
+    except FileNotFoundError:
+        utils.logger.error("The specified file was not found.")
+        entries = []
+    return GaqlSchema(entries)
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local validation of search arguments against the GAQL schema index.
+
+Catches unknown resources and fields that can't be used in the clause they
+appear in before a query is sent to the API, saving the round trip and the
+developer token quota an invalid query would cost.
+"""
+
+import re
+from typing import Dict, List
+
+from ads_mcp import gaql_schema
+
+# Entries in gaql_resources.json that only contribute fields to other
+# resources and can't be used in the FROM clause.
+_FIELD_ONLY_RESOURCES = frozenset({"metrics", "segments"})
+
+# Requests to change_event must specify a LIMIT no greater than this.
+_CHANGE_EVENT_RESOURCE = "change_event"
+_CHANGE_EVENT_MAX_LIMIT = 10000
+
+_CONDITION_FIELD = re.compile(r"\s*([A-Za-z0-9_.]+)")
+_ORDERING = re.compile(r"\s*([A-Za-z0-9_.]+)(?:\s+(\w+))?\s*$")
+_ORDERING_DIRECTIONS = frozenset({"ASC", "DESC"})
+
+
+class GaqlValidationError(ValueError):
+    """Raised when search arguments fail validation.
+
+    Attributes:
+        errors: One dict per problem found, with the `clause` it was found in,
+            the offending `value` and a `message`.
+    """
+
+    def __init__(self, errors: List[Dict[str, str]]):
+        self.errors = errors
+        details = "\n".join(
+            f"- {error['clause']} {error['value']!r}: {error['message']}"
+            for error in errors
+        )
+        super().__init__(f"Invalid search query:\n{details}")
+
+
+def validate_search(
+    resource: str,
+    fields: List[str],
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+) -> None:
+    """Validates the arguments of a search against the GAQL schema.
+
+    Fields are checked against the resource named by their prefix, so fields
+    of attributed resources, segments and metrics are accepted as long as the
+    attribute required by their clause is set.
+
+    Raises:
+        GaqlValidationError: If any problems were found. All problems are
+            reported, not just the first.
+    """
+    schema = gaql_schema.get_schema()
+    errors: List[Dict[str, str]] = []
+
+    def error(clause: str, value: str, message: str) -> None:
+        errors.append({"clause": clause, "value": value, "message": message})
+
+    def check_field(clause: str, field: str, attribute: str) -> None:
+        prefix = gaql_schema.resource_of(field)
+        if "." not in field or not schema.has_resource(prefix):
+            error(
+                clause,
+                field,
+                "fields must be prefixed with a resource, e.g. campaign.id",
+            )
+        elif field not in schema.field_set(prefix, attribute):
+            error(clause, field, f"field is not {attribute}")
+
+    if not schema.has_resource(resource) or resource in _FIELD_ONLY_RESOURCES:
+        error("FROM", resource, "unknown resource, see list_resources")
+
+    if not fields:
+        error("SELECT", "", "at least one field must be selected")
+    for field in fields or ():
+        check_field("SELECT", field.strip(), "selectable")
+
+    for condition in conditions or ():
+        match = _CONDITION_FIELD.match(condition)
+        if match is None:
+            error("WHERE", condition, "condition must start with a field")
+        else:
+            check_field("WHERE", match.group(1), "filterable")
+
+    for ordering in orderings or ():
+        match = _ORDERING.match(ordering)
+        if match is None:
+            error("ORDER BY", ordering, "expected a field and ASC or DESC")
+            continue
+        check_field("ORDER BY", match.group(1), "sortable")
+        direction = match.group(2)
+        if direction and direction.upper() not in _ORDERING_DIRECTIONS:
+            error("ORDER BY", ordering, "direction must be ASC or DESC")
+
+    parsed_limit = None
+    if limit is not None and limit != "":
+        try:
+            parsed_limit = int(limit)
+        except (TypeError, ValueError):
+            parsed_limit = None
+        if parsed_limit is None or parsed_limit <= 0:
+            error("LIMIT", str(limit), "limit must be a positive integer")
+
+    if resource == _CHANGE_EVENT_RESOURCE and (
+        parsed_limit is None or parsed_limit > _CHANGE_EVENT_MAX_LIMIT
+    ):
+        error(
+            "LIMIT",
+            str(limit),
+            f"requests to {_CHANGE_EVENT_RESOURCE} must specify a LIMIT of at "
+            f"most {_CHANGE_EVENT_MAX_LIMIT}",
+        )
+
+    if errors:
+        raise GaqlValidationError(errors)
@@ -56,31 +56,7 @@ class MCPHeaderInterceptor(
             A grpc.Call/grpc.Future instance representing a service response.
         """
         try:
-            if client_call_details.metadata is None:
-                metadata = []
-            else:
-                metadata = list(client_call_details.metadata)
-
-            for i, metadatum in enumerate(metadata):
-                # Check if the user agent header key is in the current metadatum
-                if metadatum[0] == self._API_CLIENT_HEADER:
-                    # Convert the tuple to a list so it can be modified.
-                    val = list(metadatum)
-                    # Check that "google-ads-mcp" isn't already included in the user agent.
-                    if "google-ads-mcp" not in val[1]:
-                        # Append the protobuf version key value pair to the end of
-                        # the string.
-                        val[1] += self._MCP_EXTRA_HEADER
-                        # Convert the metadatum back to a tuple and
-                        # Splice it back in its original position in
-                        # order to preserve the order of the metadata list.
-                        metadata[i] = tuple(val)
-                        # Exit the loop since we already found the user agent.
-                        break
-
-            new_client_call_details = client_call_details._replace(
-                metadata=metadata
-            )
+            new_client_call_details = _with_mcp_header(client_call_details)
             return continuation(new_client_call_details, request)
         except:
             logger.error("Error in MCPHeaderInterceptor", exc_info=True)
@@ -93,3 +69,80 @@ class MCPHeaderInterceptor(
 
     def intercept_unary_unary(self, continuation, client_call_details, request):
         return self._mcp_intercept(continuation, client_call_details, request)
+
+
+def _with_mcp_header(client_call_details):
+    """Returns a copy of the call details with the MCP user agent added."""
+    if client_call_details.metadata is None:
+        metadata = []
+    else:
+        metadata = list(client_call_details.metadata)
+
+    for i, metadatum in enumerate(metadata):
+        # Check if the user agent header key is in the current metadatum
+        if metadatum[0] == MCPHeaderInterceptor._API_CLIENT_HEADER:
+            # Convert the tuple to a list so it can be modified.
+            val = list(metadatum)
+            # Check that "google-ads-mcp" isn't already included in the user agent.
+            if "google-ads-mcp" not in val[1]:
+                # Append the protobuf version key value pair to the end of
+                # the string.
+                val[1] += MCPHeaderInterceptor._MCP_EXTRA_HEADER
+                # Convert the metadatum back to a tuple and
+                # Splice it back in its original position in
+                # order to preserve the order of the metadata list.
+                metadata[i] = tuple(val)
+                # Exit the loop since we already found the user agent.
+                break
+
+    return client_call_details._replace(metadata=metadata)
+
+
+class _AsyncMCPHeaderInterceptor:
+    """Adds the 'google-ads-mcp' header to grpc.aio calls."""
+
+    async def _mcp_intercept_async(
+        self, continuation, client_call_details, request
+    ):
+        """Generic interceptor used for async Unary-Unary and Unary-Stream
+        requests.
+
+        Args:
+            continuation: a coroutine function to continue the request process.
+            client_call_details: a grpc.aio.ClientCallDetails instance
+                containing request metadata.
+            request: a SearchGoogleAdsRequest or SearchGoogleAdsStreamRequest
+                message class instance.
+
+        Returns:
+            A grpc.aio.Call instance representing a service response.
+        """
+        try:
+            client_call_details = _with_mcp_header(client_call_details)
+        except:
+            logger.error("Error in MCPHeaderInterceptor", exc_info=True)
+        return await continuation(client_call_details, request)
+
+
+# grpc.aio channels sort interceptors by the first interceptor type they
+# implement, so unary-unary and unary-stream calls need one class each.
+class MCPHeaderUnaryUnaryAioInterceptor(
+    _AsyncMCPHeaderInterceptor, grpc.aio.UnaryUnaryClientInterceptor
+):
+    async def intercept_unary_unary(
+        self, continuation, client_call_details, request
+    ):
+        return await self._mcp_intercept_async(
+            continuation, client_call_details, request
+        )
+
+
+class MCPHeaderUnaryStreamAioInterceptor(
+    _AsyncMCPHeaderInterceptor, grpc.aio.UnaryStreamClientInterceptor
+):
+    async def intercept_unary_stream(
+        self, continuation, client_call_details, request
+    ):
+        return await self._mcp_intercept_async(
+            continuation, client_call_details, request
+        )
@@ -0,0 +1,573 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide metrics of the MCP server.
+
+Tool calls and upstream RPCs are timed into histograms and counted by
+outcome. The metrics can be read as a JSON snapshot or in the Prometheus
+text exposition format. If the OpenTelemetry API is installed, upstream RPCs
+are also traced as spans, exported by whatever SDK the process configures.
+"""
+
+import bisect
+import contextlib
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+try:
+    from opentelemetry import context as _otel_context
+    from opentelemetry import trace as _otel_trace
+except ImportError:
+    _otel_context = None
+    _otel_trace = None
+
+from ads_mcp import daily_store
+from ads_mcp import result_cache
+from ads_mcp import retry
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+# Items of a list that are sized when estimating the size of a result, the
+# size of longer lists is extrapolated from them.
+_SIZE_SAMPLE = 32
+
+
+class Counter:
+    """A monotonically increasing count, per combination of label values.
+
+    Args:
+        name: The metric name.
+        description: What is counted.
+        labels: The label names, whose values are passed to `inc`.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_values(self.labels, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = _label_values(self.labels, labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"labels": dict(zip(self.labels, key)), "value": value}
+                for key, value in self._values.items()
+            ]
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Histogram:
+    """Counts of observed values in cumulative buckets, with their sum.
+
+    Args:
+        name: The metric name.
+        description: What is observed.
+        labels: The label names, whose values are passed to `observe`.
+        buckets: The increasing upper bounds of the buckets.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> (count per bucket and +Inf, sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_values(self.labels, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(
+                key, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        key = _label_values(self.labels, labels)
+        with self._lock:
+            counts, _ = self._values.get(key, ([0], 0.0))
+            return sum(counts)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        return [
+            {
+                "labels": dict(zip(self.labels, key)),
+                "count": sum(counts),
+                "sum": total,
+                "buckets": dict(
+                    zip(
+                        [*map(str, self.buckets), "+Inf"],
+                        _cumulative(counts),
+                    )
+                ),
+            }
+            for key, counts, total in items
+        ]
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for entry in self.snapshot():
+            for bound, count in entry["buckets"].items():
+                yield (
+                    f"{self.name}_bucket",
+                    {**entry["labels"], "le": bound},
+                    count,
+                )
+            yield f"{self.name}_sum", entry["labels"], entry["sum"]
+            yield f"{self.name}_count", entry["labels"], entry["count"]
+
+
+class Gauge:
+    """Values read from a callback each time the metrics are collected.
+
+    Args:
+        name: The metric name.
+        description: What is measured.
+        labels: The label names.
+        callback: Returns (label values, value) pairs.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str],
+        callback: Callable[[], Sequence[Tuple[Dict[str, str], float]]],
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._callback = callback
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {"labels": labels, "value": value}
+            for labels, value in self._callback()
+        ]
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for labels, value in self._callback():
+            yield self.name, labels, value
+
+
+class Registry:
+    """The metrics of the process, by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Counter | Histogram | Gauge] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(
+        self, name: str, description: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, description, labels))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, description, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str],
+        callback: Callable[[], Sequence[Tuple[Dict[str, str], float]]],
+    ) -> Gauge:
+        return self._register(Gauge(name, description, labels, callback))
+
+    def on_collect(self, callback: Callable[[], None]) -> None:
+        """Calls `callback` each time before the metrics are read.
+
+        Use it to take a snapshot shared by several gauges, rather than have
+        each gauge take its own.
+        """
+        self._collectors.append(callback)
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._collect()
+        return {
+            name: {
+                "description": metric.description,
+                "type": metric.type,
+                "values": metric.snapshot(),
+            }
+            for name, metric in self._metrics.items()
+        }
+
+    def render_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        self._collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.description}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for sample, labels, value in metric.samples():
+                lines.append(
+                    f"{sample}{_render_labels(labels)} {_render_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _collect(self) -> None:
+        for callback in self._collectors:
+            callback()
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _label_values(
+    names: Tuple[str, ...], labels: Dict[str, Any]
+) -> Tuple[str, ...]:
+    return tuple(str(labels[name]) for name in names)
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    total = 0
+    cumulative = []
+    for count in counts:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _render_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        for value in labels.values()
+    )
+    pairs = ",".join(
+        f'{name}="{value}"' for name, value in zip(labels, escaped)
+    )
+    return f"{{{pairs}}}"
+
+
+def _render_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+tool_latency = registry.histogram(
+    "ads_mcp_tool_call_seconds",
+    "Duration of tool calls.",
+    ("tool",),
+)
+tool_errors = registry.counter(
+    "ads_mcp_tool_errors_total",
+    "Tool calls that failed, by gRPC status code or exception type.",
+    ("tool", "code"),
+)
+rows_returned = registry.counter(
+    "ads_mcp_rows_returned_total",
+    "Rows returned by tool calls.",
+    ("tool",),
+)
+bytes_returned = registry.counter(
+    "ads_mcp_bytes_returned_total",
+    "Estimated JSON size of the results returned by tool calls.",
+    ("tool",),
+)
+calls_cancelled = registry.counter(
+    "ads_mcp_tool_calls_cancelled_total",
+    "Tool calls cancelled by the client before they finished.",
+    ("tool",),
+)
+calls_timed_out = registry.counter(
+    "ads_mcp_tool_calls_timed_out_total",
+    "Tool calls that failed because they exceeded their timeout.",
+    ("tool",),
+)
+rpc_latency = registry.histogram(
+    "ads_mcp_upstream_rpc_seconds",
+    "Duration of Google Ads API calls, until the last streamed batch, "
+    "excluding the processing of the batches.",
+    ("method",),
+)
+rpc_errors = registry.counter(
+    "ads_mcp_upstream_rpc_errors_total",
+    "Google Ads API calls that failed, by gRPC status code.",
+    ("method", "code"),
+)
+stream_batches = registry.counter(
+    "ads_mcp_stream_batches_total",
+    "Batches received from search_stream.",
+)
+
+# Caches reported by the cache gauges, by name, see register_cache.
+_caches: Dict[str, Callable[[], Dict[str, Any]]] = {}
+# The stats of each cache, taken once per collection of the metrics.
+_cache_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Reports the ResultCache.stats() compatible `stats` of a cache."""
+    _caches[name] = stats
+
+
+def _collect_cache_stats() -> None:
+    global _cache_stats
+    _cache_stats = {name: stats() for name, stats in list(_caches.items())}
+
+
+def _cache_values(stat: str) -> List[Tuple[Dict[str, str], float]]:
+    values = []
+    for name, stats in _cache_stats.items():
+        value = stats.get(stat)
+        if value is not None:
+            values.append(({"cache": name}, value))
+    return values
+
+
+registry.on_collect(_collect_cache_stats)
+for _stat, _description in (
+    ("entries", "Entries held by a cache."),
+    ("bytes", "Estimated size of the entries held by a cache."),
+    ("hits", "Lookups that found a fresh entry, since start."),
+    ("misses", "Lookups that found no fresh entry, since start."),
+    ("evictions", "Entries evicted to stay within the size bound."),
+    ("oldest_age_seconds", "Age of the oldest entry of a cache."),
+):
+    registry.gauge(
+        f"ads_mcp_cache_{_stat}",
+        _description,
+        ("cache",),
+        functools.partial(_cache_values, _stat),
+    )
+
+register_cache("search_results", result_cache.search_results.stats)
+if daily_store.store is not None:
+    register_cache("daily_store", daily_store.store.stats)
+
+
+def _estimate_size(value: Any) -> int:
+    """Returns an estimate of the size of the JSON encoding of `value`.
+
+    Unlike result_cache.estimate_size, nothing is encoded and only the first
+    _SIZE_SAMPLE items of each list are sized, so large results are cheap
+    to measure.
+    """
+    if isinstance(value, dict):
+        return max(2 * len(value), 2) + sum(
+            len(str(key)) + 4 + _estimate_size(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return 2
+        sample = value[:_SIZE_SAMPLE]
+        size = sum(_estimate_size(item) + 2 for item in sample)
+        return size * len(value) // len(sample)
+    if isinstance(value, str):
+        return len(value) + 2
+    if value is None:
+        return 4
+    return len(str(value))
+
+
+def error_code(error: BaseException) -> str:
+    """Returns the gRPC status code name of an error, or its type name."""
+    code = retry.status_code(error)
+    return code.name if code is not None else type(error).__name__
+
+
+class RpcCall:
+    """A Google Ads API call being timed by track_rpc."""
+
+    def __init__(self, parent_context: Any = None):
+        self.paused_seconds = 0.0
+        self._parent_context = parent_context
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        """Excludes the block from the latency of the call.
+
+        Use it around the processing of each streamed batch, in particular
+        around a `yield` to the consumer of the stream. The span of the call
+        isn't the current span inside the block.
+        """
+        token = (
+            _otel_context.attach(self._parent_context)
+            if self._parent_context is not None
+            else None
+        )
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused_seconds += time.perf_counter() - start
+            if token is not None:
+                _otel_context.detach(token)
+
+
+@contextlib.contextmanager
+def track_rpc(method: str, **attributes: Any) -> Iterator[RpcCall]:
+    """Times a Google Ads API call and counts its errors.
+
+    The call is also traced as a span if OpenTelemetry is installed, with
+    `attributes` as span attributes. Time spent in RpcCall.paused() blocks
+    isn't counted, and is set as the ads_mcp.paused_seconds span attribute.
+    """
+    with contextlib.ExitStack() as stack:
+        call = RpcCall(
+            _otel_context.get_current() if _otel_context is not None else None
+        )
+        if _otel_trace is not None:
+            tracer = _otel_trace.get_tracer("ads_mcp")
+            span = stack.enter_context(
+                tracer.start_as_current_span(
+                    f"google.ads.googleads.GoogleAdsService/{method}",
+                    attributes={
+                        key: str(value) for key, value in attributes.items()
+                    },
+                )
+            )
+            stack.callback(
+                lambda: span.set_attribute(
+                    "ads_mcp.paused_seconds", call.paused_seconds
+                )
+            )
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            rpc_errors.inc(method=method, code=error_code(e))
+            raise
+        finally:
+            rpc_latency.observe(
+                time.perf_counter() - start - call.paused_seconds,
+                method=method,
+            )
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Records the latency, errors and result size of a tool function.
+
+    Apply it below the tool registration decorator; the wrapper keeps the
+    signature of `fn`, so the tool schema is unchanged.
+    """
+    tool = fn.__name__
+
+    def record(start: float, result: Any) -> Any:
+        tool_latency.observe(time.perf_counter() - start, tool=tool)
+        if isinstance(result, dict):
+            rows = result.get("rows")
+            rows_returned.inc(
+                (
+                    len(rows)
+                    if isinstance(rows, list)
+                    else result.get("row_count", 0)
+                ),
+                tool=tool,
+            )
+        bytes_returned.inc(_estimate_size(result), tool=tool)
+        return result
+
+    def record_error(start: float, error: BaseException) -> None:
+        tool_latency.observe(time.perf_counter() - start, tool=tool)
+        tool_errors.inc(tool=tool, code=error_code(error))
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                record_error(start, e)
+                raise
+            return record(start, result)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            record_error(start, e)
+            raise
+        return record(start, result)
+
+    return wrapper
@@ -0,0 +1,172 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Response size budgets and continuation cursors for search results.
+
+Results larger than the row or byte budget of a call are split into pages.
+The rows that didn't fit are kept server side, behind an opaque cursor, so
+the next page can be fetched without running the query again.
+"""
+
+import collections
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+# Default budgets for a single response, overridable with environment
+# variables.
+DEFAULT_MAX_ROWS = int(os.environ.get("GOOGLE_ADS_MCP_MAX_ROWS", "1000"))
+DEFAULT_MAX_BYTES = int(os.environ.get("GOOGLE_ADS_MCP_MAX_BYTES", "1000000"))
+# Upper bound on the rows read from the API for a single search.
+MAX_FETCH_ROWS = int(os.environ.get("GOOGLE_ADS_MCP_MAX_FETCH_ROWS", "100000"))
+
+_CURSOR_TTL_SECONDS = 15 * 60
+_MAX_CURSORS = 100
+# Upper bound on the estimated JSON size of the rows held behind cursors.
+CURSOR_MAX_BYTES = int(
+    os.environ.get("GOOGLE_ADS_MCP_CURSOR_MAX_BYTES", "100000000")
+)
+
+
+class CursorStore:
+    """Keeps the rows of truncated results for a limited time.
+
+    Each cursor refers to a result and an offset into it, so fetching a page
+    doesn't copy the remaining rows. Cursors expire after `ttl_seconds` and
+    the oldest are dropped once more than `max_cursors` are held, or once
+    the rows they hold are estimated to exceed `max_bytes`. The newest
+    cursor is always kept.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = _CURSOR_TTL_SECONDS,
+        max_cursors: int = _MAX_CURSORS,
+        max_bytes: int = CURSOR_MAX_BYTES,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_cursors = max_cursors
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # cursor -> (expires_at, rows, offset, size), oldest first.
+        self._entries: collections.OrderedDict[
+            str, Tuple[float, List[Any], int, int]
+        ] = collections.OrderedDict()
+        self._bytes = 0
+
+    def put(self, rows: List[Any], offset: int, size: int = 0) -> str:
+        """Stores `rows` from `offset` on and returns a cursor for them.
+
+        `size` is the estimated JSON size of the rows from `offset` on.
+        """
+        cursor = secrets.token_urlsafe(16)
+        with self._lock:
+            self._evict_expired()
+            self._entries[cursor] = (
+                time.monotonic() + self._ttl_seconds,
+                rows,
+                offset,
+                size,
+            )
+            self._bytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self._max_cursors
+                or self._bytes > self._max_bytes
+            ):
+                self._bytes -= self._entries.popitem(last=False)[1][3]
+        return cursor
+
+    def pop(self, cursor: str) -> Tuple[List[Any], int]:
+        """Removes a cursor and returns its rows and offset.
+
+        Raises:
+            ValueError: If the cursor is unknown or has expired.
+        """
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.pop(cursor, None)
+            if entry is not None:
+                self._bytes -= entry[3]
+        if entry is None:
+            raise ValueError(
+                "Unknown or expired cursor, run the search again to get the "
+                "remaining rows."
+            )
+        _, rows, offset, _ = entry
+        return rows, offset
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            cursor, (expires_at, _, _, size) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[cursor]
+            self._bytes -= size
+
+
+cursors = CursorStore()
+
+
+def paginate(
+    rows: List[Any],
+    max_rows: int = None,
+    max_bytes: int = None,
+    offset: int = 0,
+    store: CursorStore = cursors,
+) -> Dict[str, Any]:
+    """Returns the page of `rows` starting at `offset` that fits the budget.
+
+    A page always holds at least one row, even if that row alone exceeds
+    `max_bytes`. The byte size of a row is that of its JSON encoding.
+
+    Returns:
+        A dict with the `rows` of the page and a `next_cursor` for the
+        remaining rows, which is None if there are none.
+    """
+    max_rows = max_rows or DEFAULT_MAX_ROWS
+    max_bytes = max_bytes or DEFAULT_MAX_BYTES
+
+    end = offset
+    size = 0
+    while end < len(rows) and end - offset < max_rows:
+        size += len(json.dumps(rows[end], default=str))
+        if size > max_bytes and end > offset:
+            break
+        end += 1
+
+    next_cursor = None
+    if end < len(rows):
+        # The remaining rows are sized from the average row of this page.
+        remaining_size = size * (len(rows) - end) // max(end - offset, 1)
+        next_cursor = store.put(rows, end, remaining_size)
+    return {"rows": rows[offset:end], "next_cursor": next_cursor}
+
+
+def next_page(
+    cursor: str,
+    max_rows: int = None,
+    max_bytes: int = None,
+    store: CursorStore = cursors,
+) -> Dict[str, Any]:
+    """Returns the page following `cursor`, see paginate.
+
+    Raises:
+        ValueError: If the cursor is unknown or has expired.
+    """
+    rows, offset = store.pop(cursor)
+    return paginate(rows, max_rows, max_bytes, offset, store)
@@ -0,0 +1,287 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client-side rate limiting of Google Ads API calls.
+
+Bursts of tool calls are smoothed by token buckets, one per developer token
+and one per customer id, rather than being sent on and rejected with
+RESOURCE_EXHAUSTED. Calls that find a bucket empty wait in a queue, where
+interactive calls are served before background ones such as fan-outs across
+many customers. An optional daily budget of calls per developer token fails
+calls fast once spent instead of queuing them.
+"""
+
+import asyncio
+import datetime
+import enum
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import ads_mcp.utils as utils
+
+# Sustained calls per second and burst size of each developer token and each
+# customer id, overridable with environment variables.
+DEVELOPER_TOKEN_QPS = float(
+    os.environ.get("GOOGLE_ADS_MCP_DEVELOPER_TOKEN_QPS", "10")
+)
+DEVELOPER_TOKEN_BURST = float(
+    os.environ.get("GOOGLE_ADS_MCP_DEVELOPER_TOKEN_BURST", "20")
+)
+CUSTOMER_QPS = float(os.environ.get("GOOGLE_ADS_MCP_CUSTOMER_QPS", "5"))
+CUSTOMER_BURST = float(os.environ.get("GOOGLE_ADS_MCP_CUSTOMER_BURST", "10"))
+# Calls per developer token and UTC day, 0 for no limit.
+DAILY_CALLS = int(os.environ.get("GOOGLE_ADS_MCP_DAILY_CALLS", "0"))
+
+# Idle customer buckets are dropped once this many customers have one.
+_MAX_IDLE_BUCKETS = 1000
+
+
+class Priority(enum.IntEnum):
+    """Queue lanes, lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when the daily budget of calls has been spent."""
+
+
+class TokenBucket:
+    """An asyncio token bucket with a priority queue of waiters.
+
+    Args:
+        rate: The tokens added per second.
+        burst: The maximum number of tokens, which the bucket starts with.
+
+    Raises:
+        ValueError: If `rate` isn't positive.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if not rate > 0:
+            raise ValueError(f"The rate must be positive, got {rate}.")
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        # (priority, sequence, future) of the waiting calls.
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Takes a token, waiting behind earlier and higher priority calls."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (int(priority), next(self._sequence), future)
+        )
+        self._schedule()
+        # A cancelled waiter is skipped when it reaches the head of the queue.
+        await future
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def idle(self) -> bool:
+        return not self._waiters and self.tokens >= self.burst
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _drain(self) -> None:
+        """Hands tokens to the waiters at the head of the queue."""
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            future = self._waiters[0][2]
+            # Waiters of a closed loop can't be woken up and are skipped.
+            if not future.done() and not future.get_loop().is_closed():
+                if self._tokens < 1:
+                    break
+                self._tokens -= 1
+                future.set_result(None)
+            heapq.heappop(self._waiters)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Wakes up the queue when the next token is due."""
+        loop = asyncio.get_running_loop()
+        # A timer of a loop that has since been closed will never fire.
+        if self._timer is not None and self._timer_loop is loop:
+            return
+        if not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = loop.call_later(delay, self._drain)
+        self._timer_loop = loop
+
+
+class RateLimiter:
+    """Token buckets per developer token and per customer id.
+
+    Raises:
+        ValueError: If a QPS isn't positive.
+    """
+
+    def __init__(
+        self,
+        developer_token_qps: float = DEVELOPER_TOKEN_QPS,
+        developer_token_burst: float = DEVELOPER_TOKEN_BURST,
+        customer_qps: float = CUSTOMER_QPS,
+        customer_burst: float = CUSTOMER_BURST,
+        daily_calls: int = DAILY_CALLS,
+    ):
+        for name, qps in (
+            ("GOOGLE_ADS_MCP_DEVELOPER_TOKEN_QPS", developer_token_qps),
+            ("GOOGLE_ADS_MCP_CUSTOMER_QPS", customer_qps),
+        ):
+            if not qps > 0:
+                raise ValueError(f"{name} must be positive, got {qps}.")
+        self._developer_token_limits = (
+            developer_token_qps,
+            developer_token_burst,
+        )
+        self._customer_limits = (customer_qps, customer_burst)
+        self._daily_calls = daily_calls
+        self._developer_tokens: Dict[str, TokenBucket] = {}
+        self._customers: Dict[str, TokenBucket] = {}
+        # developer token -> (UTC date, calls made that day)
+        self._calls_today: Dict[str, Tuple[datetime.date, int]] = {}
+
+    async def acquire(
+        self,
+        developer_token: str,
+        customer_id: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> None:
+        """Waits until a call for `customer_id` may be sent.
+
+        Raises:
+            QuotaExceededError: If the daily budget of the developer token has
+                been spent.
+        """
+        self._count_call(developer_token)
+        if customer_id is not None:
+            await self._customer_bucket(customer_id).acquire(priority)
+        bucket = self._developer_tokens.get(developer_token)
+        if bucket is None:
+            bucket = TokenBucket(*self._developer_token_limits)
+            self._developer_tokens[developer_token] = bucket
+        await bucket.acquire(priority)
+
+    def status(self) -> Dict[str, Any]:
+        """Returns the available tokens and queue lengths of the buckets.
+
+        Developer tokens are identified by their last four characters, and
+        only the customers with fewer tokens than their burst are listed.
+        """
+        today = _utc_today()
+        return {
+            "developer_tokens": {
+                f"...{token[-4:]}": {
+                    **_bucket_status(bucket),
+                    "calls_today": self._calls_on(token, today),
+                    "daily_calls": self._daily_calls or None,
+                }
+                for token, bucket in self._developer_tokens.items()
+            },
+            "customers": {
+                customer_id: _bucket_status(bucket)
+                for customer_id, bucket in self._customers.items()
+                if not bucket.idle
+            },
+        }
+
+    def _calls_on(self, developer_token: str, day: datetime.date) -> int:
+        counted_day, calls = self._calls_today.get(developer_token, (day, 0))
+        return calls if counted_day == day else 0
+
+    def _count_call(self, developer_token: str) -> None:
+        today = _utc_today()
+        calls = self._calls_on(developer_token, today)
+        if self._daily_calls and calls >= self._daily_calls:
+            raise QuotaExceededError(
+                f"The daily budget of {self._daily_calls} Google Ads API calls "
+                "has been spent, try again tomorrow (UTC)."
+            )
+        self._calls_today[developer_token] = (today, calls + 1)
+
+    def _customer_bucket(self, customer_id: str) -> TokenBucket:
+        bucket = self._customers.get(customer_id)
+        if bucket is None:
+            if len(self._customers) >= _MAX_IDLE_BUCKETS:
+                self._customers = {
+                    key: value
+                    for key, value in self._customers.items()
+                    if not value.idle
+                }
+            bucket = TokenBucket(*self._customer_limits)
+            self._customers[customer_id] = bucket
+        return bucket
+
+
+def _utc_today() -> datetime.date:
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+def _bucket_status(bucket: TokenBucket) -> Dict[str, Any]:
+    return {
+        "tokens": round(bucket.tokens, 2),
+        "rate": bucket.rate,
+        "burst": bucket.burst,
+        "queued": bucket.queued,
+    }
+
+
+limiter = RateLimiter()
+
+# The developer token of the shared client, read once since looking it up
+# may create the client in a worker thread.
+_developer_token: str | None = None
+
+
+async def throttle(
+    customer_id: str | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> None:
+    """Waits until the shared client may call the API for `customer_id`.
+
+    Raises:
+        QuotaExceededError: If the daily budget of calls has been spent.
+    """
+    global _developer_token
+    if _developer_token is None:
+        client = await asyncio.to_thread(utils.get_googleads_client)
+        _developer_token = client.developer_token
+    await limiter.acquire(_developer_token, customer_id, priority)
@@ -0,0 +1,182 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory TTL and LRU cache for search results.
+
+Agents often repeat the same search within a conversation. Results are cached
+by customer id and canonical query (see gaql_normalizer), with a time to live
+that depends on how quickly the data changes: metrics are kept briefly,
+settings of resources such as campaigns for longer. The cache is bounded by
+the estimated size of the results it holds, evicting the least recently used
+first. Setting GOOGLE_ADS_MCP_CACHE_PATH keeps the results in a SQLite
+database instead, shared by processes and surviving restarts.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Tuple
+
+from ads_mcp import sqlite_cache
+
+# Time to live, in seconds, of results without and with metrics.
+METADATA_TTL_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_CACHE_METADATA_TTL", "600")
+)
+METRICS_TTL_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_CACHE_METRICS_TTL", "60")
+)
+# Upper bound on the estimated size of all cached results, 0 disables caching.
+MAX_BYTES = int(os.environ.get("GOOGLE_ADS_MCP_CACHE_MAX_BYTES", "50000000"))
+# SQLite database of a persistent cache shared by processes, see sqlite_cache.
+# Results are cached in memory if unset.
+CACHE_PATH = os.environ.get("GOOGLE_ADS_MCP_CACHE_PATH", "")
+# Upper bound on the compressed size of the results in CACHE_PATH.
+PERSISTENT_MAX_BYTES = int(
+    os.environ.get("GOOGLE_ADS_MCP_CACHE_PERSISTENT_MAX_BYTES", "500000000")
+)
+
+# Resources that record activity as it happens, cached like metrics.
+_VOLATILE_RESOURCES = frozenset(
+    {
+        "batch_job",
+        "change_event",
+        "change_status",
+        "click_view",
+        "offline_user_data_job",
+        "recommendation",
+    }
+)
+
+
+def ttl_for(resource: str, fields: List[str]) -> float:
+    """Returns the time to live of a search of `fields` from `resource`."""
+    if resource in _VOLATILE_RESOURCES or any(
+        field.startswith("metrics.") for field in fields
+    ):
+        return METRICS_TTL_SECONDS
+    return METADATA_TTL_SECONDS
+
+
+def estimate_size(value: Any) -> int:
+    """Returns the size of the JSON encoding of `value`."""
+    return len(json.dumps(value, default=str))
+
+
+class ResultCache:
+    """Thread-safe cache with per-entry TTL and LRU eviction by size.
+
+    Args:
+        max_bytes: The maximum total size of the cached values, as reported
+            to `put`. Values larger than this aren't cached.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, value, stored_at), least recently used
+        # first.
+        self._entries: collections.OrderedDict[
+            Hashable, Tuple[float, int, Any, float]
+        ] = collections.OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value for `key`, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, value: Any, ttl: float, size: int) -> None:
+        """Caches `value` for `ttl` seconds, evicting older entries if needed."""
+        if ttl <= 0 or size > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            now = time.monotonic()
+            self._entries[key] = (now + ttl, size, value, now)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    async def get_async(self, key: Hashable) -> Any:
+        """Same as get, for callers on the event loop."""
+        return self.get(key)
+
+    async def put_async(
+        self, key: Hashable, value: Any, ttl: float, size: int
+    ) -> None:
+        """Same as put, for callers on the event loop."""
+        self.put(key, value, ttl, size)
+
+    def age(self, key: Hashable) -> float | None:
+        """Returns the seconds since `key` was cached, or None if absent.
+
+        Doesn't count as a lookup or refresh the entry's recency.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return time.monotonic() - entry[3]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            now = time.monotonic()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "oldest_age_seconds": max(
+                    (now - entry[3] for entry in self._entries.values()),
+                    default=None,
+                ),
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+search_results = (
+    sqlite_cache.SqliteResultCache(CACHE_PATH, PERSISTENT_MAX_BYTES)
+    if CACHE_PATH
+    else ResultCache()
+)
@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retries of transient Google Ads API errors.
+
+Calls failing with UNAVAILABLE, DEADLINE_EXCEEDED or INTERNAL are retried
+after an exponential backoff with full jitter. Retries are drawn from a
+budget that grows with the number of calls, so an outage doesn't multiply
+the load on the API. Small metadata calls can also be hedged: if the first
+attempt hasn't answered after a delay, a second one is sent and the first
+answer wins.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import grpc
+from google.ads.googleads.errors import GoogleAdsException
+from google.api_core import exceptions as api_exceptions
+
+# Not ads_mcp.utils, which imports a versioned Google Ads API, so main.py can
+# retry calls whatever API versions the installed library ships.
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+RETRYABLE_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.INTERNAL,
+    }
+)
+
+# Attempts per call, including the first one, and backoff bounds in seconds.
+MAX_ATTEMPTS = int(os.environ.get("GOOGLE_ADS_MCP_RETRY_ATTEMPTS", "4"))
+INITIAL_BACKOFF_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_RETRY_INITIAL_BACKOFF", "0.5")
+)
+MAX_BACKOFF_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_RETRY_MAX_BACKOFF", "8")
+)
+# Seconds after which a small metadata call is sent a second time, 0
+# disables hedging.
+HEDGE_DELAY_SECONDS = float(os.environ.get("GOOGLE_ADS_MCP_HEDGE_DELAY", "0"))
+
+
+def status_code(error: BaseException) -> grpc.StatusCode | None:
+    """Returns the gRPC status code of an API error, if it has one."""
+    if isinstance(error, GoogleAdsException):
+        return error.error.code()
+    if isinstance(error, api_exceptions.GoogleAPICallError):
+        return error.grpc_status_code
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code()
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    return status_code(error) in RETRYABLE_CODES
+
+
+class RetryBudget:
+    """Limits retries to a fraction of the calls.
+
+    Each call deposits `ratio` tokens and each retry withdraws one, up to
+    `max_tokens`, which the budget starts with.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """Takes a token for a retry, returning False if there is none."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for retryable errors.
+
+    Args:
+        max_attempts: The attempts per call, including the first one.
+        initial_backoff: The upper bound of the first delay, in seconds.
+        max_backoff: The upper bound of any delay, in seconds.
+        budget: The budget retries are drawn from.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_ATTEMPTS,
+        initial_backoff: float = INITIAL_BACKOFF_SECONDS,
+        max_backoff: float = MAX_BACKOFF_SECONDS,
+        budget: RetryBudget | None = None,
+    ):
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, error: BaseException, attempt: int) -> float | None:
+        """Returns the delay before retrying after failed attempt `attempt`.
+
+        Attempts are numbered from 0. Returns None if the call shouldn't be
+        retried: the error isn't transient, the attempts or the budget are
+        spent.
+        """
+        if (
+            attempt + 1 >= self.max_attempts
+            or not is_retryable(error)
+            or not self.budget.withdraw()
+        ):
+            return None
+        delay = random.uniform(
+            0, min(self.max_backoff, self.initial_backoff * 2**attempt)
+        )
+        logger.warning(
+            f"ads_mcp.retry attempt {attempt + 1} failed with "
+            f"{status_code(error).name}, retrying in {delay:.2f}s"
+        )
+        return delay
+
+    async def run(self, fn: Callable[[], Awaitable[_T]]) -> _T:
+        """Returns `await fn()`, retrying it on transient errors."""
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self.backoff(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def run_sync(self, fn: Callable[[], _T]) -> _T:
+        """Returns `fn()`, retrying it on transient errors."""
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self.backoff(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            time.sleep(delay)
+
+
+policy = RetryPolicy()
+
+
+async def hedged(fn: Callable[[], Awaitable[_T]], delay: float = None) -> _T:
+    """Returns the first successful result of up to two calls of `fn`.
+
+    The second call is only made if the first hasn't finished after `delay`
+    seconds, HEDGE_DELAY_SECONDS by default. Only use it for idempotent calls
+    returning little data, since both calls may run to completion upstream.
+    """
+    if delay is None:
+        delay = HEDGE_DELAY_SECONDS
+    if delay <= 0:
+        return await fn()
+    first = asyncio.ensure_future(fn())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        tasks.append(asyncio.ensure_future(fn()))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        # Both calls failed, report the first one's error.
+        return first.result()
+    finally:
+        for task in tasks:
+            task.cancel()
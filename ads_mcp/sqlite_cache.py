@@ -0,0 +1,257 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent search result cache in a SQLite database.
+
+The in-memory ResultCache is lost on every restart, and isn't shared by the
+worker processes of a server. This cache has the same interface but keeps
+its entries in a SQLite database, so results survive restarts and deploys
+and are shared by every process using the same file. Entries are stored as
+zlib compressed JSON, and the database is bounded by the compressed size of
+the entries, evicting the least recently used first.
+
+The database is opened in WAL mode, so lookups aren't blocked by writes of
+other processes. Expiry uses the wall clock, since entries outlive the
+process that wrote them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Hashable
+
+# Not ads_mcp.utils, which imports a versioned Google Ads API, as main.py
+# uses the cache whatever API versions the installed library ships.
+logger = logging.getLogger(__name__)
+
+# Milliseconds a call waits for another process holding the write lock.
+_BUSY_TIMEOUT_MS = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed_at);
+"""
+
+
+class SqliteResultCache:
+    """A ResultCache compatible cache stored in the SQLite database at `path`.
+
+    Keys are encoded as JSON, so tuples of strings and numbers are supported,
+    and values must be JSON compatible. Database errors are logged and
+    treated as misses rather than failing the search.
+
+    Args:
+        path: The database file, created if missing.
+        max_bytes: The maximum total compressed size of the cached values.
+            Values larger than this aren't cached.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self._max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value for `key`, or None if absent or expired."""
+        value = None
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?",
+                (_encode_key(key),),
+            ).fetchone()
+            now = time.time()
+            if row is not None and row[1] <= now:
+                connection.execute(
+                    "DELETE FROM entries WHERE key = ? AND expires_at <= ?",
+                    (_encode_key(key), now),
+                )
+            elif row is not None:
+                value = json.loads(zlib.decompress(row[0]))
+                connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                    (now, _encode_key(key)),
+                )
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"ads_mcp.sqlite_cache lookup failed: {e}")
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: float, size: int) -> None:
+        """Caches `value` for `ttl` seconds, evicting older entries if needed.
+
+        `size` is ignored, entries are bounded by their compressed size.
+        """
+        if ttl <= 0:
+            return
+        blob = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+        if len(blob) > self._max_bytes:
+            return
+        now = time.time()
+        try:
+            connection = self._connection()
+            # Takes the write lock up front, so the size check and the
+            # evictions see the entries of every process.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (_encode_key(key), blob, len(blob), now, now + ttl, now),
+                )
+                evicted = self._evict(connection, now)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"ads_mcp.sqlite_cache store failed: {e}")
+            return
+        with self._lock:
+            self._evictions += evicted
+
+    async def get_async(self, key: Hashable) -> Any:
+        """Same as get, in a worker thread so the event loop isn't blocked."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(
+        self, key: Hashable, value: Any, ttl: float, size: int
+    ) -> None:
+        """Same as put, in a worker thread so the event loop isn't blocked."""
+        await asyncio.to_thread(self.put, key, value, ttl, size)
+
+    def age(self, key: Hashable) -> float | None:
+        """Returns the seconds since `key` was cached, or None if absent.
+
+        Doesn't count as a lookup or refresh the entry's recency.
+        """
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT stored_at FROM entries "
+                    "WHERE key = ? AND expires_at > ?",
+                    (_encode_key(key), time.time()),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return None
+        return time.time() - row[0] if row is not None else None
+
+    def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM entries")
+        except sqlite3.Error as e:
+            logger.warning(f"ads_mcp.sqlite_cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the ResultCache.stats() of the cache.
+
+        The entries, bytes and oldest_age_seconds are None if the database
+        can't be read.
+        """
+        entries = size = oldest = None
+        try:
+            entries, size, oldest = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(stored_at) "
+                    "FROM entries WHERE expires_at > ?",
+                    (time.time(),),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"ads_mcp.sqlite_cache stats failed: {e}")
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "oldest_age_seconds": (
+                    time.time() - oldest if oldest is not None else None
+                ),
+            }
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> int:
+        """Removes expired entries, then the least recently used over size.
+
+        Returns the number of entries removed to stay within the size bound.
+        """
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        evicted = []
+        if total > self._max_bytes:
+            for key, size in connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at"
+            ):
+                evicted.append((key,))
+                total -= size
+                if total <= self._max_bytes:
+                    break
+            connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        return len(evicted)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread and process.
+
+        SQLite connections can't be shared by threads, nor survive a fork.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+
+def _encode_key(key: Hashable) -> str:
+    return json.dumps(key, default=str, separators=(",", ":"))
@@ -14,8 +14,14 @@
 
 """Tools for exposing simple, core API methods to the MCP server."""
 
+import asyncio
+import os
 from typing import List
 from ads_mcp.coordinator import mcp
+from ads_mcp import metrics
+from ads_mcp import rate_limiter
+from ads_mcp import result_cache
+from ads_mcp import retry
 
 import ads_mcp.utils as utils
 
@@ -23,16 +29,47 @@ from google.ads.googleads.v21.services.types.customer_service import (
     ListAccessibleCustomersResponse,
 )
 
+# Time to live, in seconds, of the accessible customers of each credential.
+ACCESSIBLE_CUSTOMERS_TTL_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_ACCESSIBLE_CUSTOMERS_TTL", "3600")
+)
+
+# Ids of the accessible customers, keyed by utils.credential_identity().
+accessible_customers = result_cache.ResultCache()
+metrics.register_cache("accessible_customers", accessible_customers.stats)
+
 
 @mcp.tool()
-def list_accessible_customers() -> List[str]:
-    """Returns ids of customers directly accessible by the user authenticating the call."""
-    ga_service = utils.get_googleads_service("CustomerService")
-    accessible_customers: ListAccessibleCustomersResponse = (
-        ga_service.list_accessible_customers()
-    )
-    # remove customer/ from the start of each resource
-    return [
-        cust_rn.removeprefix("customers/")
-        for cust_rn in accessible_customers.resource_names
-    ]
+@metrics.instrument_tool
+async def list_accessible_customers(refresh: bool = False) -> List[str]:
+    """Returns ids of customers directly accessible by the user authenticating the call.
+
+    Args:
+        refresh: If true, the ids are fetched again rather than taken from the
+            cache, e.g. right after access to a customer was granted
+    """
+    identity = await asyncio.to_thread(utils.credential_identity)
+    customer_ids = None if refresh else accessible_customers.get(identity)
+    if customer_ids is None:
+        ga_service = await utils.get_googleads_async_service("CustomerService")
+
+        async def list_customers() -> ListAccessibleCustomersResponse:
+            await rate_limiter.throttle()
+            with metrics.track_rpc("ListAccessibleCustomers"):
+                return await ga_service.list_accessible_customers()
+
+        response: ListAccessibleCustomersResponse = await retry.policy.run(
+            lambda: retry.hedged(list_customers)
+        )
+        # remove customer/ from the start of each resource
+        customer_ids = [
+            cust_rn.removeprefix("customers/")
+            for cust_rn in response.resource_names
+        ]
+        accessible_customers.put(
+            identity,
+            customer_ids,
+            ttl=ACCESSIBLE_CUSTOMERS_TTL_SECONDS,
+            size=result_cache.estimate_size(customer_ids),
+        )
+    return list(customer_ids)
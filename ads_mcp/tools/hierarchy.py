@@ -0,0 +1,177 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools for exploring the account hierarchy below a manager account."""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Set, Tuple
+
+from ads_mcp.coordinator import mcp
+from ads_mcp import metrics
+from ads_mcp import rate_limiter
+from ads_mcp import result_cache
+from ads_mcp import retry
+import ads_mcp.utils as utils
+from ads_mcp.tools.search import FAN_OUT_CONCURRENCY
+
+# Time to live, in seconds, of the direct clients of each manager account.
+CUSTOMER_TREE_TTL_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_CUSTOMER_TREE_TTL", "3600")
+)
+
+_FIELDS = (
+    "customer_client.id",
+    "customer_client.descriptive_name",
+    "customer_client.manager",
+    "customer_client.level",
+    "customer_client.status",
+    "customer_client.currency_code",
+    "customer_client.time_zone",
+)
+# Level 0 is the customer itself and level 1 its direct clients.
+_QUERY = (
+    f"SELECT {','.join(_FIELDS)} FROM customer_client"
+    " WHERE customer_client.level <= 1"
+)
+
+# Rows of the _QUERY search of each manager account, keyed by its id.
+customer_clients = result_cache.ResultCache()
+metrics.register_cache("customer_tree", customer_clients.stats)
+
+
+@mcp.tool()
+@metrics.instrument_tool
+async def get_customer_tree(
+    customer_id: str, refresh: List[str] = None
+) -> Dict[str, Any]:
+    """Returns the hierarchy of accounts below a customer, e.g. a manager account
+
+    Each level of the hierarchy is fetched with one search per manager account,
+    run concurrently. The clients of each manager account are cached, so only
+    the managers not seen recently are searched again.
+
+    Args:
+        customer_id: The id of the root customer
+        refresh: Ids of manager accounts whose clients are searched again even if
+            cached, along with all the manager accounts below them
+
+    Returns:
+        The tree, where each account has its customer_id, descriptive_name,
+        manager, status, currency_code, time_zone and, for manager accounts,
+        the list of its clients. searched_managers and cached_managers count
+        the manager accounts that were searched and taken from the cache.
+    """
+    refresh_ids = set(refresh or ())
+    semaphore = asyncio.Semaphore(FAN_OUT_CONCURRENCY)
+    stats = {"searched_managers": 0, "cached_managers": 0}
+
+    async def clients_of(manager_id: str, force: bool) -> List[Dict[str, Any]]:
+        rows = None if force else customer_clients.get(manager_id)
+        if rows is not None:
+            stats["cached_managers"] += 1
+            return rows
+        async with semaphore:
+            rows = await retry.policy.run(
+                lambda: retry.hedged(
+                    lambda: _search_customer_clients(manager_id)
+                )
+            )
+        stats["searched_managers"] += 1
+        customer_clients.put(
+            manager_id,
+            rows,
+            ttl=CUSTOMER_TREE_TTL_SECONDS,
+            size=result_cache.estimate_size(rows),
+        )
+        return rows
+
+    root_rows = await clients_of(customer_id, customer_id in refresh_ids)
+    root = _node(_row_at_level(root_rows, 0, customer_id))
+    nodes = {customer_id: root}
+    # (manager id, whether its clients are refreshed) of the current level.
+    level: List[Tuple[str, bool]] = [(customer_id, customer_id in refresh_ids)]
+    level_rows = {customer_id: root_rows}
+    visited: Set[str] = {customer_id}
+    while level:
+        next_level: List[Tuple[str, bool]] = []
+        for manager_id, force in level:
+            for row in level_rows[manager_id]:
+                if row["customer_client.level"] != 1:
+                    continue
+                child = _node(row)
+                nodes[manager_id].setdefault("clients", []).append(child)
+                child_id = child["customer_id"]
+                # Accounts linked to several managers of the tree are only
+                # expanded once.
+                if child["manager"] and child_id not in visited:
+                    visited.add(child_id)
+                    nodes[child_id] = child
+                    next_level.append(
+                        (child_id, force or child_id in refresh_ids)
+                    )
+        results = await asyncio.gather(
+            *(clients_of(manager_id, force) for manager_id, force in next_level)
+        )
+        level_rows = {
+            manager_id: rows
+            for (manager_id, _), rows in zip(next_level, results)
+        }
+        level = next_level
+
+    return {"tree": root, **stats}
+
+
+async def _search_customer_clients(customer_id: str) -> List[Dict[str, Any]]:
+    """Returns the formatted rows of the _QUERY search of a customer."""
+    ga_service = await utils.get_googleads_async_service("GoogleAdsService")
+    await rate_limiter.throttle(customer_id, rate_limiter.Priority.BACKGROUND)
+    rows: List[Dict[str, Any]] = []
+    with metrics.track_rpc("SearchStream", customer_id=customer_id) as call:
+        stream = await ga_service.search_stream(
+            customer_id=customer_id, query=_QUERY
+        )
+        async for batch in stream:
+            metrics.stream_batches.inc()
+            with call.paused():
+                rows.extend(
+                    utils.format_output_rows(
+                        batch.results, batch.field_mask.paths
+                    )
+                )
+    return rows
+
+
+def _row_at_level(
+    rows: List[Dict[str, Any]], level: int, customer_id: str
+) -> Dict[str, Any]:
+    for row in rows:
+        if row["customer_client.level"] == level:
+            return row
+    return {"customer_client.id": customer_id}
+
+
+def _node(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the tree node of a customer_client row."""
+    node = {
+        "customer_id": str(row["customer_client.id"]),
+        "descriptive_name": row.get("customer_client.descriptive_name"),
+        "manager": bool(row.get("customer_client.manager")),
+        "status": row.get("customer_client.status"),
+        "currency_code": row.get("customer_client.currency_code"),
+        "time_zone": row.get("customer_client.time_zone"),
+    }
+    if node["manager"]:
+        node["clients"] = []
+    return node
@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools for exposing the GAQL resource and field schema to the MCP server.
+
+The schema is served on demand rather than inlined into the `search` tool
+description, so clients only pay for the resources they actually query.
+"""
+
+from typing import Dict, List
+from ads_mcp.coordinator import mcp
+from ads_mcp import gaql_schema
+from ads_mcp import metrics
+
+
+@mcp.tool()
+@metrics.instrument_tool
+def list_resources() -> List[str]:
+    """Returns the names of all resources that can be used in the FROM clause of a search.
+
+    Use describe_resource to get the fields of a resource.
+    """
+    return gaql_schema.get_schema().resources()
+
+
+@mcp.tool()
+@metrics.instrument_tool
+def describe_resource(
+    resource: str, attributes: List[str] = None
+) -> Dict[str, List[str]]:
+    """Returns the fields of a resource that can be used in a search
+
+    Args:
+        resource: The resource name as returned by list_resources, e.g. campaign
+        attributes: Which field lists to return, any of selectable (usable in fields),
+            filterable (usable in conditions) and sortable (usable in orderings).
+            Defaults to all three.
+    """
+    schema = gaql_schema.get_schema()
+    if not schema.has_resource(resource):
+        raise ValueError(
+            f"Unknown resource '{resource}'. Use list_resources to get the "
+            "valid resource names."
+        )
+
+    attributes = attributes or gaql_schema.FIELD_ATTRIBUTES
+    invalid = [
+        attr for attr in attributes if attr not in gaql_schema.FIELD_ATTRIBUTES
+    ]
+    if invalid:
+        raise ValueError(
+            f"Unknown attributes {invalid}, expected any of "
+            f"{list(gaql_schema.FIELD_ATTRIBUTES)}."
+        )
+
+    return {attr: list(schema.fields(resource, attr)) for attr in attributes}
+
+
+@mcp.tool()
+@metrics.instrument_tool
+def complete_field(prefix: str, limit: int = 50) -> List[str]:
+    """Returns field names starting with a prefix, e.g. campaign.bidding or metrics.conv
+
+    Args:
+        prefix: The start of the field name, including the resource
+        limit: The maximum number of field names to return
+    """
+    return gaql_schema.get_schema().complete(prefix, limit)
@@ -14,19 +14,69 @@
 
 """Tools for exposing the API Search method to the MCP server."""
 
-from typing import Any, Dict, List
+import asyncio
+import collections
+import datetime
+import hashlib
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple, TypeVar
+from google.ads.googleads.errors import GoogleAdsException
+from mcp.server.fastmcp import Context
 from ads_mcp.coordinator import mcp
+from ads_mcp import aggregation
+from ads_mcp import columnar
+from ads_mcp import daily_store
+from ads_mcp import date_chunks
+from ads_mcp import gaql_normalizer
+from ads_mcp import gaql_validator
+from ads_mcp import metrics
+from ads_mcp import pagination
+from ads_mcp import rate_limiter
+from ads_mcp import result_cache
+from ads_mcp import retry
+from ads_mcp import singleflight
 import ads_mcp.utils as utils
 
+_OUTPUT_FORMATS = ("rows", "columns", "arrow")
 
-def search(
+# Default timeout of a search in seconds, 0 for none.
+SEARCH_TIMEOUT_SECONDS = float(
+    os.environ.get("GOOGLE_ADS_MCP_SEARCH_TIMEOUT", "600")
+)
+_TIMEOUT_MESSAGE = (
+    "The search didn't finish within its timeout, narrow the date range or "
+    "add a LIMIT."
+)
+
+# The credential identity of the shared client, see _credential_identity.
+_identity: str | None = None
+
+# Largest LIMIT of the metadata searches that are hedged, see retry.hedged.
+_HEDGE_MAX_LIMIT = 1000
+
+# Maximum number of customers searched at the same time by search_many.
+FAN_OUT_CONCURRENCY = int(
+    os.environ.get("GOOGLE_ADS_MCP_FAN_OUT_CONCURRENCY", "10")
+)
+
+
+async def search(
     customer_id: str,
     fields: List[str],
     resource: str,
     conditions: List[str] = None,
     orderings: List[str] = None,
     limit: int | str = None,
-) -> List[Dict[str, Any]]:
+    stream: bool = False,
+    output_format: str = "rows",
+    max_rows: int = None,
+    max_bytes: int = None,
+    use_cache: bool = True,
+    timeout: float = None,
+    ctx: Context = None,
+) -> Dict[str, Any]:
     """Fetches data from the Google Ads API using the search method
 
     Args:
@@ -36,11 +86,691 @@ def search(
         conditions: List of conditions to filter the data, combined using AND clauses
         orderings: How the data is ordered
         limit: The maximum number of rows to return
+        stream: If true and progress notifications were requested, rows are sent
+            as they arrive, one JSON list of rows per progress notification, and
+            the returned rows are empty
+        output_format: rows returns one dict per row under rows. columns returns
+            one list of values per field with the field types, and arrow returns a
+            base64 encoded Arrow IPC stream; both are more compact for large
+            reports and are neither streamed nor paged
+        max_rows: The maximum number of rows in the response, defaults to 1000
+        max_bytes: The maximum JSON size of the rows in the response, defaults to
+            1000000. If either budget is exceeded, next_cursor is set and the
+            remaining rows are fetched with search_next_page
+        use_cache: If false, a recent cached result of the same search is not
+            reused. Streamed searches are never cached
+        timeout: The maximum number of seconds the search may take, including
+            retries, defaults to 600. Narrow the date range or add a LIMIT to
+            searches that time out
+
+    Returns:
+        The rows or columns of the search. At most 100000 rows are read, or
+        GOOGLE_ADS_MCP_MAX_FETCH_ROWS, and truncated is true if rows were left
+        out.
+    """
+    if output_format not in _OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output_format '{output_format}', expected one of "
+            f"{list(_OUTPUT_FORMATS)}."
+        )
+    gaql_validator.validate_search(
+        resource, fields, conditions, orderings, limit
+    )
+
+    query = _build_query(fields, resource, conditions, orderings, limit)
+    canonical_query = gaql_normalizer.canonicalize(
+        fields, resource, conditions, orderings, limit
+    )
+    utils.logger.info(
+        f"ads_mcp.search query {query} digest {canonical_query.digest[:16]}"
+    )
+
+    deadline = _deadline(timeout)
+    try:
+        if stream and output_format == "rows" and _progress_requested(ctx):
+            return await _stream_rows(customer_id, query, ctx, deadline)
+
+        date_range = (
+            date_chunks.find_range(fields, conditions, orderings, limit)
+            if output_format == "rows"
+            else None
+        )
+        if date_range is not None:
+            result = await _fetch_date_range(
+                customer_id,
+                fields,
+                resource,
+                conditions,
+                orderings,
+                date_range,
+                use_cache,
+                deadline,
+            )
+        else:
+            result = await _fetch(
+                customer_id,
+                query,
+                canonical_query,
+                fields,
+                resource,
+                output_format,
+                use_cache,
+                deadline=deadline,
+            )
+    except asyncio.CancelledError:
+        metrics.calls_cancelled.inc(tool="search")
+        raise
+    except TimeoutError:
+        metrics.calls_timed_out.inc(tool="search")
+        raise
+
+    if output_format == "rows":
+        return _truncate(result, max_rows, max_bytes)
+    return result
+
+
+@mcp.tool()
+@metrics.instrument_tool
+async def search_many(
+    customer_ids: List[str],
+    fields: List[str],
+    resource: str,
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+    aggregate: bool = False,
+    max_rows: int = None,
+    max_bytes: int = None,
+    use_cache: bool = True,
+    timeout: float = None,
+) -> Dict[str, Any]:
+    """Runs the same search for several customers concurrently and merges the rows
+
+    Args:
+        customer_ids: The ids of the customers, e.g. the client accounts of a manager account
+        fields: The fields to fetch
+        resource: The resource to return fields from
+        conditions: List of conditions to filter the data, combined using AND clauses
+        orderings: How the data is ordered within each customer
+        limit: The maximum number of rows to return per customer
+        aggregate: If true, rows of all customers with the same values for the
+            fields that aren't metrics are combined into one row, summing
+            counts such as metrics.clicks and recomputing ratios such as
+            metrics.ctr from their components, and have no customer_id. Other
+            metrics can't be combined and are listed in dropped_metrics
+        max_rows: The maximum number of rows in the response, defaults to 1000
+        max_bytes: The maximum JSON size of the rows in the response, defaults to
+            1000000. If either budget is exceeded, next_cursor is set and the
+            remaining rows are fetched with search_next_page
+        use_cache: If false, recent cached results of the same searches are not reused
+        timeout: The maximum number of seconds the search of each customer may
+            take, including retries, defaults to 600
+
+    Returns:
+        The merged rows, each with the customer_id it belongs to, and the errors
+        of the customers whose search failed, which don't fail the others.
+        truncated is true if rows of a customer were left out, see search.
+    """
+    # Ratios are aggregated from their components, which are searched too.
+    search_fields = list(fields)
+    if aggregate:
+        for field in fields:
+            for component in aggregation.RATIO_METRICS.get(field, ())[:2]:
+                if component not in search_fields:
+                    search_fields.append(component)
+    gaql_validator.validate_search(
+        resource, search_fields, conditions, orderings, limit
+    )
+    query = _build_query(search_fields, resource, conditions, orderings, limit)
+    canonical_query = gaql_normalizer.canonicalize(
+        search_fields, resource, conditions, orderings, limit
+    )
+    customer_ids = list(dict.fromkeys(customer_ids))
+    utils.logger.info(
+        f"ads_mcp.search_many customers {len(customer_ids)} "
+        f"digest {canonical_query.digest[:16]}"
+    )
+
+    semaphore = asyncio.Semaphore(FAN_OUT_CONCURRENCY)
+
+    async def fetch(customer_id: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                return await _fetch(
+                    customer_id,
+                    query,
+                    canonical_query,
+                    search_fields,
+                    resource,
+                    "rows",
+                    use_cache,
+                    rate_limiter.Priority.BACKGROUND,
+                    _deadline(timeout),
+                )
+            except TimeoutError:
+                metrics.calls_timed_out.inc(tool="search_many")
+                raise
+
+    try:
+        results = await asyncio.gather(
+            *(fetch(customer_id) for customer_id in customer_ids),
+            return_exceptions=True,
+        )
+    except asyncio.CancelledError:
+        metrics.calls_cancelled.inc(tool="search_many")
+        raise
+
+    rows: List[Dict[str, Any]] = []
+    errors: List[Dict[str, str]] = []
+    truncated = False
+    for customer_id, result in zip(customer_ids, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, Exception):
+            utils.logger.warning(
+                f"ads_mcp.search_many customer {customer_id} failed: {result}"
+            )
+            errors.append(
+                {"customer_id": customer_id, "error": _error_message(result)}
+            )
+            continue
+        truncated = truncated or len(result) > pagination.MAX_FETCH_ROWS
+        rows.extend(
+            {"customer_id": customer_id, **row}
+            for row in result[: pagination.MAX_FETCH_ROWS]
+        )
 
+    dropped_metrics = None
+    if aggregate:
+        rows, dropped_metrics = _sum_metrics(rows, fields)
+    output = pagination.paginate(rows, max_rows, max_bytes)
+    output["errors"] = errors
+    output["truncated"] = truncated
+    if aggregate:
+        output["dropped_metrics"] = dropped_metrics
+    return output
+
+
+@mcp.tool()
+@metrics.instrument_tool
+async def search_aggregate(
+    customer_id: str,
+    resource: str,
+    aggregates: List[str],
+    group_by: List[str] = None,
+    conditions: List[str] = None,
+    order_by: List[str] = None,
+    limit: int = None,
+    use_cache: bool = True,
+    timeout: float = None,
+) -> Dict[str, Any]:
+    """Searches and returns only an aggregate table, one row per group
+
+    Use it rather than search when the answer is a total, e.g. the cost per
+    campaign over a date range, so the rows per day aren't returned.
+
+    Args:
+        customer_id: The id of the customer
+        resource: The resource to aggregate fields from
+        aggregates: The aggregates of each group: sum(<field>), avg(<field>),
+            min(<field>), max(<field>), count(<field>) or count(*). Ratio metrics
+            such as metrics.ctr, metrics.average_cpc, metrics.average_cpm,
+            metrics.cost_per_conversion or metrics.conversions_from_interactions_rate
+            are computed from the sums of their components
+        group_by: The fields whose values identify a group, e.g. campaign.id.
+            If empty, all rows form a single group
+        conditions: List of conditions to filter the data, combined using AND clauses
+        order_by: Output columns to sort the groups by, each optionally followed
+            by ASC or DESC, e.g. sum(metrics.cost_micros) DESC
+        limit: The maximum number of groups to return
+        use_cache: If false, a recent cached result of the same aggregation is
+            not reused
+        timeout: The maximum number of seconds the search may take, including
+            retries, defaults to 600
+
+    Returns:
+        The rows of the aggregate table, keyed by the group_by fields and the
+        aggregates, and the number of input_rows aggregated.
+    """
+    aggregator = aggregation.Aggregator(group_by or [], aggregates, order_by)
+    # A search must select a field, even if only rows are counted.
+    fields = aggregator.fields or [f"{resource}.resource_name"]
+    gaql_validator.validate_search(resource, fields, conditions)
+    query = _build_query(fields, resource, conditions)
+    canonical_query = gaql_normalizer.canonicalize(fields, resource, conditions)
+    utils.logger.info(
+        f"ads_mcp.search_aggregate query {query} "
+        f"digest {canonical_query.digest[:16]}"
+    )
+
+    cache_key = (
+        await _credential_identity(),
+        customer_id,
+        canonical_query.digest,
+        "aggregate",
+        tuple(aggregator.group_by),
+        tuple(aggregate.name for aggregate in aggregator.aggregates),
+        tuple(order_by or []),
+        limit,
+    )
+    result = (
+        await result_cache.search_results.get_async(cache_key)
+        if use_cache
+        else None
+    )
+    if result is not None:
+        return result
+
+    async def aggregate() -> Dict[str, Any]:
+        async for _ in _iter_batches(
+            customer_id,
+            query,
+            lambda batch: aggregator.append_rows(batch.results),
+            restart=aggregator.reset,
+        ):
+            pass
+        aggregated = {
+            "rows": aggregator.result(limit),
+            "input_rows": aggregator.input_rows,
+        }
+        await result_cache.search_results.put_async(
+            cache_key,
+            aggregated,
+            ttl=result_cache.ttl_for(resource, fields),
+            size=result_cache.estimate_size(aggregated),
+        )
+        return aggregated
+
+    try:
+        return await _shared_call(cache_key, aggregate, _deadline(timeout))
+    except asyncio.CancelledError:
+        metrics.calls_cancelled.inc(tool="search_aggregate")
+        raise
+    except TimeoutError:
+        metrics.calls_timed_out.inc(tool="search_aggregate")
+        raise
+
+
+@mcp.tool()
+@metrics.instrument_tool
+def search_next_page(
+    cursor: str, max_rows: int = None, max_bytes: int = None
+) -> Dict[str, Any]:
+    """Returns the next page of rows of a search whose response had a next_cursor
+
+    Args:
+        cursor: The next_cursor of the previous response
+        max_rows: The maximum number of rows in the response
+        max_bytes: The maximum JSON size of the rows in the response
     """
+    return pagination.next_page(cursor, max_rows, max_bytes)
 
-    ga_service = utils.get_googleads_service("GoogleAdsService")
 
+async def _fetch(
+    customer_id: str,
+    query: str,
+    canonical_query: gaql_normalizer.CanonicalQuery,
+    fields: List[str],
+    resource: str,
+    output_format: str,
+    use_cache: bool,
+    priority: rate_limiter.Priority = rate_limiter.Priority.INTERACTIVE,
+    deadline: float | None = None,
+) -> Any:
+    """Returns the result of a search, from the cache if possible.
+
+    `deadline` is a time.monotonic() value after which the search fails with
+    TimeoutError.
+    """
+    cache_key = (
+        await _credential_identity(),
+        customer_id,
+        canonical_query.digest,
+        output_format,
+    )
+    result = (
+        await result_cache.search_results.get_async(cache_key)
+        if use_cache
+        else None
+    )
+    if result is not None:
+        return result
+
+    async def fetch() -> Any:
+        if output_format == "rows" and _is_small_metadata_query(
+            canonical_query
+        ):
+            fetched = await retry.hedged(
+                lambda: _search_rows(customer_id, query, priority)
+            )
+        elif output_format == "rows":
+            fetched = await _search_rows(customer_id, query, priority)
+        else:
+            fetched = await _search_columns(
+                customer_id, query, fields, output_format, priority
+            )
+        await result_cache.search_results.put_async(
+            cache_key,
+            fetched,
+            ttl=result_cache.ttl_for(resource, fields),
+            size=result_cache.estimate_size(fetched),
+        )
+        return fetched
+
+    return await _shared_call(cache_key, fetch, deadline)
+
+
+async def _shared_call(
+    key: Any, fn: Callable[[], Any], deadline: float | None
+) -> Any:
+    """Returns `fn()`, sharing the call with concurrent callers of `key`.
+
+    The shared call isn't bound by the deadline of the caller that started
+    it: each caller stops waiting at its own `deadline`, and the call is
+    cancelled once no caller waits for it any more.
+
+    Raises:
+        TimeoutError: If the call didn't finish before `deadline`.
+    """
+    if deadline is None:
+        return await singleflight.searches.do(key, fn)
+    if _expired(deadline):
+        raise TimeoutError(_TIMEOUT_MESSAGE)
+    try:
+        return await asyncio.wait_for(
+            singleflight.searches.do(key, fn), deadline - time.monotonic()
+        )
+    except asyncio.TimeoutError as e:
+        # Not the builtin TimeoutError before Python 3.11.
+        raise TimeoutError(_TIMEOUT_MESSAGE) from e
+
+
+async def _fetch_date_range(
+    customer_id: str,
+    fields: List[str],
+    resource: str,
+    conditions: List[str],
+    orderings: List[str] | None,
+    date_range: date_chunks.DateRange,
+    use_cache: bool,
+    deadline: float | None = None,
+) -> List[Dict[str, Any]]:
+    """Returns the rows of a search over a date range, chunk by chunk.
+
+    Days stored in the daily store are read from disk, unless `use_cache` is
+    false. The other days are split into chunks (see date_chunks) searched
+    concurrently, each cached and retried on its own, and the closed days
+    among them are stored, replacing any stored rows. If a
+    chunk fails, the others are cancelled. Rows are returned in the order of
+    their days, descending if the search is ordered so.
+    """
+    store = daily_store.store
+    days = [
+        date_range.start + datetime.timedelta(days=offset)
+        for offset in range((date_range.end - date_range.start).days + 1)
+    ]
+    stored: Dict[datetime.date, List[Dict[str, Any]]] = {}
+    if store is not None:
+        canonical_query = gaql_normalizer.canonicalize(
+            fields,
+            resource,
+            date_chunks.without_range(conditions, date_range.index),
+        )
+        # Partitions may be shared by servers calling as other identities.
+        digest = hashlib.sha256(
+            f"{await _credential_identity()}:{canonical_query.digest}".encode()
+        ).hexdigest()
+    if store is not None and use_cache:
+        stored = await asyncio.to_thread(
+            store.load,
+            customer_id,
+            resource,
+            digest,
+            [day for day in days if store.is_closed(day)],
+        )
+
+    # Runs of consecutive days missing from the store, split into chunks.
+    runs: List[List[datetime.date]] = []
+    for day in days:
+        if day in stored:
+            continue
+        if runs and runs[-1][1] == day - datetime.timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    chunks = [
+        chunk
+        for run_start, run_end in runs
+        for chunk in date_chunks.split_range(
+            run_start, run_end, date_chunks.DATE_CHUNK
+        )
+    ]
+    if date_range.descending:
+        chunks.reverse()
+    utils.logger.info(
+        f"ads_mcp.search date range of {len(days)} days, {len(stored)} "
+        f"stored, {len(chunks)} chunks searched"
+    )
+
+    semaphore = asyncio.Semaphore(FAN_OUT_CONCURRENCY)
+
+    async def fetch(
+        chunk_start: datetime.date, chunk_end: datetime.date
+    ) -> List[Dict[str, Any]]:
+        chunk_conditions = date_chunks.with_range(
+            conditions, date_range.index, chunk_start, chunk_end
+        )
+        query = _build_query(fields, resource, chunk_conditions, orderings)
+        canonical_query = gaql_normalizer.canonicalize(
+            fields, resource, chunk_conditions, orderings
+        )
+        async with semaphore:
+            return await _fetch(
+                customer_id,
+                query,
+                canonical_query,
+                fields,
+                resource,
+                "rows",
+                use_cache,
+                deadline=deadline,
+            )
+
+    tasks = [asyncio.ensure_future(fetch(*chunk)) for chunk in chunks]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    if store is None:
+        return [row for rows in results for row in rows]
+
+    fetched: Dict[datetime.date, List[Dict[str, Any]]] = {
+        day: [] for day in days if day not in stored
+    }
+    for rows in results:
+        for row in rows:
+            day = datetime.date.fromisoformat(row["segments.date"])
+            fetched.setdefault(day, []).append(row)
+    # A truncated chunk is missing rows of its last days.
+    if all(len(rows) <= pagination.MAX_FETCH_ROWS for rows in results):
+        await asyncio.to_thread(
+            store.save, customer_id, resource, digest, fetched
+        )
+    rows_by_day = {**stored, **fetched}
+    return [
+        row
+        for day in (reversed(days) if date_range.descending else days)
+        for row in rows_by_day.get(day, [])
+    ]
+
+
+async def _search_rows(
+    customer_id: str,
+    query: str,
+    priority: rate_limiter.Priority = rate_limiter.Priority.INTERACTIVE,
+) -> List[Dict[str, Any]]:
+    """Runs a search and returns its formatted rows.
+
+    At most pagination.MAX_FETCH_ROWS + 1 rows are read, the extra row only
+    tells that rows were left out, see _truncate.
+    """
+    final_output: List = []
+    async for rows in _iter_batches(
+        customer_id,
+        query,
+        _format_batch,
+        priority,
+        restart=final_output.clear,
+        max_rows=pagination.MAX_FETCH_ROWS + 1,
+    ):
+        final_output.extend(rows)
+    return final_output
+
+
+async def _stream_rows(
+    customer_id: str, query: str, ctx: Context, deadline: float | None = None
+) -> Dict[str, Any]:
+    """Runs a search, sending each batch of rows as a progress notification."""
+    row_count = 0
+    async for rows in _iter_batches(
+        customer_id, query, _format_batch, deadline=deadline
+    ):
+        row_count += len(rows)
+        await ctx.report_progress(
+            row_count, message=json.dumps(rows, default=str)
+        )
+    return {"rows": [], "next_cursor": None}
+
+
+async def _search_columns(
+    customer_id: str,
+    query: str,
+    fields: List[str],
+    output_format: str,
+    priority: rate_limiter.Priority = rate_limiter.Priority.INTERACTIVE,
+) -> Dict[str, Any]:
+    """Runs a search and returns the result in a column-oriented format.
+
+    At most pagination.MAX_FETCH_ROWS rows are returned, and truncated tells
+    whether rows were left out.
+    """
+    result: columnar.ColumnarResult | None = None
+    truncated = False
+
+    def append_batch(batch) -> None:
+        nonlocal result, truncated
+        if result is None:
+            result = columnar.ColumnarResult(batch.field_mask.paths)
+        rows = batch.results[: pagination.MAX_FETCH_ROWS - result.row_count]
+        truncated = len(rows) < len(batch.results)
+        result.append_rows(rows)
+
+    def restart() -> None:
+        nonlocal result
+        result = None
+
+    async for _ in _iter_batches(
+        customer_id,
+        query,
+        append_batch,
+        priority,
+        restart=restart,
+        max_rows=pagination.MAX_FETCH_ROWS + 1,
+    ):
+        pass
+
+    if result is None:
+        result = columnar.ColumnarResult(fields)
+    output = result.to_arrow() if output_format == "arrow" else result.to_json()
+    output["truncated"] = truncated
+    return output
+
+
+def _is_small_metadata_query(query: gaql_normalizer.CanonicalQuery) -> bool:
+    """Returns whether a query selects few rows and no metrics or segments."""
+    return (
+        query.limit is not None
+        and query.limit <= _HEDGE_MAX_LIMIT
+        and not any(
+            field.startswith(("metrics.", "segments."))
+            for field in query.fields
+        )
+    )
+
+
+def _error_message(error: Exception) -> str:
+    """Returns the messages of the API errors in `error`, or its text."""
+    if isinstance(error, GoogleAdsException):
+        return "; ".join(e.message for e in error.failure.errors)
+    return str(error)
+
+
+def _sum_metrics(
+    rows: List[Dict[str, Any]], fields: List[str]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Combines rows with the same non-metric values, summing the metrics.
+
+    Only the metrics of aggregation.ADDITIVE_METRICS are summed. Ratio metrics
+    of aggregation.RATIO_METRICS are recomputed from the sums of their
+    components, which the rows must hold. Other metrics, such as shares,
+    scores and averages without components, can't be combined.
+
+    Returns:
+        The combined rows and the metrics of `fields` dropped from them.
+    """
+    dimensions = [f for f in fields if not f.startswith("metrics.")]
+    ratios = [f for f in fields if f in aggregation.RATIO_METRICS]
+    summed = list(
+        dict.fromkeys(
+            [f for f in fields if f in aggregation.ADDITIVE_METRICS]
+            + [
+                component
+                for ratio in ratios
+                for component in aggregation.RATIO_METRICS[ratio][:2]
+            ]
+        )
+    )
+    dropped = [
+        f
+        for f in fields
+        if f.startswith("metrics.") and f not in summed and f not in ratios
+    ]
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        key = tuple(json.dumps(row.get(f), default=str) for f in dimensions)
+        group = groups.get(key)
+        if group is None:
+            group = {f: row.get(f) for f in dimensions}
+            group.update({metric: 0 for metric in summed})
+            groups[key] = group
+        for metric in summed:
+            value = row.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                group[metric] += value
+
+    output_fields = [f for f in fields if f not in dropped]
+    combined = []
+    for group in groups.values():
+        for ratio in ratios:
+            numerator, denominator, scale = aggregation.RATIO_METRICS[ratio]
+            group[ratio] = (
+                group[numerator] * scale / group[denominator]
+                if group[denominator]
+                else None
+            )
+        combined.append({f: group[f] for f in output_fields})
+    return combined, dropped
+
+
+def _build_query(
+    fields: List[str],
+    resource: str,
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+) -> str:
+    """Returns the GAQL query for the arguments of a search."""
     query_parts = [f"SELECT {','.join(fields)} FROM {resource}"]
 
     if conditions:
@@ -52,36 +782,178 @@ def search(
     if limit:
         query_parts.append(f" LIMIT {limit}")
 
-    query = "".join(query_parts)
-    utils.logger.info(f"ads_mcp.search query {query}")
+    return "".join(query_parts)
 
-    query_result = ga_service.search_stream(
-        customer_id=customer_id, query=query
+
+def _truncate(
+    rows: List[Dict[str, Any]], max_rows: int | None, max_bytes: int | None
+) -> Dict[str, Any]:
+    """Returns the first page of the first pagination.MAX_FETCH_ROWS rows.
+
+    A row beyond MAX_FETCH_ROWS is fetched only to tell that rows were left
+    out, which truncated reports.
+    """
+    output = pagination.paginate(
+        rows[: pagination.MAX_FETCH_ROWS], max_rows, max_bytes
     )
+    output["truncated"] = len(rows) > pagination.MAX_FETCH_ROWS
+    return output
 
-    final_output: List = []
-    for batch in query_result:
-        for row in batch.results:
-            final_output.append(
-                utils.format_output_row(row, batch.field_mask.paths)
-            )
-    return final_output
 
+def _progress_requested(ctx: Context | None) -> bool:
+    """Returns whether the client asked for progress notifications."""
+    if ctx is None:
+        return False
+    meta = ctx.request_context.meta
+    return meta is not None and meta.progressToken is not None
 
-def _search_tool_description() -> str:
-    """Returns the description for the `search` tool."""
-    # Add a warning that will be part of the description
-    file_content = (
-        "WARNING: The table of selectable fields is missing. "
-        "Tool may not function correctly."
-    )
 
-    try:
-        with open(utils.get_gaql_resources_filepath(), "r") as file:
-            file_content = file.read()
-    except FileNotFoundError:
-        utils.logger.error("The specified file was not found.")
+_T = TypeVar("_T")
+
+
+async def _iter_batches(
+    customer_id: str,
+    query: str,
+    process: Callable[[Any], _T],
+    priority: rate_limiter.Priority = rate_limiter.Priority.INTERACTIVE,
+    deadline: float | None = None,
+    restart: Callable[[], None] | None = None,
+    max_rows: int | None = None,
+) -> AsyncIterator[_T]:
+    """Yields `process(batch)` for each search_stream batch as it arrives.
+
+    The stream is read on a grpc.aio channel, so waiting for the next batch
+    doesn't hold a thread. Each batch is processed in a worker thread, since
+    formatting a large batch would otherwise stall the event loop, and only
+    the current batch is held in memory. Each attempt waits for the rate
+    limiter first.
+
+    If the stream fails with a transient error, the search is run again. If
+    the query has an ORDER BY clause, the rows already yielded are skipped,
+    relying on the API returning its rows in the same order. Otherwise the
+    order isn't guaranteed, so `restart` is called for the caller to drop
+    what it got so far, and all rows are yielded again; without `restart`,
+    the error is raised.
+
+    At most `max_rows` rows are yielded, the stream is cancelled once they
+    have been read.
 
+    The time left until `deadline` is sent as the gRPC deadline of each
+    attempt. If the caller is cancelled, or stops iterating, the stream is
+    cancelled.
+
+    Raises:
+        TimeoutError: If the search didn't finish before `deadline`.
+    """
+    ga_service = await utils.get_googleads_async_service("GoogleAdsService")
+    ordered = bool(gaql_normalizer.parse(query).orderings)
+    retry.policy.budget.deposit()
+    attempt = 0
+    yielded_rows = 0
+    while True:
+        skip = yielded_rows
+        stream = None
+        try:
+            await rate_limiter.throttle(customer_id, priority)
+            with metrics.track_rpc(
+                "SearchStream", customer_id=customer_id, attempt=attempt
+            ) as call:
+                stream = await ga_service.search_stream(
+                    customer_id=customer_id,
+                    query=query,
+                    **_timeout_kwargs(deadline),
+                )
+                async for batch in stream:
+                    metrics.stream_batches.inc()
+                    if skip >= len(batch.results):
+                        skip -= len(batch.results)
+                        continue
+                    if skip:
+                        batch = _Batch(batch.field_mask, batch.results[skip:])
+                        skip = 0
+                    if (
+                        max_rows is not None
+                        and yielded_rows + len(batch.results) > max_rows
+                    ):
+                        batch = _Batch(
+                            batch.field_mask,
+                            batch.results[: max_rows - yielded_rows],
+                        )
+                    yielded_rows += len(batch.results)
+                    # Only the time spent waiting for the API is timed.
+                    with call.paused():
+                        yield await asyncio.to_thread(process, batch)
+                    if max_rows is not None and yielded_rows >= max_rows:
+                        return
+            return
+        except TimeoutError:
+            raise
+        except Exception as e:
+            if _expired(deadline):
+                raise TimeoutError(_TIMEOUT_MESSAGE) from e
+            delay = retry.policy.backoff(e, attempt)
+            resumable = ordered or not yielded_rows
+            if delay is None or (not resumable and restart is None):
+                raise
+            if not resumable:
+                restart()
+                yielded_rows = 0
+        finally:
+            if stream is not None:
+                stream.cancel()
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def _credential_identity() -> str:
+    """Returns utils.credential_identity(), computed once.
+
+    Cached results are keyed by it, since the cache may be shared by servers
+    calling the API as other identities.
+    """
+    global _identity
+    if _identity is None:
+        # Creates the client on first use, which may block.
+        _identity = await asyncio.to_thread(utils.credential_identity)
+    return _identity
+
+
+def _deadline(timeout: float | None) -> float | None:
+    """Returns the time.monotonic() deadline of a call taking `timeout`."""
+    if timeout is None:
+        timeout = SEARCH_TIMEOUT_SECONDS
+    if timeout <= 0:
+        return None
+    return time.monotonic() + timeout
+
+
+def _expired(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _timeout_kwargs(deadline: float | None) -> Dict[str, float]:
+    """Returns the timeout argument of a call that must end by `deadline`.
+
+    Raises:
+        TimeoutError: If the deadline has passed.
+    """
+    if deadline is None:
+        return {}
+    if _expired(deadline):
+        raise TimeoutError(_TIMEOUT_MESSAGE)
+    return {"timeout": deadline - time.monotonic()}
+
+
+# The rows of a search_stream batch not yielded before a retry.
+_Batch = collections.namedtuple("_Batch", ["field_mask", "results"])
+
+
+def _format_batch(batch) -> List[Dict[str, Any]]:
+    return utils.format_output_rows(batch.results, batch.field_mask.paths)
+
+
+def _search_tool_description() -> str:
+    """Returns the description for the `search` tool."""
     return f"""
 {search.__doc__}
 
@@ -99,6 +971,7 @@ def _search_tool_description() -> str:
     All dates should be in the form YYYY-MM-DD and must include the dashes (-)
     Date literals from the Grammar must NEVER be used
     Date ranges should be finite and must include a start and end date
+    Prefer segments.date BETWEEN 'start' AND 'end' for long ranges: searches selecting segments.date are then split into months searched concurrently
 
 ### Hints for limits
     Requests to resource change_event must specify a LIMIT of less than or equal to 10000
@@ -108,10 +981,9 @@ def _search_tool_description() -> str:
 
 
 ### Hints for all fields
-    What follows is a table of resources and their selectable fields (fields), filterable fields (used in the condition) and sortable fields (use in the ordering)
+    Use the list_resources tool to find the resource to search and the describe_resource tool to get its selectable fields (fields), filterable fields (used in the condition) and sortable fields (use in the ordering)
     Fields are comma separated, the whole field must be used, wildcards and partial fields are not allowed
-    All fields must come from this table and be prefixed with the resource being searched
-    {file_content}
+    All fields must come from describe_resource and be prefixed with the resource being searched
 """
 
 
@@ -120,7 +992,7 @@ def _search_tool_description() -> str:
 # provides the flexibility needed to generate the description while also
 # including the `search` method's docstring.
 mcp.add_tool(
-    search,
+    metrics.instrument_tool(search),
     title="Fetches data from the Google Ads API using the search method",
     description=_search_tool_description(),
 )
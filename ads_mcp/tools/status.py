@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools for introspecting the state of the MCP server."""
+
+import asyncio
+from typing import Any, Dict
+from ads_mcp.coordinator import mcp
+from ads_mcp import daily_store
+from ads_mcp import metrics
+from ads_mcp import rate_limiter
+from ads_mcp import result_cache
+from ads_mcp import singleflight
+from ads_mcp.tools import core
+from ads_mcp.tools import hierarchy
+
+
+@mcp.tool()
+async def cache_stats() -> Dict[str, Any]:
+    """Returns statistics of the result caches, including the age of their oldest entries, and of coalesced searches."""
+    # The persistent result cache is queried, off the event loop.
+    return await asyncio.to_thread(_cache_stats)
+
+
+def _cache_stats() -> Dict[str, Any]:
+    return {
+        "search_results": result_cache.search_results.stats(),
+        "coalesced_searches": singleflight.searches.stats(),
+        "accessible_customers": core.accessible_customers.stats(),
+        "customer_tree": hierarchy.customer_clients.stats(),
+        "daily_store": (
+            daily_store.store.stats() if daily_store.store is not None else None
+        ),
+    }
+
+
+@mcp.tool()
+def quota_status() -> Dict[str, Any]:
+    """Returns the state of the client-side rate limiter of Google Ads API calls
+
+    For each developer token and each customer with recent calls: the tokens
+    left in its bucket (calls that can be sent right away), the rate at which
+    tokens come back per second, the burst size, the number of queued calls
+    and, for developer tokens, the calls made today (UTC) and the daily budget.
+    """
+    return rate_limiter.limiter.status()
+
+
+@mcp.tool()
+async def server_metrics() -> Dict[str, Any]:
+    """Returns the counters of the server, such as cancelled and timed out tool calls"""
+    # The cache gauges query the persistent result cache.
+    return await asyncio.to_thread(metrics.registry.snapshot)
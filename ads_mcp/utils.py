@@ -16,23 +16,42 @@
 
 """Common utilities used by the MCP server."""
 
-from typing import Any
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
 import proto
+import asyncio
+import functools
+import hashlib
+import json
+import operator
 import logging
+import threading
+import weakref
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.v21.services.services.google_ads_service import (
+    GoogleAdsServiceAsyncClient,
     GoogleAdsServiceClient,
 )
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
 
 from google.ads.googleads.util import get_nested_attr
+from google.protobuf.descriptor import FieldDescriptor
 import google.auth
-from ads_mcp.mcp_header_interceptor import MCPHeaderInterceptor
+from ads_mcp.mcp_header_interceptor import (
+    MCPHeaderInterceptor,
+    MCPHeaderUnaryStreamAioInterceptor,
+    MCPHeaderUnaryUnaryAioInterceptor,
+)
 import os
 import importlib.resources
 
 # filename for generated field information used by search
 _GAQL_FILENAME = "gaql_resources.json"
 
+# Google Ads API version matching the types imported by the tools.
+_API_VERSION = "v21"
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
@@ -73,17 +92,126 @@ def _get_googleads_client() -> GoogleAdsClient:
     return client
 
 
-_googleads_client = _get_googleads_client()
+# The client is created on first use rather than at import time, since
+# resolving credentials may require a round trip to the metadata server.
+_googleads_client: GoogleAdsClient | None = None
+_googleads_client_lock = threading.Lock()
 
 
-def get_googleads_service(serviceName: str) -> GoogleAdsServiceClient:
-    return _googleads_client.get_service(
-        serviceName, interceptors=[MCPHeaderInterceptor()]
-    )
+def get_googleads_client() -> GoogleAdsClient:
+    """Returns the shared GoogleAdsClient, creating it on first use."""
+    global _googleads_client
+    if _googleads_client is None:
+        with _googleads_client_lock:
+            if _googleads_client is None:
+                _googleads_client = _get_googleads_client()
+    return _googleads_client
+
+
+def credential_identity() -> str:
+    """Returns a digest identifying who the shared client calls the API as.
+
+    Covers the developer token, login customer id and principal of the
+    credentials, so results cached under it aren't shared across identities.
+    """
+    client = get_googleads_client()
+    credentials = client.credentials
+    identity = [
+        client.developer_token,
+        client.login_customer_id,
+        type(credentials).__name__,
+        getattr(credentials, "service_account_email", None),
+        getattr(credentials, "client_id", None),
+        getattr(credentials, "refresh_token", None),
+    ]
+    return hashlib.sha256(
+        json.dumps(identity, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+# Service clients keyed by (service name, API version). Each client owns an
+# intercepted gRPC channel, which is thread-safe and expensive to build, so
+# they are created once and shared. The tools use the asyncio clients below;
+# these blocking ones serve scripts such as update_references, which run
+# outside an event loop.
+_services: Dict[Tuple[str, str], Any] = {}
+_services_lock = threading.Lock()
+
+
+def get_googleads_service(
+    serviceName: str, version: str = _API_VERSION
+) -> GoogleAdsServiceClient:
+    key = (serviceName, version)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = get_googleads_client().get_service(
+                    serviceName,
+                    version=version,
+                    interceptors=[MCPHeaderInterceptor()],
+                )
+                _services[key] = service
+    return service
+
+
+# Service clients on grpc.aio channels, keyed by event loop and then like
+# _services. An aio channel can only be used from the loop it was created on.
+_async_services: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, Dict[Tuple[str, str], Any]
+] = weakref.WeakKeyDictionary()
+
+
+async def get_googleads_async_service(
+    serviceName: str, version: str = _API_VERSION
+) -> GoogleAdsServiceAsyncClient:
+    """Returns the asyncio service client for the running event loop.
+
+    The GoogleAdsClient is loaded in a worker thread, since resolving
+    credentials may block, and the service client is then created once per
+    loop.
+    """
+    services = _async_services.setdefault(asyncio.get_running_loop(), {})
+    key = (serviceName, version)
+    service = services.get(key)
+    if service is None:
+        client = await asyncio.to_thread(get_googleads_client)
+        # Another task may have created the service while this one waited.
+        service = services.get(key)
+        if service is None:
+            service = client.get_service(
+                serviceName,
+                version=version,
+                interceptors=[
+                    MCPHeaderUnaryUnaryAioInterceptor(),
+                    MCPHeaderUnaryStreamAioInterceptor(),
+                ],
+                is_async=True,
+            )
+            services[key] = service
+    return service
+
+
+async def warm_up(service_names: Iterable[str]) -> None:
+    """Creates the client and asyncio service clients ahead of first use.
+
+    Intended to run as a background task at server start so that the first
+    tool call doesn't pay for credential resolution and channel setup.
+    Failures are logged rather than raised; the services will be created on
+    demand.
+    """
+    for service_name in service_names:
+        try:
+            await get_googleads_async_service(service_name)
+        except Exception:
+            logger.warning(
+                f"Failed to warm up service {service_name}", exc_info=True
+            )
 
 
 def get_googleads_type(typeName: str):
-    return _googleads_client.get_type(typeName)
+    return get_googleads_client().get_type(typeName, version=_API_VERSION)
 
 
 def format_output_value(value: Any) -> Any:
@@ -100,6 +228,128 @@ def format_output_row(row: proto.Message, attributes):
     }
 
 
+def format_output_rows(
+    rows: Iterable[proto.Message], attributes: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Formats a batch of GoogleAdsRows, equivalent to format_output_row.
+
+    Uses a RowFormatter compiled once per distinct set of attributes.
+    """
+    return get_row_formatter(tuple(attributes)).format_rows(rows)
+
+
+@functools.lru_cache(maxsize=256)
+def get_row_formatter(attributes: Tuple[str, ...]) -> "RowFormatter":
+    return RowFormatter(attributes)
+
+
+class RowFormatter:
+    """Flattens GoogleAdsRows into dicts for a fixed set of field paths.
+
+    Each path is resolved against the GoogleAdsRow descriptor once, producing
+    an accessor that reads the raw protobuf message (`row._pb`) directly and
+    maps enum numbers to names through a precomputed table. This skips the
+    per-value path splitting and proto-plus wrapping done by
+    format_output_row. Paths that end in a message, or that can't be resolved,
+    fall back to format_output_row's behavior.
+
+    Args:
+        attributes: The field paths to extract, e.g. the field mask paths of a
+            search_stream batch.
+    """
+
+    def __init__(self, attributes: Sequence[str]):
+        self._accessors: List[Tuple[str, Callable[[Any], Any]]] = [
+            (attr, _compile_accessor(attr)) for attr in attributes
+        ]
+
+    @property
+    def accessors(self) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """The (attribute, accessor) pairs, in the order of the attributes."""
+        return list(self._accessors)
+
+    def format_row(self, row: proto.Message) -> Dict[str, Any]:
+        return {attr: accessor(row) for attr, accessor in self._accessors}
+
+    def format_rows(
+        self, rows: Iterable[proto.Message]
+    ) -> List[Dict[str, Any]]:
+        accessors = self._accessors
+        return [
+            {attr: accessor(row) for attr, accessor in accessors}
+            for row in rows
+        ]
+
+
+def resolve_field(attr: str) -> FieldDescriptor | None:
+    """Returns the descriptor of the GoogleAdsRow field at path `attr`.
+
+    Returns None if the path doesn't exist or passes through a repeated field.
+    """
+    path = _resolve_path(attr)
+    return path[-1] if path else None
+
+
+def _resolve_path(attr: str) -> List[FieldDescriptor] | None:
+    """Returns the descriptors of each segment of the path `attr`."""
+    descriptor = GoogleAdsRow.pb().DESCRIPTOR
+    path: List[FieldDescriptor] = []
+    for segment in attr.split("."):
+        if descriptor is None or (path and is_repeated_field(path[-1])):
+            return None
+        # Fields that collide with reserved words have a trailing underscore.
+        field = descriptor.fields_by_name.get(
+            segment
+        ) or descriptor.fields_by_name.get(f"{segment}_")
+        if field is None:
+            return None
+        path.append(field)
+        descriptor = field.message_type
+    return path
+
+
+def _compile_accessor(attr: str) -> Callable[[Any], Any]:
+    """Returns a function extracting the formatted value of `attr` from a row."""
+
+    def fallback(row):
+        return format_output_value(get_nested_attr(row, attr))
+
+    path = _resolve_path(attr)
+    if path is None:
+        return fallback
+    field = path[-1]
+    field_names = [segment.name for segment in path]
+
+    if field.message_type is not None:
+        return fallback
+
+    get_value = operator.attrgetter(".".join(field_names))
+    repeated = is_repeated_field(field)
+    if field.enum_type is None:
+        if repeated:
+            return lambda row: list(get_value(row._pb))
+        return lambda row: get_value(row._pb)
+
+    enum_names = {value.number: value.name for value in field.enum_type.values}
+    if repeated:
+        return lambda row: [
+            enum_names.get(value, value) for value in get_value(row._pb)
+        ]
+
+    def get_enum_name(row):
+        value = get_value(row._pb)
+        return enum_names.get(value, value)
+
+    return get_enum_name
+
+
+def is_repeated_field(field: FieldDescriptor) -> bool:
+    # FieldDescriptor.label is deprecated in newer protobuf releases.
+    if hasattr(field, "is_repeated"):
+        return field.is_repeated
+    return field.label == field.LABEL_REPEATED
+
+
 def get_gaql_resources_filepath():
     package_root = importlib.resources.files("ads_mcp")
     file_path = package_root.joinpath(_GAQL_FILENAME)
@@ -1,4 +1,12 @@
+import asyncio
+import datetime
+import hashlib
+import itertools
+import json
+import logging
 import os
+import threading
+import time
 from starlette.applications import Starlette
 from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -6,52 +14,216 @@ from starlette.routing import Mount, Route
 from starlette.types import Scope, Receive, Send  # NEW
 from mcp.server.fastmcp import FastMCP
 from google.ads.googleads.client import GoogleAdsClient
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from google.protobuf.json_format import MessageToDict
+from ads_mcp import gaql_normalizer
+from ads_mcp import metrics
+from ads_mcp import pagination
+from ads_mcp import result_cache
+from ads_mcp import retry
+
+logger = logging.getLogger(__name__)
+
+# ----- Google Ads client registry -----
+# Building a GoogleAdsClient refreshes OAuth and every get_service() call opens
+# a new gRPC channel, so clients and service stubs are created once per
+# credential set and shared by all tool calls in the process.
+_TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+_TOKEN_REFRESH_RETRY_SECONDS = 60
+
+def _client_config():
+    config = {
+        "developer_token": os.environ["GOOGLE_ADS_DEVELOPER_TOKEN"],
+        "client_id": os.environ["GOOGLE_ADS_CLIENT_ID"],
+        "client_secret": os.environ["GOOGLE_ADS_CLIENT_SECRET"],
+        "refresh_token": os.environ["GOOGLE_ADS_REFRESH_TOKEN"],
+        "use_proto_plus": True,
+    }
+    login_customer_id = os.environ.get("GOOGLE_ADS_LOGIN_CUSTOMER_ID")
+    if login_customer_id:
+        config["login_customer_id"] = login_customer_id
+    return config
+
+def _credential_key(config):
+    # Hash the credential set so secrets aren't duplicated as dict keys.
+    payload = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+class ClientRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._services = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_client(self, config):
+        key = _credential_key(config)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._hits += 1
+                return client
+            self._misses += 1
+            client = GoogleAdsClient.load_from_dict(config)
+            self._clients[key] = client
+        self._start_token_refresh(client.credentials)
+        return client
+
+    def get_service(self, config, name):
+        client = self.get_client(config)
+        key = (_credential_key(config), name)
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                service = client.get_service(name)
+                self._services[key] = service
+        return service
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "clients": len(self._clients),
+                "services": len(self._services),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _start_token_refresh(self, credentials):
+        thread = threading.Thread(
+            target=self._refresh_token_loop,
+            args=(credentials,),
+            name="google-ads-token-refresh",
+            daemon=True,
+        )
+        thread.start()
+
+    @staticmethod
+    def _refresh_token_loop(credentials):
+        # Refresh ahead of expiry so tool calls never pay for the OAuth round
+        # trip inside the gRPC auth plugin.
+        while True:
+            if credentials.expiry is not None:
+                now = datetime.datetime.now(datetime.timezone.utc).replace(
+                    tzinfo=None
+                )
+                wait = credentials.expiry - _TOKEN_REFRESH_MARGIN - now
+                if wait.total_seconds() > 0:
+                    time.sleep(wait.total_seconds())
+            try:
+                credentials.refresh(GoogleAuthRequest())
+            except Exception:
+                logger.warning("Background token refresh failed", exc_info=True)
+                time.sleep(_TOKEN_REFRESH_RETRY_SECONDS)
+
+client_registry = ClientRegistry()
+metrics.register_cache("google_ads_clients", client_registry.stats)
 
-# Build a google-ads.yaml from env vars at runtime
 def get_google_ads_client():
-    yaml_text = f"""
-developer_token: {os.environ['GOOGLE_ADS_DEVELOPER_TOKEN']}
-client_id: {os.environ['GOOGLE_ADS_CLIENT_ID']}
-client_secret: {os.environ['GOOGLE_ADS_CLIENT_SECRET']}
-refresh_token: {os.environ['GOOGLE_ADS_REFRESH_TOKEN']}
-login_customer_id: {os.environ.get('GOOGLE_ADS_LOGIN_CUSTOMER_ID', '')}
-use_proto_plus: True
-"""
-    path = "/tmp/google-ads.yaml"
-    with open(path, "w") as f:
-        f.write(yaml_text)
-    return GoogleAdsClient.load_from_storage(path)
+    return client_registry.get_client(_client_config())
+
+def get_google_ads_service(name):
+    return client_registry.get_service(_client_config(), name)
 
 # ----- MCP tools -----
 mcp = FastMCP("GoogleAds-MCP")
 
 @mcp.tool()
+@metrics.instrument_tool
 def list_accessible_customers():
-    client = get_google_ads_client()
-    svc = client.get_service("CustomerService")
-    resp = svc.list_accessible_customers()
+    svc = get_google_ads_service("CustomerService")
+
+    def list_customers():
+        with metrics.track_rpc("ListAccessibleCustomers"):
+            return svc.list_accessible_customers()
+
+    resp = retry.policy.run_sync(list_customers)
     return [rn.split("/")[-1] for rn in resp.resource_names]
 
+# Rows beyond the per-call budget are kept server side and returned by
+# search_next_page, so large reports don't need to be re-run page by page.
 @mcp.tool()
-def search(customer_id: str, query: str, page_size: int = 50):
+@metrics.instrument_tool
+def search(
+    customer_id: str,
+    query: str,
+    page_size: int = 50,
+    max_rows: int = 500,
+    max_bytes: int = None,
+    use_cache: bool = True,
+):
+    # Shared by worker processes, and deployments with other credentials, if
+    # GOOGLE_ADS_MCP_CACHE_PATH is set.
+    parsed = gaql_normalizer.parse(query)
+    cache_key = (
+        "main.search",
+        _credential_key(_client_config()),
+        customer_id,
+        parsed.digest,
+        page_size,
+    )
+    rows = result_cache.search_results.get(cache_key) if use_cache else None
+    if rows is not None:
+        return _first_page(rows, max_rows, max_bytes)
     client = get_google_ads_client()
-    svc = client.get_service("GoogleAdsService")
+    svc = get_google_ads_service("GoogleAdsService")
     req = client.get_type("SearchGoogleAdsRequest")
     req.customer_id = customer_id
     req.query = query
     req.page_size = page_size
-    rows = []
-    for row in svc.search(request=req):
-        rows.append(MessageToDict(row._pb, preserving_proto_field_name=True))
-        if len(rows) >= 500:
-            break
-    return rows
+    # The pager fetches pages lazily, so the whole iteration is retried. At
+    # most MAX_FETCH_ROWS rows are read, so an unbounded query can't exhaust
+    # memory.
+    def fetch_rows():
+        with metrics.track_rpc("Search", customer_id=customer_id):
+            return [
+                MessageToDict(row._pb, preserving_proto_field_name=True)
+                for row in itertools.islice(
+                    svc.search(request=req), pagination.MAX_FETCH_ROWS + 1
+                )
+            ]
+
+    rows = retry.policy.run_sync(fetch_rows)
+    result_cache.search_results.put(
+        cache_key,
+        rows,
+        ttl=result_cache.ttl_for(parsed.resource, parsed.fields),
+        size=result_cache.estimate_size(rows),
+    )
+    return _first_page(rows, max_rows, max_bytes)
+
+def _first_page(rows, max_rows, max_bytes):
+    # A row beyond MAX_FETCH_ROWS is fetched only to tell that rows were cut.
+    output = pagination.paginate(
+        rows[:pagination.MAX_FETCH_ROWS], max_rows, max_bytes
+    )
+    output["truncated"] = len(rows) > pagination.MAX_FETCH_ROWS
+    return output
+
+@mcp.tool()
+@metrics.instrument_tool
+def search_next_page(cursor: str, max_rows: int = 500, max_bytes: int = None):
+    return pagination.next_page(cursor, max_rows, max_bytes)
 
 # ----- Health -----
 async def healthz(_):
     return PlainTextResponse("ok")
 
+# ----- Client cache stats -----
+async def statsz(_):
+    return JSONResponse({"client_cache": client_registry.stats()})
+
+# ----- Prometheus metrics -----
+async def metrics_endpoint(_):
+    # The cache gauges may query the SQLite result cache.
+    text = await asyncio.to_thread(metrics.registry.render_prometheus)
+    return PlainTextResponse(
+        text,
+        media_type="text/plain; version=0.0.4",
+    )
+
 # ----- Auth middleware (tolerant of quotes; allows GET/HEAD probes) -----
 class BearerAuth(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
@@ -90,6 +262,8 @@ async def mcp_entry(scope: Scope, receive: Receive, send: Send):
 app = Starlette(
     routes=[
         Route("/healthz", healthz),
+        Route("/statsz", statsz),
+        Route("/metrics", metrics_endpoint),
         # Single entry for both forms of the path; no 405s on POST
         Mount("/mcp", app=mcp_entry),
         Mount("/mcp/", app=mcp_entry),
@@ -0,0 +1,148 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the aggregation module."""
+
+import unittest
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp import aggregation
+
+
+def _row(campaign_id, date, clicks, impressions, cost_micros):
+    return GoogleAdsRow(
+        campaign={"id": campaign_id},
+        segments={"date": date},
+        metrics={
+            "clicks": clicks,
+            "impressions": impressions,
+            "cost_micros": cost_micros,
+        },
+    )
+
+
+class TestAggregation(unittest.TestCase):
+    """Test cases for the aggregation module."""
+
+    def test_aggregates_across_batches(self):
+        """Tests that groups accumulate the rows of every batch."""
+        aggregator = aggregation.Aggregator(
+            ["campaign.id"],
+            [
+                "sum(metrics.cost_micros)",
+                "avg(metrics.clicks)",
+                "min(segments.date)",
+                "max(segments.date)",
+                "count(*)",
+                "metrics.ctr",
+            ],
+        )
+        aggregator.append_rows(
+            [_row(1, "2025-01-01", 1, 10, 100), _row(2, "2025-01-01", 0, 0, 5)]
+        )
+        aggregator.append_rows([_row(1, "2025-01-02", 3, 30, 300)])
+
+        self.assertEqual(aggregator.input_rows, 3)
+        self.assertEqual(
+            aggregator.result(),
+            [
+                {
+                    "campaign.id": 1,
+                    "sum(metrics.cost_micros)": 400,
+                    "avg(metrics.clicks)": 2,
+                    "min(segments.date)": "2025-01-01",
+                    "max(segments.date)": "2025-01-02",
+                    "count(*)": 2,
+                    "metrics.ctr": 0.1,
+                },
+                {
+                    "campaign.id": 2,
+                    "sum(metrics.cost_micros)": 5,
+                    "avg(metrics.clicks)": 0,
+                    "min(segments.date)": "2025-01-01",
+                    "max(segments.date)": "2025-01-01",
+                    "count(*)": 1,
+                    "metrics.ctr": None,
+                },
+            ],
+        )
+
+    def test_reset_drops_appended_rows(self):
+        """Tests that a restarted search isn't counted twice."""
+        aggregator = aggregation.Aggregator(
+            ["campaign.id"], ["sum(metrics.clicks)"]
+        )
+        aggregator.append_rows([_row(1, "2025-01-01", 1, 10, 100)])
+
+        aggregator.reset()
+        aggregator.append_rows([_row(1, "2025-01-01", 1, 10, 100)])
+
+        self.assertEqual(aggregator.input_rows, 1)
+        self.assertEqual(
+            aggregator.result(),
+            [{"campaign.id": 1, "sum(metrics.clicks)": 1}],
+        )
+
+    def test_selects_ratio_components(self):
+        """Tests that ratio metrics are searched through their components."""
+        aggregator = aggregation.Aggregator(["campaign.id"], ["metrics.ctr"])
+
+        self.assertEqual(
+            aggregator.fields,
+            ["campaign.id", "metrics.clicks", "metrics.impressions"],
+        )
+
+    def test_orders_and_limits_groups(self):
+        """Tests that groups are sorted by an aggregate, empty values last."""
+        aggregator = aggregation.Aggregator(
+            ["campaign.id"],
+            ["metrics.ctr"],
+            order_by=["metrics.ctr DESC"],
+        )
+        aggregator.append_rows(
+            [
+                _row(1, "2025-01-01", 1, 10, 0),
+                _row(2, "2025-01-01", 0, 0, 0),
+                _row(3, "2025-01-01", 1, 2, 0),
+            ]
+        )
+
+        self.assertEqual(
+            [row["campaign.id"] for row in aggregator.result()], [3, 1, 2]
+        )
+        self.assertEqual(len(aggregator.result(limit=1)), 1)
+
+    def test_invalid_aggregates(self):
+        """Tests that malformed or non-numeric aggregates are rejected."""
+        for spec in (
+            "median(metrics.clicks)",
+            "sum(*)",
+            "sum(campaign.name)",
+            "metrics.clicks",
+        ):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    aggregation.parse_aggregate(spec)
+
+        with self.assertRaises(ValueError):
+            aggregation.Aggregator(
+                ["campaign.id"], ["count(*)"], order_by=["campaign.name"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the columnar module."""
+
+import base64
+import importlib.util
+import unittest
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp import columnar
+
+_ATTRIBUTES = [
+    "campaign.id",
+    "campaign.name",
+    "campaign.status",
+    "metrics.clicks",
+    "metrics.ctr",
+    "ad_group_ad.ad.final_urls",
+]
+
+
+def _rows():
+    return [
+        GoogleAdsRow(
+            campaign={"id": 1, "name": "a", "status": 2},
+            metrics={"clicks": 10, "ctr": 0.5},
+            ad_group_ad={"ad": {"final_urls": ["https://a"]}},
+        ),
+        GoogleAdsRow(
+            campaign={"id": 2, "name": "b", "status": 3},
+            metrics={"clicks": 20, "ctr": 0.25},
+        ),
+    ]
+
+
+class TestColumnar(unittest.TestCase):
+    """Test cases for the columnar module."""
+
+    def test_column_types(self):
+        """Tests that column types are resolved from the row descriptor."""
+        result = columnar.ColumnarResult(_ATTRIBUTES)
+
+        self.assertEqual(
+            result.types,
+            {
+                "campaign.id": "int64",
+                "campaign.name": "string",
+                "campaign.status": "enum",
+                "metrics.clicks": "int64",
+                "metrics.ctr": "double",
+                "ad_group_ad.ad.final_urls": "object",
+            },
+        )
+
+    def test_to_json(self):
+        """Tests that batches are accumulated into columns."""
+        result = columnar.ColumnarResult(_ATTRIBUTES)
+        rows = _rows()
+        result.append_rows(rows[:1])
+        result.append_rows(rows[1:])
+
+        output = result.to_json()
+
+        self.assertEqual(output["row_count"], 2)
+        self.assertEqual(
+            output["columns"],
+            {
+                "campaign.id": [1, 2],
+                "campaign.name": ["a", "b"],
+                "campaign.status": ["ENABLED", "PAUSED"],
+                "metrics.clicks": [10, 20],
+                "metrics.ctr": [0.5, 0.25],
+                "ad_group_ad.ad.final_urls": [["https://a"], []],
+            },
+        )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "pyarrow is not installed"
+    )
+    def test_to_arrow(self):
+        """Tests that the Arrow IPC stream round trips."""
+        import pyarrow
+
+        result = columnar.ColumnarResult(_ATTRIBUTES)
+        result.append_rows(_rows())
+
+        output = result.to_arrow()
+        table = pyarrow.ipc.open_stream(
+            base64.b64decode(output["arrow_ipc_base64"])
+        ).read_all()
+
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column("metrics.clicks").to_pylist(), [10, 20])
+        self.assertEqual(
+            table.column("campaign.status").to_pylist(), ["ENABLED", "PAUSED"]
+        )
@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the core tool module."""
+
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from ads_mcp.tools import core
+
+
+class TestCore(unittest.TestCase):
+    """Test cases for the core tool module."""
+
+    def setUp(self):
+        self.customer_service = mock.Mock()
+        self.customer_service.list_accessible_customers = mock.AsyncMock(
+            return_value=types.SimpleNamespace(
+                resource_names=["customers/123", "customers/456"]
+            )
+        )
+        self.identity = "alice"
+        for target, kwargs in (
+            (
+                "ads_mcp.utils.get_googleads_async_service",
+                {"new": mock.AsyncMock(return_value=self.customer_service)},
+            ),
+            (
+                "ads_mcp.utils.credential_identity",
+                {"side_effect": lambda: self.identity},
+            ),
+            ("ads_mcp.rate_limiter.throttle", {}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        core.accessible_customers.clear()
+
+    def test_list_accessible_customers_is_cached_per_identity(self):
+        """Tests that each credential identity is listed once."""
+        first = asyncio.run(core.list_accessible_customers())
+        second = asyncio.run(core.list_accessible_customers())
+        self.identity = "bob"
+        asyncio.run(core.list_accessible_customers())
+
+        self.assertEqual(first, ["123", "456"])
+        self.assertEqual(first, second)
+        self.assertEqual(
+            self.customer_service.list_accessible_customers.call_count, 2
+        )
+
+    def test_list_accessible_customers_refresh(self):
+        """Tests that refresh bypasses the cache."""
+        asyncio.run(core.list_accessible_customers())
+        asyncio.run(core.list_accessible_customers(refresh=True))
+
+        self.assertEqual(
+            self.customer_service.list_accessible_customers.call_count, 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
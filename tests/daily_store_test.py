@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the daily_store module."""
+
+import datetime
+import errno
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ads_mcp import daily_store
+
+_CLOSED_DAY = datetime.date(2020, 1, 1)
+
+
+class TestDailyStore(unittest.TestCase):
+    """Test cases for the daily_store module."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = daily_store.DailyStore(directory.name, lag_days=3)
+
+    def test_saved_partitions_are_loaded(self):
+        """Tests that closed days, including empty ones, are stored."""
+        rows = [{"segments.date": "2020-01-01", "metrics.clicks": 2}]
+        empty_day = _CLOSED_DAY + datetime.timedelta(days=1)
+
+        written = self.store.save(
+            "123", "campaign", "digest", {_CLOSED_DAY: rows, empty_day: []}
+        )
+
+        self.assertEqual(written, 2)
+        self.assertEqual(
+            self.store.load(
+                "123",
+                "campaign",
+                "digest",
+                [_CLOSED_DAY, empty_day, empty_day + datetime.timedelta(1)],
+            ),
+            {_CLOSED_DAY: rows, empty_day: []},
+        )
+        self.assertEqual(
+            self.store.load("123", "ad_group", "digest", [_CLOSED_DAY]), {}
+        )
+        stats = self.store.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+    def test_days_inside_lag_window_are_not_saved(self):
+        """Tests that recent days, which may still change, aren't stored."""
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+
+        written = self.store.save("123", "campaign", "digest", {today: []})
+
+        self.assertEqual(written, 0)
+        self.assertFalse(self.store.is_closed(today))
+        self.assertEqual(
+            self.store.load("123", "campaign", "digest", [today]), {}
+        )
+
+    def test_failed_writes_are_logged(self):
+        """Tests that a full disk doesn't fail the save or leave files."""
+        with (
+            mock.patch(
+                "os.replace",
+                side_effect=OSError(errno.ENOSPC, "No space left on device"),
+            ),
+            self.assertLogs(daily_store.logger, "WARNING"),
+        ):
+            written = self.store.save(
+                "123", "campaign", "digest", {_CLOSED_DAY: []}
+            )
+
+        self.assertEqual(written, 0)
+        self.assertEqual(
+            [files for _, _, files in os.walk(self.store.directory)], [[]] * 4
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the date_chunks module."""
+
+import datetime
+import importlib
+import os
+import unittest
+from unittest import mock
+
+from ads_mcp import date_chunks
+
+_FIELDS = ["campaign.id", "segments.date", "metrics.clicks"]
+_RANGE = "segments.date BETWEEN '2025-01-15' AND '2025-03-02'"
+
+
+class TestDateChunks(unittest.TestCase):
+    """Test cases for the date_chunks module."""
+
+    def test_split_range_by_month(self):
+        """Tests that chunks end on the last day of each month."""
+        self.assertEqual(
+            date_chunks.split_range(
+                datetime.date(2024, 1, 15), datetime.date(2024, 3, 2), "month"
+            ),
+            [
+                (datetime.date(2024, 1, 15), datetime.date(2024, 1, 31)),
+                (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)),
+                (datetime.date(2024, 3, 1), datetime.date(2024, 3, 2)),
+            ],
+        )
+
+    def test_split_range_by_week(self):
+        """Tests that chunks start on Mondays."""
+        self.assertEqual(
+            date_chunks.split_range(
+                datetime.date(2025, 1, 1), datetime.date(2025, 1, 10), "week"
+            ),
+            [
+                (datetime.date(2025, 1, 1), datetime.date(2025, 1, 5)),
+                (datetime.date(2025, 1, 6), datetime.date(2025, 1, 10)),
+            ],
+        )
+
+    def test_split_range_within_one_chunk(self):
+        """Tests that a range within one month, or period none, isn't split."""
+        start, end = datetime.date(2025, 1, 1), datetime.date(2025, 1, 31)
+        for period in ("month", "none"):
+            with self.subTest(period=period):
+                self.assertEqual(
+                    date_chunks.split_range(start, end, period), [(start, end)]
+                )
+
+    def test_find_range(self):
+        """Tests that the date condition and order of a search are found."""
+        self.assertEqual(
+            date_chunks.find_range(
+                _FIELDS,
+                ["campaign.status = 'ENABLED'", _RANGE],
+                ["segments.date DESC"],
+                None,
+            ),
+            date_chunks.DateRange(
+                1, datetime.date(2025, 1, 15), datetime.date(2025, 3, 2), True
+            ),
+        )
+
+    def test_find_range_skips_searches_changed_by_splitting(self):
+        """Tests that searches whose result would change have no range."""
+        for fields, conditions, orderings, limit in (
+            (["campaign.id", "metrics.clicks"], [_RANGE], None, None),
+            (_FIELDS, [_RANGE], ["metrics.clicks DESC"], None),
+            (_FIELDS, [_RANGE], None, 10),
+            (_FIELDS, [_RANGE, _RANGE], None, None),
+        ):
+            with self.subTest(
+                fields=fields,
+                conditions=conditions,
+                orderings=orderings,
+                limit=limit,
+            ):
+                self.assertIsNone(
+                    date_chunks.find_range(fields, conditions, orderings, limit)
+                )
+
+    def test_with_range_replaces_the_date_condition(self):
+        """Tests that other conditions are kept around the new range."""
+        self.assertEqual(
+            date_chunks.with_range(
+                ["campaign.status = 'ENABLED'", _RANGE, "campaign.id > 1"],
+                1,
+                datetime.date(2025, 2, 1),
+                datetime.date(2025, 2, 28),
+            ),
+            [
+                "campaign.status = 'ENABLED'",
+                "segments.date BETWEEN '2025-02-01' AND '2025-02-28'",
+                "campaign.id > 1",
+            ],
+        )
+
+    def test_unknown_date_chunk_fails_at_import(self):
+        """Tests that a bad GOOGLE_ADS_MCP_DATE_CHUNK is reported up front."""
+        self.addCleanup(importlib.reload, date_chunks)
+        with (
+            mock.patch.dict(os.environ, {"GOOGLE_ADS_MCP_DATE_CHUNK": "day"}),
+            self.assertRaises(ValueError),
+        ):
+            importlib.reload(date_chunks)
+
+
+if __name__ == "__main__":
+    unittest.main()
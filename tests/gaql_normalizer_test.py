@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the gaql_normalizer module."""
+
+import unittest
+
+from ads_mcp import gaql_normalizer
+
+
+class TestGaqlNormalizer(unittest.TestCase):
+    """Test cases for the gaql_normalizer module."""
+
+    def test_equivalent_searches_match(self):
+        """Tests that reordered and reformatted searches are equal."""
+        first = gaql_normalizer.canonicalize(
+            ["metrics.clicks", "campaign.id"],
+            "campaign",
+            [
+                "campaign.status in ('PAUSED','ENABLED')",
+                "metrics.clicks>+010",
+            ],
+            ["metrics.clicks desc"],
+            "10",
+        )
+        second = gaql_normalizer.canonicalize(
+            [" campaign.id", "metrics.clicks", "campaign.id"],
+            "campaign",
+            [
+                "metrics.clicks  >  10",
+                "campaign.status IN (\"ENABLED\", 'PAUSED')",
+            ],
+            ["metrics.clicks DESC"],
+            10,
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(first.digest, second.digest)
+        self.assertEqual(
+            str(first),
+            "SELECT campaign.id, metrics.clicks FROM campaign"
+            " WHERE campaign.status IN ('ENABLED', 'PAUSED')"
+            " AND metrics.clicks > 10"
+            " ORDER BY metrics.clicks DESC LIMIT 10",
+        )
+
+    def test_ordering_is_significant(self):
+        """Tests that orderings keep their order and default to ASC."""
+        first = gaql_normalizer.canonicalize(
+            ["campaign.id"],
+            "campaign",
+            orderings=["campaign.id", "campaign.name"],
+        )
+        second = gaql_normalizer.canonicalize(
+            ["campaign.id"],
+            "campaign",
+            orderings=["campaign.name", "campaign.id"],
+        )
+
+        self.assertNotEqual(first.digest, second.digest)
+        self.assertEqual(
+            first.orderings, ("campaign.id ASC", "campaign.name ASC")
+        )
+
+    def test_between_is_not_split(self):
+        """Tests that the AND of a BETWEEN stays within its condition."""
+        query = gaql_normalizer.canonicalize(
+            ["campaign.id"],
+            "campaign",
+            [
+                "segments.date between '2024-01-01' and '2024-01-31'"
+                " AND campaign.id = 1"
+            ],
+        )
+
+        self.assertEqual(
+            query.conditions,
+            (
+                "campaign.id = 1",
+                "segments.date BETWEEN '2024-01-01' AND '2024-01-31'",
+            ),
+        )
+
+    def test_parse_matches_canonicalize(self):
+        """Tests that a query string and search arguments agree."""
+        parsed = gaql_normalizer.parse(
+            "select metrics.clicks, campaign.id from campaign"
+            " where campaign.name like '%a, b%' order by campaign.id limit 5"
+        )
+
+        self.assertEqual(
+            parsed,
+            gaql_normalizer.canonicalize(
+                ["campaign.id", "metrics.clicks"],
+                "campaign",
+                ["campaign.name LIKE '%a, b%'"],
+                ["campaign.id ASC"],
+                5,
+            ),
+        )
+
+    def test_parse_requires_select_and_from(self):
+        """Tests that incomplete queries are rejected."""
+        with self.assertRaises(ValueError):
+            gaql_normalizer.parse("campaign.id FROM campaign")
@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the gaql_schema module."""
+
+import unittest
+
+from ads_mcp import gaql_schema
+
+_ENTRIES = [
+    {
+        "resource": "campaign",
+        "selectable": ["campaign.id", "campaign.name", "campaign.status"],
+        "filterable": ["campaign.id", "campaign.status"],
+        "sortable": ["campaign.name"],
+    },
+    {
+        "resource": "metrics",
+        "selectable": ["metrics.clicks", "metrics.cost_micros"],
+        "filterable": ["metrics.clicks"],
+        "sortable": ["metrics.clicks", "metrics.cost_micros"],
+    },
+]
+
+
+class TestGaqlSchema(unittest.TestCase):
+    """Test cases for the gaql_schema module."""
+
+    def setUp(self):
+        self.schema = gaql_schema.GaqlSchema(_ENTRIES)
+
+    def test_field_attributes(self):
+        """Tests that field attributes are resolved from the field prefix."""
+        self.assertTrue(self.schema.is_selectable("campaign.name"))
+        self.assertFalse(self.schema.is_filterable("campaign.name"))
+        self.assertTrue(self.schema.is_sortable("metrics.cost_micros"))
+        self.assertFalse(self.schema.is_selectable("ad_group.id"))
+
+    def test_resources_for_field(self):
+        """Tests the reverse map from fields to resources."""
+        self.assertEqual(
+            self.schema.resources_for_field("metrics.clicks"),
+            frozenset({"metrics"}),
+        )
+        self.assertEqual(
+            self.schema.resources_for_field("unknown.field"), frozenset()
+        )
+
+    def test_complete(self):
+        """Tests prefix completion across and within segments."""
+        self.assertEqual(
+            self.schema.complete("campaign.st"), ["campaign.status"]
+        )
+        self.assertEqual(
+            self.schema.complete("metr"),
+            ["metrics.clicks", "metrics.cost_micros"],
+        )
+        self.assertEqual(
+            self.schema.complete("campaign.", limit=1), ["campaign.id"]
+        )
+        self.assertEqual(self.schema.complete("ad_group."), [])
+
+    def test_get_schema_loads_resource_file(self):
+        """Tests that the packaged gaql_resources.json is indexed."""
+        schema = gaql_schema.get_schema()
+
+        self.assertIs(schema, gaql_schema.get_schema())
+        self.assertTrue(schema.is_filterable("campaign.status"))
@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the gaql_validator module."""
+
+import unittest
+
+from ads_mcp import gaql_validator
+
+
+class TestGaqlValidator(unittest.TestCase):
+    """Test cases for the gaql_validator module."""
+
+    def test_valid_search(self):
+        """Tests that a valid search passes validation."""
+        gaql_validator.validate_search(
+            "campaign",
+            ["campaign.id", "campaign.name", "metrics.clicks", "segments.date"],
+            conditions=["campaign.status = 'ENABLED'"],
+            orderings=["metrics.clicks DESC"],
+            limit=10,
+        )
+
+    def test_reports_all_errors(self):
+        """Tests that every invalid argument is reported."""
+        with self.assertRaises(gaql_validator.GaqlValidationError) as context:
+            gaql_validator.validate_search(
+                "campaign",
+                ["campaign.not_a_field", "id"],
+                conditions=["campaign.resource_name = 'x'"],
+                orderings=["campaign.id SIDEWAYS"],
+                limit=-1,
+            )
+
+        clauses = [error["clause"] for error in context.exception.errors]
+        self.assertEqual(clauses, ["SELECT", "SELECT", "ORDER BY", "LIMIT"])
+        self.assertIn("campaign.not_a_field", str(context.exception))
+
+    def test_unknown_resource(self):
+        """Tests that unknown and field-only resources are rejected."""
+        for resource in ("not_a_resource", "metrics"):
+            with self.assertRaises(gaql_validator.GaqlValidationError):
+                gaql_validator.validate_search(resource, ["campaign.id"])
+
+    def test_change_event_requires_limit(self):
+        """Tests the LIMIT rule for change_event."""
+        fields = ["change_event.change_date_time"]
+        with self.assertRaises(gaql_validator.GaqlValidationError):
+            gaql_validator.validate_search("change_event", fields)
+        with self.assertRaises(gaql_validator.GaqlValidationError):
+            gaql_validator.validate_search("change_event", fields, limit=10001)
+
+        gaql_validator.validate_search("change_event", fields, limit="10000")
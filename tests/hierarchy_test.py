@@ -0,0 +1,126 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the hierarchy tool module."""
+
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp.tools import hierarchy
+
+# Direct clients of each manager account, as (id, manager) tuples.
+_CLIENTS = {
+    "1": [("2", True), ("3", False)],
+    "2": [("4", False), ("3", False)],
+}
+
+
+def _stream(customer_id):
+    """Returns a fake search_stream call of the customer_client query."""
+    rows = [
+        GoogleAdsRow(
+            customer_client={
+                "id": int(client_id),
+                "manager": manager,
+                "level": level,
+                "descriptive_name": f"Account {client_id}",
+            }
+        )
+        for client_id, manager, level in [
+            (customer_id, customer_id in _CLIENTS, 0),
+            *((c, m, 1) for c, m in _CLIENTS.get(customer_id, [])),
+        ]
+    ]
+
+    class Stream:
+        async def __aiter__(self):
+            yield types.SimpleNamespace(
+                field_mask=types.SimpleNamespace(paths=list(hierarchy._FIELDS)),
+                results=rows,
+            )
+
+    return Stream()
+
+
+class TestHierarchy(unittest.TestCase):
+    """Test cases for the hierarchy tool module."""
+
+    def setUp(self):
+        self.ga_service = mock.Mock()
+        self.ga_service.search_stream = mock.AsyncMock(
+            side_effect=lambda customer_id, query: _stream(customer_id)
+        )
+        patcher = mock.patch(
+            "ads_mcp.utils.get_googleads_async_service",
+            new=mock.AsyncMock(return_value=self.ga_service),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("ads_mcp.rate_limiter.throttle")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        hierarchy.customer_clients.clear()
+
+    def _searched_customers(self):
+        return sorted(
+            call.kwargs["customer_id"]
+            for call in self.ga_service.search_stream.call_args_list
+        )
+
+    def test_get_customer_tree_walks_managers(self):
+        """Tests that every manager account of the tree is searched once."""
+        output = asyncio.run(hierarchy.get_customer_tree("1"))
+
+        tree = output["tree"]
+        self.assertEqual(tree["customer_id"], "1")
+        self.assertEqual(
+            [client["customer_id"] for client in tree["clients"]], ["2", "3"]
+        )
+        self.assertEqual(
+            [client["customer_id"] for client in tree["clients"][0]["clients"]],
+            ["4", "3"],
+        )
+        self.assertNotIn("clients", tree["clients"][1])
+        self.assertEqual(output["searched_managers"], 2)
+        self.assertEqual(self._searched_customers(), ["1", "2"])
+
+    def test_get_customer_tree_is_cached(self):
+        """Tests that a second walk doesn't search again."""
+        first = asyncio.run(hierarchy.get_customer_tree("1"))
+        second = asyncio.run(hierarchy.get_customer_tree("1"))
+
+        self.assertEqual(first["tree"], second["tree"])
+        self.assertEqual(second["searched_managers"], 0)
+        self.assertEqual(second["cached_managers"], 2)
+        self.assertEqual(self.ga_service.search_stream.call_count, 2)
+
+    def test_get_customer_tree_refreshes_subtree(self):
+        """Tests that only the refreshed manager accounts are searched."""
+        asyncio.run(hierarchy.get_customer_tree("1"))
+        self.ga_service.search_stream.reset_mock()
+
+        output = asyncio.run(hierarchy.get_customer_tree("1", refresh=["2"]))
+
+        self.assertEqual(output["searched_managers"], 1)
+        self.assertEqual(self._searched_customers(), ["2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the main module, the standalone HTTP server."""
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+import main  # pylint: disable=g-import-not-at-top,wrong-import-position
+
+_CONFIG = {
+    "developer_token": "token",
+    "client_id": "id",
+    "client_secret": "secret",
+    "refresh_token": "refresh",
+    "use_proto_plus": True,
+}
+
+
+class TestMain(unittest.TestCase):
+    """Test cases for the main module."""
+
+    def test_import_does_not_need_a_versioned_api(self):
+        """Tests that main doesn't import ads_mcp.utils and its API version."""
+        code = "import sys, main; sys.exit('ads_mcp.utils' in sys.modules)"
+
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=_ROOT, capture_output=True
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class TestClientRegistry(unittest.TestCase):
+    """Test cases for main.ClientRegistry."""
+
+    def setUp(self):
+        super().setUp()
+        load_patcher = mock.patch.object(
+            main.GoogleAdsClient,
+            "load_from_dict",
+            side_effect=lambda config: mock.Mock(
+                get_service=mock.Mock(side_effect=lambda name: mock.Mock())
+            ),
+        )
+        self.load_from_dict = load_patcher.start()
+        self.addCleanup(load_patcher.stop)
+        refresh_patcher = mock.patch.object(
+            main.ClientRegistry, "_start_token_refresh"
+        )
+        self.start_token_refresh = refresh_patcher.start()
+        self.addCleanup(refresh_patcher.stop)
+        self.registry = main.ClientRegistry()
+
+    def test_get_client_builds_one_client_per_credential_set(self):
+        """Tests that clients are shared by calls with the same credentials."""
+        other_config = {**_CONFIG, "login_customer_id": "1234567890"}
+
+        first = self.registry.get_client(_CONFIG)
+        second = self.registry.get_client(dict(_CONFIG))
+        other = self.registry.get_client(other_config)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(self.load_from_dict.call_count, 2)
+        self.assertEqual(self.start_token_refresh.call_count, 2)
+
+    def test_get_service_reuses_services(self):
+        """Tests that each service is created once per credential set."""
+        first = self.registry.get_service(_CONFIG, "GoogleAdsService")
+        second = self.registry.get_service(_CONFIG, "GoogleAdsService")
+        other = self.registry.get_service(_CONFIG, "CustomerService")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        client = self.registry.get_client(_CONFIG)
+        self.assertEqual(
+            client.get_service.call_args_list,
+            [mock.call("GoogleAdsService"), mock.call("CustomerService")],
+        )
+
+    def test_stats_reports_hits_and_misses(self):
+        """Tests that stats() counts client lookups and cached objects."""
+        self.assertEqual(self.registry.stats()["hit_rate"], 0.0)
+
+        self.registry.get_service(_CONFIG, "GoogleAdsService")
+        self.registry.get_service(_CONFIG, "GoogleAdsService")
+        self.registry.get_client(_CONFIG)
+        self.registry.get_client({**_CONFIG, "login_customer_id": "1"})
+
+        self.assertEqual(
+            self.registry.stats(),
+            {
+                "clients": 2,
+                "services": 1,
+                "hits": 2,
+                "misses": 2,
+                "hit_rate": 0.5,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
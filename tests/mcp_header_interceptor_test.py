@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the mcp_header_interceptor module."""
+
+import unittest
+
+import grpc
+
+from ads_mcp.mcp_header_interceptor import (
+    MCPHeaderInterceptor,
+    MCPHeaderUnaryStreamAioInterceptor,
+    MCPHeaderUnaryUnaryAioInterceptor,
+)
+
+
+def _call_details():
+    return grpc.aio.ClientCallDetails(
+        method="/google.ads.googleads.v21.services.GoogleAdsService/Search",
+        timeout=None,
+        metadata=[("x-goog-api-client", "gl-python/3.12"), ("other", "1")],
+        credentials=None,
+        wait_for_ready=None,
+    )
+
+
+class TestMCPHeaderInterceptor(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the MCP header interceptors."""
+
+    async def test_aio_interceptors_add_header(self):
+        """Tests that both aio interceptors append the MCP user agent."""
+        seen = []
+
+        async def continuation(client_call_details, request):
+            seen.append(client_call_details.metadata)
+            return "call"
+
+        for interceptor, intercept in (
+            (
+                MCPHeaderUnaryUnaryAioInterceptor(),
+                "intercept_unary_unary",
+            ),
+            (
+                MCPHeaderUnaryStreamAioInterceptor(),
+                "intercept_unary_stream",
+            ),
+        ):
+            call = await getattr(interceptor, intercept)(
+                continuation, _call_details(), request=None
+            )
+            self.assertEqual(call, "call")
+
+        for metadata in seen:
+            self.assertEqual(
+                metadata[0],
+                (
+                    "x-goog-api-client",
+                    "gl-python/3.12" + MCPHeaderInterceptor._MCP_EXTRA_HEADER,
+                ),
+            )
+            self.assertEqual(metadata[1], ("other", "1"))
+
+    def test_aio_interceptors_are_distinct_types(self):
+        """Tests that each aio interceptor implements one call type.
+
+        grpc.aio channels register an interceptor for the first type it
+        implements only.
+        """
+        self.assertNotIsInstance(
+            MCPHeaderUnaryUnaryAioInterceptor(),
+            grpc.aio.UnaryStreamClientInterceptor,
+        )
+        self.assertNotIsInstance(
+            MCPHeaderUnaryStreamAioInterceptor(),
+            grpc.aio.UnaryUnaryClientInterceptor,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the metrics module."""
+
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+
+import grpc
+
+from ads_mcp import metrics
+
+
+class _RpcError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics module."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Tests that each bucket counts the values up to its bound."""
+        histogram = metrics.Histogram("h", "A histogram.", buckets=(1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        (entry,) = histogram.snapshot()
+
+        self.assertEqual(entry["buckets"], {"1": 2, "10": 3, "+Inf": 4})
+        self.assertEqual(entry["count"], 4)
+        self.assertEqual(entry["sum"], 56.5)
+
+    def test_render_prometheus(self):
+        """Tests the text exposition of counters, histograms and gauges."""
+        registry = metrics.Registry()
+        registry.counter("calls_total", "Calls.", ("tool",)).inc(tool='a"b')
+        registry.histogram("latency_seconds", "Latency.", buckets=(1,)).observe(
+            0.5
+        )
+        registry.gauge("entries", "Entries.", ("cache",), lambda: [])
+
+        text = registry.render_prometheus()
+
+        self.assertIn("# TYPE calls_total counter\n", text)
+        self.assertIn('calls_total{tool="a\\"b"} 1\n', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 1\n', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("latency_seconds_sum 0.5\n", text)
+        self.assertIn("# TYPE entries gauge\n", text)
+
+    def test_cache_stats_are_read_once_per_collection(self):
+        """Tests that the cache gauges share one stats() call."""
+        stats = mock.Mock(return_value={"entries": 3, "bytes": 10})
+        metrics.register_cache("metrics_test_cache", stats)
+        self.addCleanup(metrics._caches.pop, "metrics_test_cache")
+
+        text = metrics.registry.render_prometheus()
+
+        stats.assert_called_once()
+        self.assertIn(
+            'ads_mcp_cache_entries{cache="metrics_test_cache"} 3\n', text
+        )
+        self.assertIn(
+            'ads_mcp_cache_bytes{cache="metrics_test_cache"} 10\n', text
+        )
+
+    def test_instrument_tool_counts_rows_and_errors(self):
+        """Tests that tool results and failures are recorded."""
+
+        @metrics.instrument_tool
+        async def metrics_test_tool(fail: bool = False):
+            if fail:
+                raise _RpcError()
+            return {"rows": [{"a": 1}, {"a": 2}]}
+
+        asyncio.run(metrics_test_tool())
+        with self.assertRaises(_RpcError):
+            asyncio.run(metrics_test_tool(fail=True))
+
+        tool = "metrics_test_tool"
+        self.assertEqual(metrics.rows_returned.value(tool=tool), 2)
+        self.assertGreater(metrics.bytes_returned.value(tool=tool), 0)
+        self.assertEqual(metrics.tool_latency.count(tool=tool), 2)
+        self.assertEqual(
+            metrics.tool_errors.value(tool=tool, code="UNAVAILABLE"), 1
+        )
+
+    def test_estimate_size(self):
+        """Tests that sizes match JSON, extrapolated for long lists."""
+        small = {"rows": [{"a": 1, "b": "xy", "c": None}], "d": [1.5, True]}
+        large = {"rows": [{"id": 10000 + i} for i in range(1000)]}
+
+        self.assertEqual(metrics._estimate_size(small), len(json.dumps(small)))
+        self.assertEqual(metrics._estimate_size(large), len(json.dumps(large)))
+
+    def test_track_rpc_counts_errors_by_code(self):
+        """Tests that failed upstream calls are counted by status code."""
+        method = "MetricsTestMethod"
+        with self.assertRaises(_RpcError):
+            with metrics.track_rpc(method, customer_id="1"):
+                raise _RpcError()
+
+        self.assertEqual(
+            metrics.rpc_errors.value(method=method, code="UNAVAILABLE"), 1
+        )
+        self.assertEqual(metrics.rpc_latency.count(method=method), 1)
+
+    def test_track_rpc_excludes_paused_time(self):
+        """Tests that time spent processing streamed batches isn't timed."""
+        method = "MetricsTestPausedMethod"
+        with metrics.track_rpc(method) as call:
+            with call.paused():
+                time.sleep(0.05)
+
+        (entry,) = [
+            entry
+            for entry in metrics.rpc_latency.snapshot()
+            if entry["labels"] == {"method": method}
+        ]
+        self.assertLess(entry["sum"], 0.05)
+        self.assertGreaterEqual(call.paused_seconds, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the pagination module."""
+
+import unittest
+from unittest import mock
+
+from ads_mcp import pagination
+
+_ROWS = [{"id": i, "name": "x" * 10} for i in range(10)]
+
+
+class TestPagination(unittest.TestCase):
+    """Test cases for the pagination module."""
+
+    def setUp(self):
+        self.store = pagination.CursorStore()
+
+    def test_fits_budget(self):
+        """Tests that a result within budget has no cursor."""
+        page = pagination.paginate(_ROWS, max_rows=10, store=self.store)
+
+        self.assertEqual(page, {"rows": _ROWS, "next_cursor": None})
+
+    def test_row_budget(self):
+        """Tests paging through a result by rows."""
+        page = pagination.paginate(_ROWS, max_rows=4, store=self.store)
+        pages = [page["rows"]]
+        while page["next_cursor"]:
+            page = pagination.next_page(
+                page["next_cursor"], max_rows=4, store=self.store
+            )
+            pages.append(page["rows"])
+
+        self.assertEqual([len(rows) for rows in pages], [4, 4, 2])
+        self.assertEqual(sum(pages, []), _ROWS)
+
+    def test_byte_budget(self):
+        """Tests that the byte budget limits a page but never empties it."""
+        page = pagination.paginate(_ROWS, max_bytes=70, store=self.store)
+        self.assertEqual(len(page["rows"]), 2)
+
+        page = pagination.paginate(_ROWS, max_bytes=1, store=self.store)
+        self.assertEqual(len(page["rows"]), 1)
+
+    def test_cursor_is_single_use(self):
+        """Tests that a cursor can't be used twice."""
+        page = pagination.paginate(_ROWS, max_rows=4, store=self.store)
+        pagination.next_page(page["next_cursor"], store=self.store)
+
+        with self.assertRaises(ValueError):
+            pagination.next_page(page["next_cursor"], store=self.store)
+
+    def test_cursor_expires(self):
+        """Tests that cursors expire after their TTL."""
+        store = pagination.CursorStore(ttl_seconds=10)
+        with mock.patch("time.monotonic", return_value=100.0):
+            cursor = store.put(_ROWS, 5)
+        with mock.patch("time.monotonic", return_value=111.0):
+            with self.assertRaises(ValueError):
+                store.pop(cursor)
+
+    def test_max_cursors(self):
+        """Tests that the oldest cursors are dropped first."""
+        store = pagination.CursorStore(max_cursors=2)
+        first = store.put(_ROWS, 1)
+        store.put(_ROWS, 2)
+        store.put(_ROWS, 3)
+
+        with self.assertRaises(ValueError):
+            store.pop(first)
+
+    def test_max_bytes(self):
+        """Tests that the oldest cursors are dropped once over the bytes."""
+        store = pagination.CursorStore(max_bytes=100)
+        first = store.put(_ROWS, 1, size=60)
+        second = store.put(_ROWS, 2, size=60)
+        store.pop(second)
+        third = store.put(_ROWS, 3, size=60)
+        fourth = store.put(_ROWS, 4, size=60)
+
+        self.assertEqual(store.pop(fourth), (_ROWS, 4))
+        for cursor in (first, third):
+            with self.assertRaises(ValueError):
+                store.pop(cursor)
@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the rate_limiter module."""
+
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from ads_mcp import rate_limiter
+from ads_mcp.rate_limiter import Priority
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the rate_limiter module."""
+
+    async def test_burst_is_not_delayed(self):
+        """Tests that calls within the burst are sent right away."""
+        bucket = rate_limiter.TokenBucket(rate=0.001, burst=3)
+        for _ in range(3):
+            await asyncio.wait_for(bucket.acquire(), timeout=1)
+        self.assertLess(bucket.tokens, 1)
+
+    async def test_waiters_are_served_by_priority(self):
+        """Tests that queued interactive calls go before background ones."""
+        bucket = rate_limiter.TokenBucket(rate=100, burst=1)
+        await bucket.acquire()
+        served = []
+
+        async def call(name, priority):
+            await bucket.acquire(priority)
+            served.append(name)
+
+        await asyncio.gather(
+            call("background", Priority.BACKGROUND),
+            call("interactive", Priority.INTERACTIVE),
+        )
+
+        self.assertEqual(served, ["interactive", "background"])
+
+    async def test_cancelled_waiter_is_skipped(self):
+        """Tests that a cancelled call doesn't take a token."""
+        bucket = rate_limiter.TokenBucket(rate=100, burst=1)
+        await bucket.acquire()
+        cancelled = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(bucket.acquire(), timeout=1)
+
+        self.assertEqual(bucket.queued, 0)
+
+    async def test_customers_have_separate_buckets(self):
+        """Tests that one busy customer doesn't hold up another."""
+        limiter = rate_limiter.RateLimiter(
+            developer_token_qps=100,
+            developer_token_burst=100,
+            customer_qps=0.001,
+            customer_burst=1,
+        )
+        await limiter.acquire("token", "1")
+        await asyncio.wait_for(limiter.acquire("token", "2"), timeout=1)
+
+        status = limiter.status()
+        self.assertEqual(sorted(status["customers"]), ["1", "2"])
+        self.assertEqual(
+            status["developer_tokens"]["...oken"]["calls_today"], 2
+        )
+
+    async def test_daily_budget(self):
+        """Tests that calls fail fast once the daily budget is spent."""
+        limiter = rate_limiter.RateLimiter(daily_calls=1)
+        await limiter.acquire("token")
+
+        with self.assertRaises(rate_limiter.QuotaExceededError):
+            await limiter.acquire("token")
+
+    async def test_rates_must_be_positive(self):
+        """Tests that a zero QPS is rejected when the limiter is created."""
+        with self.assertRaises(ValueError):
+            rate_limiter.RateLimiter(customer_qps=0)
+        with self.assertRaises(ValueError):
+            rate_limiter.TokenBucket(rate=0, burst=1)
+
+    async def test_throttle_reads_the_developer_token_once(self):
+        """Tests that the client is looked up on the first call only."""
+        client = types.SimpleNamespace(developer_token="token")
+        with (
+            mock.patch.object(rate_limiter, "_developer_token", None),
+            mock.patch.object(
+                rate_limiter, "limiter", rate_limiter.RateLimiter()
+            ) as limiter,
+            mock.patch(
+                "ads_mcp.utils.get_googleads_client", return_value=client
+            ) as get_client,
+        ):
+            await rate_limiter.throttle("1")
+            await rate_limiter.throttle("2")
+
+            get_client.assert_called_once()
+            self.assertIn("...oken", limiter.status()["developer_tokens"])
+
+
+if __name__ == "__main__":
+    unittest.main()
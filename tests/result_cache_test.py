@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the result_cache module."""
+
+import unittest
+from unittest import mock
+
+from ads_mcp import result_cache
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the result_cache module."""
+
+    def test_hit_and_miss(self):
+        """Tests that hits and misses are counted."""
+        cache = result_cache.ResultCache(max_bytes=100)
+        cache.put("a", [1], ttl=60, size=10)
+
+        self.assertEqual(cache.get("a"), [1])
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_expiry(self):
+        """Tests that entries expire after their TTL."""
+        cache = result_cache.ResultCache(max_bytes=100)
+        with mock.patch("time.monotonic", return_value=100.0):
+            cache.put("a", [1], ttl=10, size=10)
+        with mock.patch("time.monotonic", return_value=110.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_lru_eviction_by_size(self):
+        """Tests that the least recently used entries are evicted first."""
+        cache = result_cache.ResultCache(max_bytes=30)
+        cache.put("a", "a", ttl=60, size=10)
+        cache.put("b", "b", ttl=60, size=10)
+        cache.put("c", "c", ttl=60, size=10)
+        cache.get("a")
+        cache.put("d", "d", ttl=60, size=10)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "a")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_age(self):
+        """Tests that the age of entries is reported."""
+        cache = result_cache.ResultCache(max_bytes=100)
+        with mock.patch("time.monotonic", return_value=100.0):
+            cache.put("a", [1], ttl=60, size=10)
+        with mock.patch("time.monotonic", return_value=130.0):
+            self.assertEqual(cache.age("a"), 30.0)
+            self.assertIsNone(cache.age("b"))
+            self.assertEqual(cache.stats()["oldest_age_seconds"], 30.0)
+
+    def test_oversized_values_are_not_cached(self):
+        """Tests that values over the size cap are skipped."""
+        cache = result_cache.ResultCache(max_bytes=10)
+        cache.put("a", "a", ttl=60, size=11)
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_ttl_for(self):
+        """Tests that metrics and volatile resources get the short TTL."""
+        self.assertEqual(
+            result_cache.ttl_for("campaign", ["campaign.name"]),
+            result_cache.METADATA_TTL_SECONDS,
+        )
+        self.assertEqual(
+            result_cache.ttl_for("campaign", ["metrics.clicks"]),
+            result_cache.METRICS_TTL_SECONDS,
+        )
+        self.assertEqual(
+            result_cache.ttl_for(
+                "change_event", ["change_event.resource_name"]
+            ),
+            result_cache.METRICS_TTL_SECONDS,
+        )
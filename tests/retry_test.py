@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the retry module."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions as api_exceptions
+
+from ads_mcp import retry
+
+
+def _policy(**kwargs):
+    return retry.RetryPolicy(
+        max_attempts=kwargs.pop("max_attempts", 3),
+        initial_backoff=0,
+        max_backoff=0,
+        **kwargs,
+    )
+
+
+class TestRetry(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the retry module."""
+
+    async def test_transient_errors_are_retried(self):
+        """Tests that UNAVAILABLE is retried until the call succeeds."""
+        fn = mock.AsyncMock(
+            side_effect=[api_exceptions.ServiceUnavailable("down"), "ok"]
+        )
+
+        self.assertEqual(await _policy().run(fn), "ok")
+        self.assertEqual(fn.call_count, 2)
+
+    async def test_other_errors_are_not_retried(self):
+        """Tests that errors such as INVALID_ARGUMENT fail right away."""
+        fn = mock.AsyncMock(side_effect=api_exceptions.InvalidArgument("bad"))
+
+        with self.assertRaises(api_exceptions.InvalidArgument):
+            await _policy().run(fn)
+        fn.assert_called_once()
+
+    async def test_attempts_are_bounded(self):
+        """Tests that the last error is raised once attempts are spent."""
+        fn = mock.AsyncMock(side_effect=api_exceptions.InternalServerError(""))
+
+        with self.assertRaises(api_exceptions.InternalServerError):
+            await _policy(max_attempts=3).run(fn)
+        self.assertEqual(fn.call_count, 3)
+
+    def test_retry_budget(self):
+        """Tests that retries stop once the budget is spent."""
+        budget = retry.RetryBudget(ratio=0.5, max_tokens=1)
+        fn = mock.Mock(side_effect=api_exceptions.DeadlineExceeded(""))
+        policy = _policy(max_attempts=10, budget=budget)
+
+        with self.assertRaises(api_exceptions.DeadlineExceeded):
+            policy.run_sync(fn)
+        self.assertEqual(fn.call_count, 2)
+
+    async def test_hedged_returns_first_answer(self):
+        """Tests that a slow first call is overtaken by the hedged one."""
+        calls = []
+
+        async def fn():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+                return "slow"
+            return "fast"
+
+        self.assertEqual(await retry.hedged(fn, delay=0.01), "fast")
+        self.assertEqual(len(calls), 2)
+
+    async def test_hedged_without_delay_calls_once(self):
+        """Tests that hedging is off by default."""
+        fn = mock.AsyncMock(return_value="ok")
+
+        self.assertEqual(await retry.hedged(fn, delay=0), "ok")
+        fn.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the schema tools module."""
+
+import unittest
+
+from ads_mcp.tools import schema, search
+
+
+class TestSchema(unittest.TestCase):
+    """Test cases for the schema tools module."""
+
+    def test_list_resources(self):
+        """Tests that resources from gaql_resources.json are listed."""
+        resources = schema.list_resources()
+
+        self.assertIn("campaign", resources)
+        self.assertIn("metrics", resources)
+
+    def test_describe_resource_filters_attributes(self):
+        """Tests that only the requested field lists are returned."""
+        description = schema.describe_resource("campaign", ["filterable"])
+
+        self.assertEqual(list(description), ["filterable"])
+        self.assertIn("campaign.status", description["filterable"])
+
+    def test_describe_resource_unknown_resource(self):
+        """Tests that an unknown resource raises a ValueError."""
+        with self.assertRaises(ValueError):
+            schema.describe_resource("not_a_resource")
+
+    def test_search_description_is_compact(self):
+        """Tests that the field table is no longer inlined in the description."""
+        description = search._search_tool_description()
+
+        self.assertNotIn("accessible_bidding_strategy", description)
+        self.assertLess(len(description), 10_000)
@@ -0,0 +1,662 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the search tool module."""
+
+import asyncio
+import json
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions as api_exceptions
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp import daily_store
+from ads_mcp import metrics
+from ads_mcp import pagination
+from ads_mcp import result_cache
+from ads_mcp import retry
+from ads_mcp.tools import search
+
+_FIELDS = ["campaign.id", "campaign.name"]
+
+
+def _batch(*rows):
+    """Returns a fake search_stream batch for (id, name) tuples."""
+    return types.SimpleNamespace(
+        field_mask=types.SimpleNamespace(paths=_FIELDS),
+        results=[
+            GoogleAdsRow(campaign={"id": row_id, "name": name})
+            for row_id, name in rows
+        ],
+    )
+
+
+class _Stream:
+    """A fake grpc.aio search_stream call yielding `batches`."""
+
+    def __init__(self, batches):
+        self._batches = batches
+        self.cancelled = False
+
+    async def __aiter__(self):
+        for batch in self._batches:
+            yield batch
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestSearch(unittest.TestCase):
+    """Test cases for the search tool module."""
+
+    def setUp(self):
+        self.ga_service = mock.Mock()
+        self.ga_service.search_stream = mock.AsyncMock(
+            return_value=_Stream([_batch((1, "a"), (2, "b")), _batch((3, "c"))])
+        )
+        patcher = mock.patch(
+            "ads_mcp.utils.get_googleads_async_service",
+            new=mock.AsyncMock(return_value=self.ga_service),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("ads_mcp.rate_limiter.throttle")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(search, "_identity", "identity")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        result_cache.search_results.clear()
+
+    def test_build_query(self):
+        """Tests that all clauses are included in the query."""
+        self.assertEqual(
+            search._build_query(
+                _FIELDS,
+                "campaign",
+                ["campaign.id > 1", "campaign.status = 'ENABLED'"],
+                ["campaign.name DESC"],
+                5,
+            ),
+            "SELECT campaign.id,campaign.name FROM campaign"
+            " WHERE campaign.id > 1 AND campaign.status = 'ENABLED'"
+            " ORDER BY campaign.name DESC LIMIT 5",
+        )
+
+    def test_search_returns_all_rows(self):
+        """Tests that rows from every batch are returned."""
+        output = asyncio.run(search.search("123", _FIELDS, "campaign"))
+
+        self.assertIsNone(output["next_cursor"])
+        self.assertEqual(
+            output["rows"],
+            [
+                {"campaign.id": 1, "campaign.name": "a"},
+                {"campaign.id": 2, "campaign.name": "b"},
+                {"campaign.id": 3, "campaign.name": "c"},
+            ],
+        )
+        self.ga_service.search_stream.assert_called_once_with(
+            customer_id="123",
+            query="SELECT campaign.id,campaign.name FROM campaign",
+        )
+
+    def test_search_columns_output_format(self):
+        """Tests that the columns output format merges every batch."""
+        output = asyncio.run(
+            search.search("123", _FIELDS, "campaign", output_format="columns")
+        )
+
+        self.assertEqual(output["row_count"], 3)
+        self.assertEqual(
+            output["columns"],
+            {"campaign.id": [1, 2, 3], "campaign.name": ["a", "b", "c"]},
+        )
+
+    def test_search_unknown_output_format(self):
+        """Tests that an unknown output format is rejected."""
+        with self.assertRaises(ValueError):
+            asyncio.run(
+                search.search("123", _FIELDS, "campaign", output_format="xml")
+            )
+
+    def test_search_streams_batches_as_progress(self):
+        """Tests that each batch is sent as a progress notification."""
+        ctx = mock.Mock()
+        ctx.request_context.meta.progressToken = "token"
+        ctx.report_progress = mock.AsyncMock()
+
+        output = asyncio.run(
+            search.search("123", _FIELDS, "campaign", stream=True, ctx=ctx)
+        )
+
+        self.assertEqual(output["rows"], [])
+        progress = [call.args[0] for call in ctx.report_progress.call_args_list]
+        self.assertEqual(progress, [2, 3])
+        last_batch = ctx.report_progress.call_args.kwargs["message"]
+        self.assertEqual(
+            json.loads(last_batch), [{"campaign.id": 3, "campaign.name": "c"}]
+        )
+
+    def test_search_without_progress_token_returns_rows(self):
+        """Tests that streaming falls back to returning rows."""
+        ctx = mock.Mock()
+        ctx.request_context.meta = None
+
+        output = asyncio.run(
+            search.search("123", _FIELDS, "campaign", stream=True, ctx=ctx)
+        )
+
+        self.assertEqual(len(output["rows"]), 3)
+
+    def test_search_reuses_cached_result(self):
+        """Tests that a repeated search is served from the cache."""
+        first = asyncio.run(search.search("123", _FIELDS, "campaign"))
+        second = asyncio.run(search.search("123", _FIELDS, "campaign"))
+        asyncio.run(search.search("123", _FIELDS, "campaign", use_cache=False))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.ga_service.search_stream.call_count, 2)
+
+    def test_cached_results_are_not_shared_across_identities(self):
+        """Tests that a search as another identity isn't served the cache."""
+        asyncio.run(search.search("123", _FIELDS, "campaign"))
+
+        with mock.patch.object(search, "_identity", "other identity"):
+            asyncio.run(search.search("123", _FIELDS, "campaign"))
+
+        self.assertEqual(self.ga_service.search_stream.call_count, 2)
+
+    def test_concurrent_searches_are_coalesced(self):
+        """Tests that concurrent identical searches share one upstream call."""
+
+        async def run():
+            return await asyncio.gather(
+                search.search("123", _FIELDS, "campaign"),
+                search.search("123", list(reversed(_FIELDS)), "campaign"),
+            )
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first["rows"], second["rows"])
+        self.ga_service.search_stream.assert_called_once()
+
+    def test_search_reads_at_most_max_fetch_rows(self):
+        """Tests that rows beyond MAX_FETCH_ROWS are left out and reported."""
+        read = []
+
+        class CountingStream(_Stream):
+            async def __aiter__(self):
+                for batch in self._batches:
+                    read.append(batch)
+                    yield batch
+
+        for output_format in ("rows", "columns"):
+            read.clear()
+            self.ga_service.search_stream.return_value = CountingStream(
+                [_batch((1, "a"), (2, "b")), _batch((3, "c"))]
+            )
+            with (
+                self.subTest(output_format=output_format),
+                mock.patch.object(pagination, "MAX_FETCH_ROWS", 1),
+            ):
+                output = asyncio.run(
+                    search.search(
+                        "123",
+                        _FIELDS,
+                        "campaign",
+                        output_format=output_format,
+                        use_cache=False,
+                    )
+                )
+
+                self.assertTrue(output["truncated"])
+                if output_format == "rows":
+                    self.assertEqual(
+                        output["rows"],
+                        [{"campaign.id": 1, "campaign.name": "a"}],
+                    )
+                else:
+                    self.assertEqual(output["columns"]["campaign.id"], [1])
+                self.assertEqual(len(read), 1)
+
+    def test_search_pages_with_cursor(self):
+        """Tests that rows over the budget are returned by search_next_page."""
+        output = asyncio.run(
+            search.search("123", _FIELDS, "campaign", max_rows=2)
+        )
+        self.assertEqual(len(output["rows"]), 2)
+
+        output = search.search_next_page(output["next_cursor"])
+
+        self.assertEqual(
+            output["rows"], [{"campaign.id": 3, "campaign.name": "c"}]
+        )
+        self.assertIsNone(output["next_cursor"])
+        self.ga_service.search_stream.assert_called_once()
+
+    def test_search_many_merges_rows_with_customer_id(self):
+        """Tests that rows of every customer are merged in customer order."""
+        output = asyncio.run(
+            search.search_many(["1", "2", "1"], _FIELDS, "campaign")
+        )
+
+        self.assertEqual(len(output["rows"]), 6)
+        self.assertEqual(
+            output["rows"][0],
+            {"customer_id": "1", "campaign.id": 1, "campaign.name": "a"},
+        )
+        self.assertEqual(output["rows"][3]["customer_id"], "2")
+        self.assertEqual(output["errors"], [])
+        self.assertEqual(self.ga_service.search_stream.call_count, 2)
+
+    def test_search_many_isolates_customer_errors(self):
+        """Tests that a failed customer is reported without failing others."""
+        stream = self.ga_service.search_stream.return_value
+
+        async def search_stream(customer_id, query):
+            if customer_id == "2":
+                raise RuntimeError("permission denied")
+            return stream
+
+        self.ga_service.search_stream.side_effect = search_stream
+
+        output = asyncio.run(
+            search.search_many(["1", "2"], _FIELDS, "campaign")
+        )
+
+        self.assertEqual(len(output["rows"]), 3)
+        self.assertEqual(
+            output["errors"],
+            [{"customer_id": "2", "error": "permission denied"}],
+        )
+
+    def test_search_many_aggregates_metrics(self):
+        """Tests that counts are summed, ratios recomputed, others dropped."""
+        fields = [
+            "campaign.name",
+            "metrics.clicks",
+            "metrics.ctr",
+            "metrics.speed_score",
+        ]
+        self.ga_service.search_stream.return_value = _Stream(
+            [
+                types.SimpleNamespace(
+                    field_mask=types.SimpleNamespace(
+                        paths=[*fields, "metrics.impressions"]
+                    ),
+                    results=[
+                        GoogleAdsRow(
+                            campaign={"name": "a"},
+                            metrics={
+                                "clicks": 2,
+                                "ctr": 0.5,
+                                "speed_score": 7,
+                                "impressions": 8,
+                            },
+                        )
+                    ],
+                )
+            ]
+        )
+
+        output = asyncio.run(
+            search.search_many(["1", "2"], fields, "campaign", aggregate=True)
+        )
+
+        self.assertEqual(
+            output["rows"],
+            [
+                {
+                    "campaign.name": "a",
+                    "metrics.clicks": 4,
+                    "metrics.ctr": 0.25,
+                }
+            ],
+        )
+        self.assertEqual(output["dropped_metrics"], ["metrics.speed_score"])
+        (query,) = {
+            c.kwargs["query"]
+            for c in self.ga_service.search_stream.call_args_list
+        }
+        self.assertIn("metrics.impressions", query)
+
+    def test_search_aggregate_returns_groups_only(self):
+        """Tests that only the aggregate table of the rows is returned."""
+        fields = ["campaign.id", "metrics.clicks", "metrics.impressions"]
+        self.ga_service.search_stream.return_value = _Stream(
+            [
+                types.SimpleNamespace(
+                    field_mask=types.SimpleNamespace(paths=fields),
+                    results=[
+                        GoogleAdsRow(
+                            campaign={"id": 1},
+                            metrics={"clicks": clicks, "impressions": 10},
+                        )
+                        for clicks in (1, 3)
+                    ],
+                )
+            ]
+        )
+
+        output = asyncio.run(
+            search.search_aggregate(
+                "123",
+                "campaign",
+                ["sum(metrics.clicks)", "metrics.ctr"],
+                group_by=["campaign.id"],
+            )
+        )
+
+        self.assertEqual(
+            output,
+            {
+                "rows": [
+                    {
+                        "campaign.id": 1,
+                        "sum(metrics.clicks)": 4,
+                        "metrics.ctr": 0.2,
+                    }
+                ],
+                "input_rows": 2,
+            },
+        )
+        self.ga_service.search_stream.assert_called_once_with(
+            customer_id="123",
+            query="SELECT campaign.id,metrics.clicks,metrics.impressions "
+            "FROM campaign",
+        )
+
+    def test_long_date_range_is_split_into_cached_chunks(self):
+        """Tests that month chunks are merged in order and reused later."""
+        fields = ["segments.date", "metrics.clicks"]
+
+        def stream(customer_id, query, **kwargs):
+            start = query.split("'")[1]
+            return _Stream(
+                [
+                    types.SimpleNamespace(
+                        field_mask=types.SimpleNamespace(paths=fields),
+                        results=[
+                            GoogleAdsRow(
+                                segments={"date": start}, metrics={"clicks": 1}
+                            )
+                        ],
+                    )
+                ]
+            )
+
+        self.ga_service.search_stream.side_effect = stream
+        output = asyncio.run(
+            search.search(
+                "123",
+                fields,
+                "customer",
+                ["segments.date BETWEEN '2025-01-10' AND '2025-03-05'"],
+            )
+        )
+
+        self.assertEqual(
+            [row["segments.date"] for row in output["rows"]],
+            ["2025-01-10", "2025-02-01", "2025-03-01"],
+        )
+        self.assertEqual(self.ga_service.search_stream.call_count, 3)
+
+        asyncio.run(
+            search.search(
+                "123",
+                fields,
+                "customer",
+                ["segments.date BETWEEN '2025-02-01' AND '2025-03-31'"],
+            )
+        )
+        # February is cached, only March is searched again.
+        self.assertEqual(self.ga_service.search_stream.call_count, 4)
+
+    def test_closed_days_are_served_from_daily_store(self):
+        """Tests that only the days missing from the store are searched."""
+        fields = ["segments.date", "metrics.clicks"]
+        searched = []
+
+        def stream(customer_id, query, **kwargs):
+            start, end = query.split("'")[1:4:2]
+            searched.append((start, end))
+            return _Stream(
+                [
+                    types.SimpleNamespace(
+                        field_mask=types.SimpleNamespace(paths=fields),
+                        results=[
+                            GoogleAdsRow(
+                                segments={"date": day}, metrics={"clicks": 1}
+                            )
+                            for day in sorted({start, end})
+                        ],
+                    )
+                ]
+            )
+
+        self.ga_service.search_stream.side_effect = stream
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch(
+            "ads_mcp.daily_store.store",
+            daily_store.DailyStore(directory.name, lag_days=30),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def search_days(start, end, use_cache=True):
+            output = asyncio.run(
+                search.search(
+                    "123",
+                    fields,
+                    "customer",
+                    [f"segments.date BETWEEN '{start}' AND '{end}'"],
+                    ["segments.date DESC"],
+                    use_cache=use_cache,
+                )
+            )
+            return [row["segments.date"] for row in output["rows"]]
+
+        self.assertEqual(
+            search_days("2020-01-30", "2020-02-02"),
+            ["2020-02-02", "2020-02-01", "2020-01-31", "2020-01-30"],
+        )
+        self.assertEqual(
+            searched,
+            [("2020-02-01", "2020-02-02"), ("2020-01-30", "2020-01-31")],
+        )
+        searched.clear()
+
+        self.assertEqual(
+            search_days("2020-01-29", "2020-02-01"),
+            ["2020-02-01", "2020-01-31", "2020-01-30", "2020-01-29"],
+        )
+        self.assertEqual(searched, [("2020-01-29", "2020-01-29")])
+        searched.clear()
+
+        search_days("2020-01-29", "2020-02-01", use_cache=False)
+        self.assertEqual(
+            searched,
+            [("2020-02-01", "2020-02-01"), ("2020-01-29", "2020-01-31")],
+        )
+
+    def test_failed_ordered_stream_resumes_without_duplicates(self):
+        """Tests that rows yielded before a transient error aren't repeated."""
+
+        class FailingStream(_Stream):
+            async def __aiter__(self):
+                yield _batch((1, "a"), (2, "b"))
+                raise api_exceptions.ServiceUnavailable("stream reset")
+
+        self.ga_service.search_stream.side_effect = [
+            FailingStream([]),
+            _Stream([_batch((1, "a")), _batch((2, "b"), (3, "c"))]),
+        ]
+
+        with mock.patch.object(retry.policy, "initial_backoff", 0):
+            output = asyncio.run(
+                search.search(
+                    "123", _FIELDS, "campaign", orderings=["campaign.id"]
+                )
+            )
+
+        self.assertEqual(
+            [row["campaign.id"] for row in output["rows"]], [1, 2, 3]
+        )
+        self.assertEqual(self.ga_service.search_stream.call_count, 2)
+
+    def test_failed_unordered_stream_restarts(self):
+        """Tests that rows of an unordered search are fetched again."""
+
+        class FailingStream(_Stream):
+            async def __aiter__(self):
+                yield _batch((1, "a"), (2, "b"))
+                raise api_exceptions.ServiceUnavailable("stream reset")
+
+        self.ga_service.search_stream.side_effect = lambda **kwargs: next(
+            streams
+        )
+
+        for output_format in ("rows", "columns"):
+            with self.subTest(output_format=output_format):
+                streams = iter(
+                    [FailingStream([]), _Stream([_batch((3, "c"), (1, "a"))])]
+                )
+                with mock.patch.object(retry.policy, "initial_backoff", 0):
+                    output = asyncio.run(
+                        search.search(
+                            "123",
+                            _FIELDS,
+                            "campaign",
+                            output_format=output_format,
+                            use_cache=False,
+                        )
+                    )
+
+                ids = (
+                    [row["campaign.id"] for row in output["rows"]]
+                    if output_format == "rows"
+                    else output["columns"]["campaign.id"]
+                )
+                self.assertEqual(ids, [3, 1])
+
+    def test_failed_unordered_stream_fails_when_streamed(self):
+        """Tests that streamed rows aren't followed by a different order."""
+
+        class FailingStream(_Stream):
+            async def __aiter__(self):
+                yield _batch((1, "a"))
+                raise api_exceptions.ServiceUnavailable("stream reset")
+
+        self.ga_service.search_stream.return_value = FailingStream([])
+        ctx = mock.Mock()
+        ctx.request_context.meta.progressToken = "token"
+        ctx.report_progress = mock.AsyncMock()
+
+        with self.assertRaises(api_exceptions.ServiceUnavailable):
+            asyncio.run(
+                search.search("123", _FIELDS, "campaign", stream=True, ctx=ctx)
+            )
+        self.ga_service.search_stream.assert_called_once()
+
+    def test_search_times_out(self):
+        """Tests that a search past its timeout fails and is counted."""
+
+        class SlowStream(_Stream):
+            async def __aiter__(self):
+                await asyncio.sleep(10)
+                yield _batch((1, "a"))
+
+        stream = SlowStream([])
+        self.ga_service.search_stream.return_value = stream
+        timed_out = metrics.calls_timed_out.value(tool="search")
+
+        async def run():
+            with self.assertRaises(TimeoutError):
+                await search.search("123", _FIELDS, "campaign", timeout=0.01)
+            # Lets the shared fetch task see the cancellation.
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        self.ga_service.search_stream.assert_called_once()
+        self.assertTrue(stream.cancelled)
+        self.assertEqual(
+            metrics.calls_timed_out.value(tool="search"), timed_out + 1
+        )
+
+    def test_shared_search_keeps_each_callers_timeout(self):
+        """Tests that a coalesced search outlives the first caller's timeout."""
+
+        class SlowStream(_Stream):
+            async def __aiter__(self):
+                await asyncio.sleep(0.05)
+                yield _batch((1, "a"))
+
+        self.ga_service.search_stream.return_value = SlowStream([])
+
+        async def run():
+            return await asyncio.gather(
+                search.search("123", _FIELDS, "campaign", timeout=0.01),
+                search.search("123", _FIELDS, "campaign", timeout=5),
+                return_exceptions=True,
+            )
+
+        first, second = asyncio.run(run())
+
+        self.assertIsInstance(first, TimeoutError)
+        self.assertEqual(
+            second["rows"], [{"campaign.id": 1, "campaign.name": "a"}]
+        )
+        self.ga_service.search_stream.assert_called_once()
+
+    def test_cancelled_search_cancels_stream(self):
+        """Tests that cancelling the tool call cancels the upstream stream."""
+        reading = asyncio.Event()
+
+        class SlowStream(_Stream):
+            async def __aiter__(self):
+                reading.set()
+                await asyncio.sleep(10)
+                yield _batch((1, "a"))
+
+        stream = SlowStream([])
+        self.ga_service.search_stream.return_value = stream
+        cancelled = metrics.calls_cancelled.value(tool="search")
+
+        async def run():
+            task = asyncio.ensure_future(
+                search.search("123", _FIELDS, "campaign")
+            )
+            await reading.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # Lets the shared fetch task see the cancellation.
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        self.assertTrue(stream.cancelled)
+        self.assertEqual(
+            metrics.calls_cancelled.value(tool="search"), cancelled + 1
+        )
@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the singleflight module."""
+
+import asyncio
+import unittest
+
+from ads_mcp import singleflight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the singleflight module."""
+
+    async def test_concurrent_calls_are_shared(self):
+        """Tests that concurrent calls with the same key run once."""
+        group = singleflight.SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(
+            *(group.do("key", fetch) for _ in range(5))
+        )
+
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(
+            group.stats(), {"in_flight": 0, "started": 1, "shared": 4}
+        )
+
+        self.assertEqual(await group.do("key", fetch), 2)
+
+    async def test_exceptions_are_shared(self):
+        """Tests that every caller sees the exception of the shared call."""
+        group = singleflight.SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            group.do("key", fail), group.do("key", fail), return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    async def test_cancelled_caller_does_not_cancel_call(self):
+        """Tests that other callers still get the result."""
+        group = singleflight.SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(group.do("key", fetch))
+        second = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "done")
+
+    async def test_call_is_cancelled_with_last_caller(self):
+        """Tests that the call stops once no caller waits for it."""
+        group = singleflight.SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(group.do("key", fetch))
+        await started.wait()
+        caller.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
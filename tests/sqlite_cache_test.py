@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the sqlite_cache module."""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+import zlib
+
+from ads_mcp import sqlite_cache
+
+_ROWS = [
+    {"campaign.id": i, "campaign.name": f"Campaign {i}"} for i in range(50)
+]
+
+
+class TestSqliteCache(unittest.TestCase):
+    """Test cases for the sqlite_cache module."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "results.db")
+
+    def _cache(self, max_bytes=1_000_000):
+        return sqlite_cache.SqliteResultCache(self.path, max_bytes)
+
+    def test_entries_are_shared_through_the_file(self):
+        """Tests that a second instance, e.g. another worker, sees entries."""
+        self._cache().put(("123", "digest", "rows"), _ROWS, ttl=60, size=0)
+
+        cache = self._cache()
+
+        self.assertEqual(cache.get(("123", "digest", "rows")), _ROWS)
+        self.assertIsNone(cache.get(("123", "other", "rows")))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"]), (1, 1))
+        self.assertLess(stats["bytes"], len(repr(_ROWS)))
+
+    def test_values_are_compressed(self):
+        """Tests that values are stored as zlib compressed JSON."""
+        self._cache().put("key", _ROWS, ttl=60, size=0)
+
+        with sqlite3.connect(self.path) as connection:
+            (blob,) = connection.execute("SELECT value FROM entries").fetchone()
+
+        self.assertTrue(zlib.decompress(blob).startswith(b'[{"campaign.id"'))
+
+    def test_expired_entries_are_misses(self):
+        """Tests that an entry isn't returned after its time to live."""
+        cache = self._cache()
+        cache.put("key", _ROWS, ttl=-1, size=0)
+        cache.put("expired", _ROWS, ttl=1e-9, size=0)
+
+        self.assertIsNone(cache.get("key"))
+        self.assertIsNone(cache.get("expired"))
+        self.assertIsNone(cache.age("expired"))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Tests that the database stays within its size bound."""
+        cache = self._cache()
+        cache.put("size", _ROWS, ttl=60, size=0)
+        entry_size = cache.stats()["bytes"]
+        cache = self._cache(max_bytes=entry_size * 2)
+        cache.put("second", _ROWS, ttl=60, size=0)
+        cache.get("size")
+
+        cache.put("third", _ROWS, ttl=60, size=0)
+
+        self.assertIsNotNone(cache.get("size"))
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("third"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_database_errors_are_logged(self):
+        """Tests that stats and clear don't fail if the database is broken."""
+        cache = self._cache()
+        cache.put("key", _ROWS, ttl=60, size=0)
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("DROP TABLE entries")
+
+        with self.assertLogs(level="WARNING"):
+            cache.clear()
+            stats = cache.stats()
+
+        self.assertIsNone(stats["entries"])
+        self.assertIsNone(cache.get("key"))
+
+    def test_async_methods_run_in_worker_threads(self):
+        """Tests that get_async and put_async don't run on the event loop."""
+        cache = self._cache()
+        threads = []
+        get = cache.get
+
+        def record_thread(key):
+            threads.append(threading.get_ident())
+            return get(key)
+
+        cache.get = record_thread
+
+        async def run():
+            await cache.put_async("key", _ROWS, ttl=60, size=0)
+            return await cache.get_async("key")
+
+        self.assertEqual(asyncio.run(run()), _ROWS)
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the status tool module."""
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from ads_mcp import result_cache
+from ads_mcp.tools import status
+
+
+class TestStatus(unittest.TestCase):
+    """Test cases for the status tool module."""
+
+    def test_cache_stats_are_read_off_the_event_loop(self):
+        """Tests that the result cache, maybe on disk, is read in a thread."""
+        threads = []
+
+        def stats():
+            threads.append(threading.get_ident())
+            return {"entries": 0}
+
+        with mock.patch.object(result_cache.search_results, "stats", stats):
+            output = asyncio.run(status.cache_stats())
+
+        self.assertEqual(output["search_results"], {"entries": 0})
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
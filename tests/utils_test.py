@@ -14,10 +14,15 @@
 
 """Test cases for the utils module."""
 
+import asyncio
 import unittest
+from unittest import mock
 from google.ads.googleads.v21.enums.types.campaign_status import (
     CampaignStatusEnum,
 )
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
 
 from ads_mcp import utils
 
@@ -28,10 +33,107 @@ class TestUtils(unittest.TestCase):
     def test_format_output_value(self):
         """Tests that output values are formatted correctly."""
 
-        client = utils.get_googleads_client()
         self.assertEqual(
             utils.format_output_value(
                 CampaignStatusEnum.CampaignStatus.ENABLED
             ),
             "ENABLED",
         )
+
+    def test_get_googleads_client_is_lazy(self):
+        """Tests that the client is created once, on first use."""
+        with (
+            mock.patch.object(utils, "_googleads_client", None),
+            mock.patch.object(utils, "_get_googleads_client") as create,
+        ):
+            first = utils.get_googleads_client()
+            second = utils.get_googleads_client()
+
+        create.assert_called_once()
+        self.assertIs(first, second)
+
+    def test_get_googleads_service_is_memoized(self):
+        """Tests that service clients are reused per name and version."""
+        client = mock.Mock()
+        client.get_service.side_effect = lambda *args, **kwargs: mock.Mock()
+        with (
+            mock.patch.object(utils, "_googleads_client", client),
+            mock.patch.dict(utils._services, clear=True),
+        ):
+            first = utils.get_googleads_service("GoogleAdsService")
+            second = utils.get_googleads_service("GoogleAdsService")
+            other = utils.get_googleads_service("CustomerService")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(client.get_service.call_count, 2)
+
+    def test_warm_up_creates_services_and_tolerates_failures(self):
+        """Tests that warm up creates each service and logs failures."""
+        created = []
+
+        async def get_service(name):
+            if name == "Broken":
+                raise RuntimeError("no credentials")
+            created.append(name)
+
+        with (
+            mock.patch.object(
+                utils, "get_googleads_async_service", side_effect=get_service
+            ),
+            self.assertLogs(utils.logger, "WARNING"),
+        ):
+            asyncio.run(
+                utils.warm_up(["GoogleAdsService", "Broken", "CustomerService"])
+            )
+
+        self.assertEqual(created, ["GoogleAdsService", "CustomerService"])
+
+    def test_get_googleads_async_service_is_memoized_per_loop(self):
+        """Tests that asyncio service clients are reused within a loop."""
+        client = mock.Mock()
+        client.get_service.side_effect = lambda *args, **kwargs: mock.Mock()
+
+        async def get_twice():
+            first = await utils.get_googleads_async_service("GoogleAdsService")
+            second = await utils.get_googleads_async_service("GoogleAdsService")
+            self.assertIs(first, second)
+            return first
+
+        with mock.patch.object(utils, "_googleads_client", client):
+            first_loop = asyncio.run(get_twice())
+            second_loop = asyncio.run(get_twice())
+
+        self.assertIsNot(first_loop, second_loop)
+        self.assertEqual(client.get_service.call_count, 2)
+        self.assertTrue(client.get_service.call_args.kwargs["is_async"])
+
+    def test_format_output_rows_matches_format_output_row(self):
+        """Tests that the compiled formatter matches format_output_row."""
+        row = GoogleAdsRow(
+            campaign={
+                "id": 1,
+                "status": CampaignStatusEnum.CampaignStatus.PAUSED,
+                "network_settings": {"target_search_network": True},
+            },
+            ad_group_ad={"ad": {"type_": 3, "final_urls": ["https://a"]}},
+            metrics={"clicks": 5},
+        )
+        attributes = [
+            "campaign.id",
+            "campaign.status",
+            "campaign.network_settings",
+            "ad_group_ad.ad.type",
+            "ad_group_ad.ad.final_urls",
+            "metrics.clicks",
+            "segments.date",
+        ]
+
+        self.assertEqual(
+            utils.format_output_rows([row], attributes),
+            [utils.format_output_row(row, attributes)],
+        )
+        self.assertEqual(
+            utils.format_output_rows([row], ["campaign.status"]),
+            [{"campaign.status": "PAUSED"}],
+        )